@@ -1,9 +1,13 @@
-from flask import Flask
+from flask import Flask, Response, jsonify
 from .routes.video import video_bp
 from .utils.scheduler import start_scheduler  # ✅ 스케줄러 임포트
 from .routes.weather import weather_bp
 from .routes.route import route_bp
 from .routes.generate import generate_bp
+from .routes.admin import admin_bp
+from .services.template_registry import warm_up_templates
+from .utils.logger import get_log_stats, log
+from .utils.metrics import metrics_response
 
 app = Flask(__name__)
 
@@ -12,11 +16,29 @@ app.register_blueprint(video_bp)
 app.register_blueprint(weather_bp)
 app.register_blueprint(route_bp)
 app.register_blueprint(generate_bp)
+app.register_blueprint(admin_bp)
 start_scheduler()  # ✅ 여기에서 한 번만 실행
 
+# 🧩 템플릿 메타데이터 미리 적재 (실패해도 요청 시 개별 조회로 동작)
+try:
+    warm_up_templates()
+except Exception as e:
+    log(f"⚠️ 템플릿 warm-up 실패: {e}", level="warning")
+
 @app.route("/")
 def home():
     return "✅ Flask 리팩터링 구조 작동 중"
 
+# 📊 Prometheus 스크레이프 (단계별 지연, 외부 API, 요청 결과)
+@app.route("/metrics")
+def metrics():
+    body, content_type = metrics_response()
+    return Response(body, headers={"Content-Type": content_type})
+
+# 📝 로그 큐 상태 (대기 중 / 큐가 가득 차서 버린 레코드 수)
+@app.route("/logging/stats")
+def logging_stats():
+    return jsonify(get_log_stats())
+
 if __name__ == "__main__":
     app.run()
@@ -0,0 +1,4 @@
+import os
+
+# 벤치마크는 Supabase 없이 오프라인으로 돌아야 함 → config.py import용 더미 값
+os.environ.setdefault("SUPABASE_SERVICE_ROLE", "offline-benchmark")
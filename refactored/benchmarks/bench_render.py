@@ -0,0 +1,171 @@
+# 📁 benchmarks/bench_render.py
+"""
+렌더 경로 오프라인 벤치마크 (Supabase/네트워크 불필요, ffmpeg만 있으면 됨)
+
+오디오 길이 × 자막 줄 수 × 인코딩 프로필 조합마다
+audio_probe → filter_build → ffmpeg 단계별 wall/CPU 시간, peak RSS, 결과 크기를 JSON으로 저장
+
+실행:
+    python -m refactored.benchmarks.bench_render --durations 10 30 60 --lines 4 16 48
+    python -m refactored.benchmarks.compare bench_results/old.json bench_results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from ..config import FFMPEG_BIN, SUBTITLE_FONT_FILE
+from ..services.encoding_profiles import ENCODING_PROFILES
+from ..services.filter_graph import build_filter_complex
+from ..services.ffmpeg_runner import build_render_command
+from ..services.subtitle import build_subtitle_cues, build_drawtext_filter, build_ass_filter
+from ..utils import media_probe
+from ..utils.media_probe import probe_image_size, probe_media
+from .synthetic import BENCH_TEMPLATE, FRAME_SIZE, make_inputs, make_text
+
+def measure_python(fn):
+    """파이썬 안에서 도는 단계: (결과, {wall_s, cpu_s, peak_rss_kb(프로세스 누적 최대)})"""
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    return result, {
+        "wall_s": round(wall, 4),
+        "cpu_s": round((after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime), 4),
+        "peak_rss_kb": after.ru_maxrss,
+    }
+
+def measure_process(command: list, log_path: str) -> dict:
+    """자식 프로세스 단계: wait4로 그 프로세스만의 CPU 시간/peak RSS 측정"""
+    with open(log_path, "wb") as log_file:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=log_file)
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        with open(log_path, errors="replace") as f:
+            raise RuntimeError(f"ffmpeg failed ({process.returncode}):\n{f.read()[-2000:]}")
+    return {
+        "wall_s": round(wall, 4),
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 4),
+        "peak_rss_kb": usage.ru_maxrss,
+    }
+
+def run_case(paths: dict, duration: float, num_lines: int, profile: str, engine: str,
+             threads: int, work_dir: str) -> dict:
+    stages = {}
+
+    media_probe._cache.clear()  # 메모이즈 없이 실제 probe 비용 측정
+    audio_info, stages["audio_probe"] = measure_python(lambda: probe_media(paths["audio"]))
+
+    def build_filter():
+        cues = build_subtitle_cues(make_text(num_lines), audio_info.duration)
+        if engine == "drawtext":
+            subtitle_filter = build_drawtext_filter(cues, BENCH_TEMPLATE, SUBTITLE_FONT_FILE)
+        else:
+            ass_path = os.path.join(work_dir, "subs.ass")
+            frame_size = probe_image_size(paths["template"]) or FRAME_SIZE
+            subtitle_filter = build_ass_filter(cues, BENCH_TEMPLATE, ass_path, frame_size,
+                                               SUBTITLE_FONT_FILE)
+        return build_filter_complex(BENCH_TEMPLATE, subtitle_filter)
+
+    filter_complex, stages["filter_build"] = measure_python(build_filter)
+
+    output_path = os.path.join(work_dir, "out.mp4")
+    command = build_render_command(paths["template"], paths["image"], paths["audio"],
+                                   filter_complex, output_path, round(audio_info.duration, 2),
+                                   threads=threads, profile=profile)
+    stages["ffmpeg"] = measure_process(command, os.path.join(work_dir, "ffmpeg.log"))
+
+    return {
+        "stages": stages,
+        "total_wall_s": round(sum(s["wall_s"] for s in stages.values()), 4),
+        "output_bytes": os.path.getsize(output_path),
+        "filter_chars": len(filter_complex),
+    }
+
+def _median_stages(runs: list) -> dict:
+    names = runs[0]["stages"].keys()
+    return {
+        name: {
+            metric: round(statistics.median(run["stages"][name][metric] for run in runs), 4)
+            for metric in ("wall_s", "cpu_s", "peak_rss_kb")
+        }
+        for name in names
+    }
+
+def _environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    ffmpeg_version = subprocess.run([FFMPEG_BIN, "-version"], capture_output=True,
+                                    text=True).stdout.splitlines()[:1]
+    return {
+        "git_commit": commit or None,
+        "ffmpeg": ffmpeg_version[0] if ffmpeg_version else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="offline render path benchmark")
+    parser.add_argument("--durations", type=float, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--lines", type=int, nargs="+", default=[4, 16, 48])
+    parser.add_argument("--profiles", nargs="+", default=["balanced"], choices=list(ENCODING_PROFILES))
+    parser.add_argument("--engine", default="ass", choices=["ass", "drawtext"])
+    parser.add_argument("--audio", default="sine", choices=["sine", "noise"])
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: bench_results/render_<시각>.json)")
+    args = parser.parse_args()
+
+    out_path = args.out or os.path.join(
+        "bench_results", f"render_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    report = {"environment": _environment(), "args": vars(args), "cases": []}
+
+    with tempfile.TemporaryDirectory(prefix="bench_render_") as work_dir:
+        for duration in args.durations:
+            paths = make_inputs(work_dir, duration, args.audio)
+            for num_lines in args.lines:
+                for profile in args.profiles:
+                    runs = [
+                        run_case(paths, duration, num_lines, profile, args.engine,
+                                 args.threads, work_dir)
+                        for _ in range(args.repeat)
+                    ]
+                    case = {
+                        "case": f"d{duration:g}_l{num_lines}_{profile}_{args.engine}",
+                        "duration": duration,
+                        "lines": num_lines,
+                        "profile": profile,
+                        "engine": args.engine,
+                        "median": _median_stages(runs),
+                        "output_bytes": runs[-1]["output_bytes"],
+                        "filter_chars": runs[-1]["filter_chars"],
+                        "runs": runs,
+                    }
+                    report["cases"].append(case)
+                    ffmpeg = case["median"]["ffmpeg"]
+                    print(f"{case['case']:<32} ffmpeg {ffmpeg['wall_s']:>7.2f}s wall "
+                          f"{ffmpeg['cpu_s']:>7.2f}s cpu {ffmpeg['peak_rss_kb'] / 1024:>6.1f}MB "
+                          f"| {case['output_bytes'] / 1024:>8.1f}KB")
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"📄 결과 저장: {out_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# 📁 benchmarks/bench_subtitles.py
+"""
+자막 줄 수 증가에 따른 렌더 시간 비교 (drawtext 체인 vs ASS 트랙)
+
+실행:
+    FFMPEG_BIN=/usr/bin/ffmpeg python -m refactored.benchmarks.bench_subtitles --lines 2 8 32 64
+"""
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+from ..config import FFMPEG_BIN, SUBTITLE_FONT_FILE
+from ..services.filter_graph import build_filter_complex
+from ..services.ffmpeg_runner import build_render_command, run_ffmpeg
+from ..services.subtitle import build_subtitle_cues, build_drawtext_filter, build_ass_filter
+from .synthetic import BENCH_TEMPLATE, FRAME_SIZE, make_inputs, make_text
+
+def available_engines() -> list:
+    filters = subprocess.run([FFMPEG_BIN, "-hide_banner", "-filters"],
+                             capture_output=True, text=True).stdout
+    engines = []
+    if " drawtext " in filters:
+        engines.append("drawtext")
+    if " ass " in filters:
+        engines.append("ass")
+    return engines
+
+def bench_engine(engine: str, num_lines: int, paths: dict, duration: float, work_dir: str) -> dict:
+    cues = build_subtitle_cues(make_text(num_lines), duration)
+    if engine == "drawtext":
+        subtitle_filter = build_drawtext_filter(cues, BENCH_TEMPLATE, SUBTITLE_FONT_FILE)
+    else:
+        ass_path = os.path.join(work_dir, f"subs_{num_lines}.ass")
+        subtitle_filter = build_ass_filter(cues, BENCH_TEMPLATE, ass_path, FRAME_SIZE, SUBTITLE_FONT_FILE)
+
+    filter_complex = build_filter_complex(BENCH_TEMPLATE, subtitle_filter)
+    output_path = os.path.join(work_dir, f"out_{engine}_{num_lines}.mp4")
+    command = build_render_command(paths["template"], paths["image"], paths["audio"],
+                                   filter_complex, output_path, duration, threads=os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    returncode, output = run_ffmpeg(command, timeout=900)
+    elapsed = time.perf_counter() - started
+    if returncode != 0:
+        raise RuntimeError(f"{engine} render failed:\n{output[-2000:]}")
+
+    return {
+        "engine": engine,
+        "lines": len(cues),
+        "filter_chars": len(filter_complex),
+        "seconds": round(elapsed, 3),
+        "output_bytes": os.path.getsize(output_path),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="subtitle engine render benchmark")
+    parser.add_argument("--lines", type=int, nargs="+", default=[2, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--engines", nargs="+", default=None)
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    engines = args.engines or available_engines()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_subs_") as work_dir:
+        paths = make_inputs(work_dir, args.duration)
+        for num_lines in args.lines:
+            for engine in engines:
+                result = bench_engine(engine, num_lines, paths, args.duration, work_dir)
+                results.append(result)
+                print(f"{engine:>8} | {result['lines']:>4} lines | {result['seconds']:>7.2f}s "
+                      f"| filter {result['filter_chars']:>6} chars")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# 📁 benchmarks/compare.py
+"""
+bench_render 결과 JSON 두 개 비교 (케이스/단계별 중앙값 변화율)
+
+실행:
+    python -m refactored.benchmarks.compare bench_results/before.json bench_results/after.json
+"""
+import argparse
+import json
+
+METRICS = ("wall_s", "cpu_s", "peak_rss_kb")
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        return {case["case"]: case for case in json.load(f)["cases"]}
+
+def _delta(old: float, new: float) -> str:
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+def main():
+    parser = argparse.ArgumentParser(description="compare two bench_render result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    for name in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[name], candidate[name]
+        print(f"■ {name}  output {_delta(old['output_bytes'], new['output_bytes'])}")
+        for stage, old_metrics in old["median"].items():
+            new_metrics = new["median"].get(stage)
+            if not new_metrics:
+                continue
+            cells = "  ".join(
+                f"{metric} {old_metrics[metric]:>9} → {new_metrics[metric]:<9} {_delta(old_metrics[metric], new_metrics[metric])}"
+                for metric in METRICS
+            )
+            print(f"    {stage:<13} {cells}")
+
+    for name in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"□ {name}  (한쪽 결과에만 있음)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# 📁 benchmarks/synthetic.py
+import os
+import subprocess
+from ..config import FFMPEG_BIN
+from ..services.template_registry import TemplateLayout
+
+# 벤치마크용 합성 입력 (네트워크/Supabase 없이 ffmpeg lavfi로 생성)
+
+FRAME_SIZE = (1080, 1920)
+
+BENCH_TEMPLATE = TemplateLayout.from_row({
+    "template_id": "bench",
+    "frame_url": "bench://frame",
+    "font_size": 54,
+    "video_area": {"x": 0, "y": 420, "w": 1080, "h": 1080},
+    "headline_area": {"x": 0, "y": 80, "w": 1080, "h": 320},
+})
+
+def _ffmpeg(*args):
+    subprocess.run([FFMPEG_BIN, "-y", "-loglevel", "error"] + list(args), check=True)
+
+def make_template_frame(path: str, size=FRAME_SIZE) -> str:
+    _ffmpeg("-f", "lavfi", "-i", f"color=c=0x203040:s={size[0]}x{size[1]}", "-frames:v", "1", path)
+    return path
+
+def make_background_image(path: str, size=(1080, 1080)) -> str:
+    _ffmpeg("-f", "lavfi", "-i", f"testsrc2=s={size[0]}x{size[1]}", "-frames:v", "1", path)
+    return path
+
+def make_audio(path: str, duration: float, kind: str = "sine") -> str:
+    """kind: "sine" (440Hz) 또는 "noise" (핑크 노이즈, 인코더 부하가 더 큼)"""
+    source = (f"sine=frequency=440:duration={duration}" if kind == "sine"
+              else f"anoisesrc=color=pink:duration={duration}")
+    _ffmpeg("-f", "lavfi", "-i", source, "-b:a", "128k", path)
+    return path
+
+def make_inputs(work_dir: str, duration: float, audio_kind: str = "sine") -> dict:
+    """템플릿 프레임 / 배경 이미지 / MP3 한 세트"""
+    return {
+        "template": make_template_frame(os.path.join(work_dir, "tpl.jpg")),
+        "image": make_background_image(os.path.join(work_dir, "bg.jpg")),
+        "audio": make_audio(os.path.join(work_dir, f"audio_{audio_kind}_{duration}.mp3"),
+                            duration, audio_kind),
+    }
+
+def make_text(num_lines: int) -> str:
+    # 14자 줄바꿈 기준으로 정확히 num_lines 줄이 나오도록
+    return " ".join(f"자막 줄 {i:03d} 입니다" for i in range(num_lines))
@@ -30,3 +30,130 @@ SUPABASE_SIGN = f"{SUPABASE_BASE}/sign/{SUPABASE_BUCKET}"
 SUPABASE_SERVICE_KEY = os.environ['SUPABASE_SERVICE_ROLE']
 SUPABASE_REST = "https://bxrpebzmcgftbnlfdrre.supabase.co/rest/v1"
 TTL_SECONDS = 3600
+
+# 🎬 비동기 렌더 작업 큐 (작업 상태는 프로세스 메모리에 있으므로 gunicorn worker는 1개 유지)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+RENDER_JOB_TTL_SECONDS = int(os.getenv("RENDER_JOB_TTL_SECONDS", "3600"))
+
+# 🧮 ffmpeg 동시 실행 제어 (0 = 코어 수/가용 메모리로 자동 계산)
+RENDER_MAX_PARALLEL = int(os.getenv("RENDER_MAX_PARALLEL", "0"))
+FFMPEG_THREADS = int(os.getenv("FFMPEG_THREADS", "0"))
+RENDER_MEM_PER_JOB_MB = int(os.getenv("RENDER_MEM_PER_JOB_MB", "512"))
+RENDER_MAX_WAITING = int(os.getenv("RENDER_MAX_WAITING", "8"))
+RENDER_ADMISSION_TIMEOUT = float(os.getenv("RENDER_ADMISSION_TIMEOUT", "30"))
+RENDER_MAX_QUEUED_JOBS = int(os.getenv("RENDER_MAX_QUEUED_JOBS", "32"))
+
+# 🗂 템플릿 프레임/배경 이미지 디스크 캐시 (URL + 콘텐츠 해시 기준, LRU)
+ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", "cache/assets")
+ASSET_CACHE_MAX_BYTES = int(os.getenv("ASSET_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+ASSET_CACHE_REVALIDATE_SECONDS = int(os.getenv("ASSET_CACHE_REVALIDATE_SECONDS", "300"))
+
+# 🧩 템플릿 메타데이터 캐시
+TEMPLATE_CACHE_TTL_SECONDS = int(os.getenv("TEMPLATE_CACHE_TTL_SECONDS", "600"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# 🌐 입력 자산 다운로드 (공유 커넥션 풀 + 스트리밍)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+FETCH_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", "5"))
+FETCH_READ_TIMEOUT = float(os.getenv("FETCH_READ_TIMEOUT", "30"))
+FETCH_DEADLINE_SECONDS = float(os.getenv("FETCH_DEADLINE_SECONDS", "60"))
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
+MAX_AUDIO_BYTES = int(os.getenv("MAX_AUDIO_BYTES", str(50 * 1024 * 1024)))
+
+# 🎞 ffmpeg / ffprobe 실행 파일 경로
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+FFPROBE_BIN = os.getenv("FFPROBE_BIN", "ffprobe")
+
+# 💬 자막 엔진: "ass" (자막 트랙 1개를 libass로 합성) / "drawtext" (줄마다 drawtext, 기존 방식)
+SUBTITLE_ENGINE = os.getenv("SUBTITLE_ENGINE", "ass")
+SUBTITLE_FONT_FILE = os.getenv("SUBTITLE_FONT_FILE", "NotoSansKR-VF.ttf")
+
+# 📼 인코딩 프로필 기본값 (fast-draft / balanced / small-file)
+DEFAULT_ENCODING_PROFILE = os.getenv("DEFAULT_ENCODING_PROFILE", "balanced")
+
+# 📡 ffmpeg 출력(fragmented MP4)을 파일 없이 바로 스토리지로 스트리밍 업로드
+# Content-Length가 필요한 스토리지라면 false → 파일로 쓴 뒤 업로드
+STREAMING_UPLOAD = os.getenv("STREAMING_UPLOAD", "false").lower() == "true"
+
+# ⏫ 업로드 매니저 (동시 업로드, 큰 파일은 TUS 재개 가능 업로드)
+SUPABASE_RESUMABLE = f"{SUPABASE_STORAGE}/upload/resumable"
+RESUMABLE_UPLOAD_THRESHOLD = int(os.getenv("RESUMABLE_UPLOAD_THRESHOLD", str(20 * 1024 * 1024)))
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024  # Supabase TUS는 6MB 청크 고정
+UPLOAD_TIMEOUT = float(os.getenv("UPLOAD_TIMEOUT", "120"))
+UPLOAD_MAX_RETRIES = int(os.getenv("UPLOAD_MAX_RETRIES", "3"))
+
+# ✍️ signed URL 일괄 발급 + 업로드 직후 객체 노출 확인 (고정 sleep 대신 제한된 재시도)
+SIGN_READY_RETRIES = int(os.getenv("SIGN_READY_RETRIES", "5"))
+SIGN_READY_DELAY = float(os.getenv("SIGN_READY_DELAY", "0.2"))
+
+# 🔏 signed URL 번들 캐시 (/get_signed_urls)
+# 실제 만료(TTL_SECONDS)보다 MARGIN초 먼저 버리고, 그보다 REFRESH_AHEAD초 먼저 백그라운드 갱신
+SIGNED_URL_CACHE_MARGIN = int(os.getenv("SIGNED_URL_CACHE_MARGIN", "300"))
+SIGNED_URL_REFRESH_AHEAD = int(os.getenv("SIGNED_URL_REFRESH_AHEAD", "300"))
+SIGNED_URL_CACHE_MAX = int(os.getenv("SIGNED_URL_CACHE_MAX", "10000"))
+SIGNED_URL_CACHE_DIR = os.getenv("SIGNED_URL_CACHE_DIR", "")  # 비어 있으면 프로세스 메모리만 사용
+BULK_SIGN_MAX_ITEMS = int(os.getenv("BULK_SIGN_MAX_ITEMS", "100"))  # /get_signed_urls/bulk 1회 최대 uuid 수
+
+# 🧹 TTL 정리 작업 (signed_created_at 순서로 제한된 배치 처리)
+TTL_CLEANUP_BATCH_SIZE = int(os.getenv("TTL_CLEANUP_BATCH_SIZE", "500"))
+TTL_CLEANUP_MIN_BATCH = int(os.getenv("TTL_CLEANUP_MIN_BATCH", "50"))
+TTL_CLEANUP_SLOW_SECONDS = float(os.getenv("TTL_CLEANUP_SLOW_SECONDS", "2.0"))  # 이보다 느린 배치 → 배치 축소 + 휴식
+TTL_CLEANUP_MAX_SECONDS = int(os.getenv("TTL_CLEANUP_MAX_SECONDS", "300"))  # 1회 실행 시간 상한 (넘으면 체크포인트 후 다음 실행에서 이어서)
+TTL_CLEANUP_MAX_RETRIES = int(os.getenv("TTL_CLEANUP_MAX_RETRIES", "4"))
+TTL_CLEANUP_CHECKPOINT = os.getenv("TTL_CLEANUP_CHECKPOINT", "cache/ttl_checkpoint.json")
+
+# 👑 백그라운드 작업 리더 선출 (호스트 내: 파일 락, 호스트 간: DB 임대 행)
+LEADER_LOCK_FILE = os.getenv("LEADER_LOCK_FILE", "/tmp/shorts-generator-scheduler.lock")
+LEADER_LEASE_TABLE = os.getenv("LEADER_LEASE_TABLE", "scheduler_leases")  # 비우면 파일 락만 사용
+LEADER_LEASE_NAME = os.getenv("LEADER_LEASE_NAME", "background-jobs")
+LEADER_LEASE_SECONDS = int(os.getenv("LEADER_LEASE_SECONDS", "45"))
+LEADER_HEARTBEAT_SECONDS = int(os.getenv("LEADER_HEARTBEAT_SECONDS", "15"))
+
+# 🧽 작업별 임시 디렉터리 + 로컬 디스크 janitor
+SCRATCH_DIR = os.getenv("SCRATCH_DIR", "")  # 비우면 /dev/shm (여유 있을 때) → 없으면 OUTPUT_FOLDER/.scratch
+SCRATCH_TMPFS_MIN_FREE_MB = int(os.getenv("SCRATCH_TMPFS_MIN_FREE_MB", "512"))
+SCRATCH_TOUCH_SECONDS = int(os.getenv("SCRATCH_TOUCH_SECONDS", "60"))  # 진행 중 작업 디렉터리 mtime 갱신 주기 (< JANITOR_MIN_AGE_SECONDS)
+JANITOR_INTERVAL_SECONDS = int(os.getenv("JANITOR_INTERVAL_SECONDS", "600"))
+JANITOR_MAX_AGE_SECONDS = int(os.getenv("JANITOR_MAX_AGE_SECONDS", "3600"))  # 이보다 오래된 파일/작업 디렉터리는 무조건 정리
+JANITOR_MIN_AGE_SECONDS = int(os.getenv("JANITOR_MIN_AGE_SECONDS", "300"))  # 고수위 정리 때도 이보다 최근 것은 보존
+JANITOR_HIGH_WATER = float(os.getenv("JANITOR_HIGH_WATER", "0.85"))  # 디스크 사용률이 넘으면 오래된 것부터 정리
+JANITOR_LOW_WATER = float(os.getenv("JANITOR_LOW_WATER", "0.70"))  # ...여기까지 내려갈 때까지
+
+# 🔌 Supabase 공용 클라이언트 (커넥션 풀 + 작업별 타임아웃 + 5xx/429 재시도)
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "16"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "3.05"))
+SUPABASE_REST_TIMEOUT = float(os.getenv("SUPABASE_REST_TIMEOUT", "10"))  # PostgREST 읽기 타임아웃
+SUPABASE_STORAGE_TIMEOUT = float(os.getenv("SUPABASE_STORAGE_TIMEOUT", "15"))  # 서명/삭제 등 (업로드는 UPLOAD_TIMEOUT)
+SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "3"))
+SUPABASE_RETRY_BASE = float(os.getenv("SUPABASE_RETRY_BASE", "0.25"))
+SUPABASE_RETRY_CAP = float(os.getenv("SUPABASE_RETRY_CAP", "4.0"))
+
+# ⚡ 외부 API 비동기 I/O (공용 이벤트 루프 스레드 1개 + httpx 커넥션 풀 1개)
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", "100"))
+ASYNC_HTTP_MAX_KEEPALIVE = int(os.getenv("ASYNC_HTTP_MAX_KEEPALIVE", "20"))
+ASYNC_HTTP_TIMEOUT = float(os.getenv("ASYNC_HTTP_TIMEOUT", "30"))
+
+# 📦 일괄 렌더 (/generate_batch)
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+BATCH_PREFETCH_WORKERS = int(os.getenv("BATCH_PREFETCH_WORKERS", "4"))
+
+# 🧬 렌더 메모이제이션 (같은 입력 → 기존 산출물 재사용)
+RENDER_MEMO_ENABLED = os.getenv("RENDER_MEMO_ENABLED", "true").lower() == "true"
+RENDER_MEMO_MAX_ENTRIES = int(os.getenv("RENDER_MEMO_MAX_ENTRIES", "10000"))
+
+# 🎞️ 다중 출력 렌더 (/generate_multi): 템플릿 A/B × 해상도 + 포스터를 ffmpeg 1회로
+MULTI_MAX_TEMPLATES = int(os.getenv("MULTI_MAX_TEMPLATES", "3"))
+MULTI_MAX_RENDITIONS = int(os.getenv("MULTI_MAX_RENDITIONS", "3"))
+POSTER_TIME_SECONDS = float(os.getenv("POSTER_TIME_SECONDS", "1.0"))
+
+# 📊 렌더 진행률 SSE (/render_status/<job_id>/events)
+RENDER_SSE_HEARTBEAT_SECONDS = float(os.getenv("RENDER_SSE_HEARTBEAT_SECONDS", "15"))
+RENDER_SSE_MAX_SECONDS = float(os.getenv("RENDER_SSE_MAX_SECONDS", "600"))
+
+# 📝 로깅: 큐 기반 비동기 핸들러 (요청 스레드는 큐에 넣기만), JSON 한 줄 레코드
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json / text (로컬 개발용)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # 가득 차면 새 레코드는 버리고 개수만 셈
+# ffmpeg stderr는 마지막 N줄만 링 버퍼에 보관 → 실패했을 때만(또는 SAMPLE_RATE 확률로) 기록
+FFMPEG_LOG_TAIL_LINES = int(os.getenv("FFMPEG_LOG_TAIL_LINES", "200"))
+FFMPEG_LOG_SAMPLE_RATE = float(os.getenv("FFMPEG_LOG_SAMPLE_RATE", "0.01"))
@@ -1,9 +1,11 @@
 from ..utils.logger import log  # 선택사항
 
-from ..logic.weather import get_weather_summary  # 호출 시점에만 import
-from ..logic.route import get_route_estimate
+from ..logic.weather import get_weather_summary_async
+from ..logic.route import get_route_estimate_async
 from ..textgen.route_text_generator import generate_route_description
-from ..services.image_service import get_image_url
+from ..services.image_service import get_image_url_async
+from ..utils.async_io import run_async, gather
+from ..utils.metrics import metric_labels, stage
 
 from ..content_type_rules import get_required_fields_by_type
 
@@ -27,11 +29,41 @@ def process_parsed_result(parsed: dict, options: dict) -> dict:
     results = {}
 
     needs = get_required_fields_by_type(content_type)
+    want_weather = needs.get("need_weather") and coord_from and target_time
+    want_route = needs.get("need_route") and coord_from and coord_to
 
-    # 날씨 API 조건 분기
-    if needs.get("need_weather") and coord_from and target_time:
+    # ⚡ 날씨·이미지·경로 외부 호출을 동시에 (공용 이벤트 루프에서 한 번에 대기)
+    calls = {
+        "image": get_image_url_async(
+            is_paid=options.get("is_paid", False),
+            prompt=parsed.get("headline", "") or "",
+            default_pool=[
+                "https://cdn.example.com/fallback1.jpg",
+                "https://cdn.example.com/fallback2.jpg"
+            ]
+        )
+    }
+    if want_weather:
         log("🌤 날씨 정보 호출")
-        weather_context = get_weather_summary(coord_from, target_time)
+        calls["weather"] = get_weather_summary_async(coord_from, target_time)
+    if want_route:
+        log("🛣 경로 계산 시작")
+        calls["route"] = get_route_estimate_async(
+            start_lat=coord_from["lat"],
+            start_lon=coord_from["lon"],
+            end_lat=coord_to["lat"],
+            end_lon=coord_to["lon"],
+            use_naver=options.get("is_paid", False),
+            client_id=options.get("naver_client_id", ""),
+            client_secret=options.get("naver_client_secret", "")
+        )
+    # 📊 개별 API 지연은 shorts_external_api_seconds, 여기서는 동시 호출 전체 대기 시간
+    with metric_labels(content_type=content_type), stage("external_fetch"):
+        fetched = dict(zip(calls, run_async(gather(*calls.values()))))
+
+    # 날씨 API 조건 분기
+    if want_weather:
+        weather_context = fetched["weather"]
         results["weather_summary"] = weather_context
 
         # 수치 → 설명 문장
@@ -44,28 +76,11 @@ def process_parsed_result(parsed: dict, options: dict) -> dict:
 
         results["weather_text"] = weather_text
 
-    image_url = get_image_url(
-        is_paid=options.get("is_paid", False),
-        prompt=parsed.get("headline", "") or "",
-        default_pool=[
-            "https://cdn.example.com/fallback1.jpg",
-            "https://cdn.example.com/fallback2.jpg"
-        ]
-    )
-    results["image_url"] = image_url
+    results["image_url"] = fetched["image"]
 
     # 거리/이동 시간 계산 조건 분기
-    if needs.get("need_route") and coord_from and coord_to:
-        log("🛣 경로 계산 시작")
-        route_data = get_route_estimate(
-            start_lat=coord_from["lat"],
-            start_lon=coord_from["lon"],
-            end_lat=coord_to["lat"],
-            end_lon=coord_to["lon"],
-            use_naver=options.get("is_paid", False),
-            client_id=options.get("naver_client_id", ""),
-            client_secret=options.get("naver_client_secret", "")
-        )
+    if want_route:
+        route_data = fetched["route"]
         results.update(route_data)
 
         # 설명 문장 자동 생성
@@ -1,7 +1,8 @@
 from ..utils.haversine import haversine_km, estimate_travel_time_min
-from ..utils.naver_route import get_naver_driving_info
+from ..utils.naver_route import get_naver_driving_info, get_naver_driving_info_async
 from datetime import datetime
 from ..utils.logger import log
+from ..utils.metrics import api_call
 
 def get_route_estimate(
     start_lat: float,
@@ -18,31 +19,59 @@ def get_route_estimate(
 
     if use_naver and client_id and client_secret:
         # 유료 사용자 → 네이버 API 사용
-        naver_result = get_naver_driving_info(
-            start_lat, start_lon, end_lat, end_lon, client_id, client_secret
-        )
-
-        if naver_result.get("status") == "ok":
-            naver_result["method"] = "naver"
-            return naver_result
-        else:
-            # 실패 시 fallback
-            fallback_dist = haversine_km(start_lat, start_lon, end_lat, end_lon)
-            fallback_time = estimate_travel_time_min(fallback_dist)
-            return {
-                "distance_km": fallback_dist,
-                "duration_min": fallback_time,
-                "method": "fallback-haversine",
-                "error": naver_result.get("error", "네이버 API 실패")
-            }
+        with api_call("naver_driving") as span:
+            naver_result = get_naver_driving_info(
+                start_lat, start_lon, end_lat, end_lon, client_id, client_secret
+            )
+            if naver_result.get("status") != "ok":
+                span.fail()
+        return _naver_or_fallback(naver_result, start_lat, start_lon, end_lat, end_lon)
 
     else:
         # 무료 사용자 → 하버사인 추정
-        distance = haversine_km(start_lat, start_lon, end_lat, end_lon)
-        duration = estimate_travel_time_min(distance)
-
-        return {
-            "distance_km": distance,
-            "duration_min": duration,
-            "method": "haversine"
-        }
+        return _haversine_estimate(start_lat, start_lon, end_lat, end_lon)
+
+async def get_route_estimate_async(
+    start_lat: float,
+    start_lon: float,
+    end_lat: float,
+    end_lon: float,
+    use_naver: bool = False,
+    client_id: str = "",
+    client_secret: str = ""
+) -> dict:
+    """get_route_estimate의 비동기 버전 (네이버 호출만 비동기, 하버사인은 바로 계산)"""
+    if use_naver and client_id and client_secret:
+        with api_call("naver_driving") as span:
+            naver_result = await get_naver_driving_info_async(
+                start_lat, start_lon, end_lat, end_lon, client_id, client_secret
+            )
+            if naver_result.get("status") != "ok":
+                span.fail()
+        return _naver_or_fallback(naver_result, start_lat, start_lon, end_lat, end_lon)
+    return _haversine_estimate(start_lat, start_lon, end_lat, end_lon)
+
+def _naver_or_fallback(naver_result, start_lat, start_lon, end_lat, end_lon) -> dict:
+    if naver_result.get("status") == "ok":
+        naver_result["method"] = "naver"
+        return naver_result
+
+    # 실패 시 fallback
+    fallback_dist = haversine_km(start_lat, start_lon, end_lat, end_lon)
+    fallback_time = estimate_travel_time_min(fallback_dist)
+    return {
+        "distance_km": fallback_dist,
+        "duration_min": fallback_time,
+        "method": "fallback-haversine",
+        "error": naver_result.get("error", "네이버 API 실패")
+    }
+
+def _haversine_estimate(start_lat, start_lon, end_lat, end_lon) -> dict:
+    distance = haversine_km(start_lat, start_lon, end_lat, end_lon)
+    duration = estimate_travel_time_min(distance)
+
+    return {
+        "distance_km": distance,
+        "duration_min": duration,
+        "method": "haversine"
+    }
@@ -1,15 +1,29 @@
 # logic/weather.py
 
-from ..utils.openmeteo_weather import get_openmeteo_forecast
+from ..utils.openmeteo_weather import get_openmeteo_forecast, get_openmeteo_forecast_async
 from ..textgen.weather_text_generator import generate_weather_description
+from ..utils.metrics import api_call
 
 def get_weather_summary(coord: dict, target_time: str) -> dict:
     """
     coord = {"lat": ..., "lon": ...}
     target_time = ISO 형식 문자열
     """
-    forecast = get_openmeteo_forecast(coord["lat"], coord["lon"], target_time)
+    with api_call("openmeteo") as span:
+        forecast = get_openmeteo_forecast(coord["lat"], coord["lon"], target_time)
+        if "error" in forecast:
+            span.fail()
+    return _summarize(forecast)
 
+async def get_weather_summary_async(coord: dict, target_time: str) -> dict:
+    """get_weather_summary의 비동기 버전"""
+    with api_call("openmeteo") as span:
+        forecast = await get_openmeteo_forecast_async(coord["lat"], coord["lon"], target_time)
+        if "error" in forecast:
+            span.fail()
+    return _summarize(forecast)
+
+def _summarize(forecast: dict) -> dict:
     if "error" in forecast:
         return {"summary": "", "error": forecast["error"]}
 
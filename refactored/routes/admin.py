@@ -0,0 +1,73 @@
+from flask import Blueprint, request, jsonify
+from ..config import ADMIN_TOKEN
+from ..services.template_registry import invalidate_templates, warm_up_templates, TemplateError
+from ..services.ttl import run_ttl_cleanup, get_ttl_metrics
+from ..services.render_memo import get_memo_stats
+from ..services.signed_url_cache import get_signed_cache_stats
+from ..utils.janitor import run_janitor, get_janitor_metrics
+from ..utils.supabase_client import get_supabase_client
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+@admin_bp.before_request
+def require_admin_token():
+    # ADMIN_TOKEN이 설정되지 않았으면 관리자 엔드포인트 비활성화
+    if not ADMIN_TOKEN or request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+        return jsonify({"error": "Forbidden"}), 403
+
+@admin_bp.route("/templates/invalidate", methods=["POST"])
+def invalidate():
+    data = request.get_json(silent=True) or {}
+    template_id = data.get("template_id")
+    removed = invalidate_templates(template_id)
+
+    # 전체 무효화 후에는 바로 다시 적재해서 요청 경로에서 DB 조회가 생기지 않게
+    if data.get("reload", True) and template_id is None:
+        try:
+            warm_up_templates()
+        except TemplateError as e:
+            return jsonify({"removed": removed, "error": str(e), "status": "fail"}), 502
+
+    return jsonify({"removed": removed, "status": "ok"})
+
+@admin_bp.route("/templates/warm", methods=["POST"])
+def warm():
+    try:
+        loaded = warm_up_templates()
+    except TemplateError as e:
+        return jsonify({"error": str(e), "status": "fail"}), 502
+    return jsonify({"loaded": loaded, "status": "ok"})
+
+@admin_bp.route("/ttl/cleanup", methods=["POST"])
+def ttl_cleanup():
+    run = run_ttl_cleanup()
+    if run.get("skipped"):
+        return jsonify({"status": "running", **get_ttl_metrics()}), 409
+    return jsonify({"status": "ok" if not run["error"] else "fail", **run})
+
+@admin_bp.route("/ttl/metrics", methods=["GET"])
+def ttl_metrics():
+    return jsonify(get_ttl_metrics())
+
+@admin_bp.route("/janitor/run", methods=["POST"])
+def janitor_run():
+    run = run_janitor()
+    if run.get("skipped"):
+        return jsonify({"status": "running"}), 409
+    return jsonify({"status": "ok", **run})
+
+@admin_bp.route("/janitor/metrics", methods=["GET"])
+def janitor_metrics():
+    return jsonify(get_janitor_metrics())
+
+@admin_bp.route("/supabase/stats", methods=["GET"])
+def supabase_stats():
+    return jsonify(get_supabase_client().get_stats())
+
+@admin_bp.route("/render_memo/stats", methods=["GET"])
+def render_memo_stats():
+    return jsonify(get_memo_stats())
+
+@admin_bp.route("/signed_url_cache/stats", methods=["GET"])
+def signed_url_cache_stats():
+    return jsonify(get_signed_cache_stats())
@@ -1,5 +1,12 @@
-from flask import Blueprint, request
-from ..services.video_service import handle_upload_and_generate, handle_get_signed_urls
+import json
+from flask import Blueprint, Response, request, stream_with_context
+from ..services.video_service import (
+    handle_upload_and_generate, handle_get_signed_urls, handle_get_signed_urls_bulk,
+    handle_get_render_status, stream_render_events,
+    handle_get_render_capacity
+)
+from ..services.batch_render import handle_generate_batch
+from ..services.multi_render import handle_generate_multi
 
 video_bp = Blueprint("video", __name__)
 
@@ -7,6 +14,44 @@ video_bp = Blueprint("video", __name__)
 def upload():
     return handle_upload_and_generate(request)
 
+@video_bp.route("/generate_batch", methods=["POST"])
+def generate_batch():
+    result = handle_generate_batch(request.get_json(silent=True))
+    if isinstance(result, tuple):
+        return result
+
+    # 기본: 항목이 끝날 때마다 한 줄씩 (NDJSON), ?stream=0 이면 모두 끝난 뒤 한 번에
+    if request.args.get("stream") == "0":
+        lines = list(result)
+        items = sorted((line for line in lines if "summary" not in line), key=lambda line: line["index"])
+        return {"items": items, "summary": lines[-1]["summary"]}, 200
+
+    ndjson = (json.dumps(line, ensure_ascii=False) + "\n" for line in result)
+    return Response(stream_with_context(ndjson), mimetype="application/x-ndjson")
+
+@video_bp.route("/generate_multi", methods=["POST"])
+def generate_multi():
+    return handle_generate_multi(request)
+
 @video_bp.route("/get_signed_urls", methods=["POST"])
 def get_signed():
     return handle_get_signed_urls(request)
+
+@video_bp.route("/get_signed_urls/bulk", methods=["POST"])
+def get_signed_bulk():
+    return handle_get_signed_urls_bulk(request)
+
+@video_bp.route("/render_status/<job_id>", methods=["GET"])
+def render_status(job_id):
+    return handle_get_render_status(job_id)
+
+@video_bp.route("/render_status/<job_id>/events", methods=["GET"])
+def render_events(job_id):
+    return Response(
+        stream_render_events(job_id), mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@video_bp.route("/render_capacity", methods=["GET"])
+def render_capacity():
+    return handle_get_render_capacity()
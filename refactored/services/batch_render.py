@@ -0,0 +1,159 @@
+# 📁 services/batch_render.py
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from ..config import BATCH_MAX_ITEMS, BATCH_PREFETCH_WORKERS, MAX_IMAGE_BYTES
+from ..utils.asset_cache import get_cached_asset
+from ..utils.http_fetcher import FetchError
+from ..utils.logger import log
+from ..utils.supabase_utils import fix_url
+from .render_queue import submit_render_job, wait_for_jobs
+from .render_scheduler import RenderCapacityError
+from .template_registry import TemplateError, get_template
+from .video_service import render_video
+
+# 여러 렌더 요청을 한 번에 받아 템플릿별로 묶어서 처리
+# 1) 템플릿 레이아웃 + 프레임 이미지 (+ 여러 항목이 같이 쓰는 배경 이미지)를 한 번씩만 미리 받아 자산 캐시에 적재
+#    → 각 렌더의 link_cached_asset은 캐시 적중 (재검증 주기 안이면 네트워크 없음)
+# 2) 템플릿 순서대로 렌더 큐에 등록, 큐가 가득 차면 끝난 작업을 흘려보내며 기다렸다가 이어서 등록
+# 3) 항목이 끝나는 순서대로 한 줄씩 결과 (NDJSON), 마지막 줄은 요약
+# 항목 하나의 실패(입력 오류, 템플릿 오류, 렌더 실패)는 그 항목만 failed로 보고
+
+_REQUIRED = ("image_url", "audio_url", "text", "template_id")
+
+def parse_batch(payload: dict):
+    """
+    요청 JSON → (렌더 파라미터 목록, 입력 오류 목록)
+    공통값(user_id, template_id, subtitle_engine, encoding_profile)은 항목 값이 우선
+    :return: ([(index, params)], [(index, error)]) 또는 최상위 오류면 (None, 메시지)
+    """
+    items = payload.get("items")
+    if not isinstance(items, list) or not items:
+        return None, "items must be a non-empty list"
+    if len(items) > BATCH_MAX_ITEMS:
+        return None, f"At most {BATCH_MAX_ITEMS} items per batch"
+
+    specs, invalid = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            invalid.append((index, "item must be an object"))
+            continue
+        params = {
+            "image_url": fix_url(item.get("image_url")),
+            "audio_url": fix_url(item.get("mp3_url") or item.get("audio_url")),
+            "text": item.get("text"),
+            "user_id": item.get("user_id", payload.get("user_id")),
+            "template_id": item.get("template_id", payload.get("template_id")),
+            "subtitle_engine": item.get("subtitle_engine", payload.get("subtitle_engine")),
+            "encoding_profile": item.get("encoding_profile", payload.get("encoding_profile")),
+            "content_type": item.get("content_type", payload.get("content_type")),
+        }
+        missing = [key for key in _REQUIRED if not params[key]]
+        if missing:
+            invalid.append((index, f"missing: {', '.join(missing)}"))
+        else:
+            specs.append((index, params))
+    return specs, invalid
+
+def prefetch_shared_assets(specs) -> dict:
+    """
+    템플릿별 레이아웃/프레임과 2번 이상 쓰이는 배경 이미지를 한 번씩 캐시에 적재
+    :return: 실패한 template_id → 오류 메시지 (해당 템플릿 항목은 렌더하지 않음)
+    """
+    template_ids = list(dict.fromkeys(str(params["template_id"]) for _, params in specs))
+    image_urls = [params["image_url"] for _, params in specs]
+    shared_images = {url for url in image_urls if image_urls.count(url) > 1}
+
+    def warm_template(template_id):
+        try:
+            layout = get_template(template_id)
+            get_cached_asset(fix_url(layout.frame_url), MAX_IMAGE_BYTES)
+        except TemplateError:
+            return template_id, "Failed to fetch template from DB"
+        except FetchError as e:
+            return template_id, f"Failed to download template frame: {e}"
+        return template_id, None
+
+    def warm_image(url):
+        try:
+            get_cached_asset(url, MAX_IMAGE_BYTES)
+        except FetchError:
+            pass  # 렌더 단계에서 항목별로 다시 시도하고 그때 오류 보고
+
+    with ThreadPoolExecutor(max_workers=BATCH_PREFETCH_WORKERS, thread_name_prefix="batch-prefetch") as pool:
+        template_results = list(pool.map(warm_template, template_ids))
+        list(pool.map(warm_image, shared_images))
+
+    return {template_id: error for template_id, error in template_results if error}
+
+def stream_batch(specs, invalid, render_fn, wait_seconds: float = 5.0):
+    """
+    렌더를 등록하고 끝나는 순서대로 결과 dict를 yield, 마지막은 {"summary": ...}
+    :param render_fn: params → (응답 dict, 상태코드)
+    """
+    batch_id = str(uuid.uuid4())
+    started = time.monotonic()
+    counts = {"done": 0, "failed": 0}
+
+    def item_line(index, status, template_id=None, job_id=None, result=None, error=None):
+        counts[status] += 1
+        return {"batch_id": batch_id, "index": index, "status": status, "template_id": template_id,
+                "job_id": job_id, "result": result, "error": error}
+
+    for index, error in invalid:
+        yield item_line(index, "failed", error=error)
+
+    template_errors = prefetch_shared_assets(specs)
+    pending = []  # 템플릿 순서대로 정렬된 (index, params)
+    for index, params in sorted(specs, key=lambda spec: str(spec[1]["template_id"])):
+        error = template_errors.get(str(params["template_id"]))
+        if error:
+            yield item_line(index, "failed", params["template_id"], error=error)
+        else:
+            pending.append((index, params))
+
+    running = {}  # job_id → index
+    while pending or running:
+        # 큐에 넣을 수 있는 만큼 등록
+        while pending:
+            index, params = pending[0]
+            try:
+                job_id = submit_render_job(render_fn, params)
+            except RenderCapacityError as e:
+                wait = min(e.retry_after, wait_seconds)
+                break
+            running[job_id] = index
+            pending.pop(0)
+        else:
+            wait = wait_seconds
+
+        for job in wait_for_jobs(list(running), timeout=wait):
+            index = running.pop(job["job_id"])
+            yield item_line(index, job["status"], job["template_id"], job["job_id"],
+                            result=job["result"], error=job["error"])
+
+    summary = {
+        "batch_id": batch_id,
+        "total": len(specs) + len(invalid),
+        "done": counts["done"],
+        "failed": counts["failed"],
+        "templates": len({str(params["template_id"]) for _, params in specs}),
+        "seconds": round(time.monotonic() - started, 2),
+    }
+    log(f"📦 일괄 렌더 {batch_id}: {summary['done']}/{summary['total']} 완료, {summary['seconds']}s")
+    yield {"summary": summary}
+
+def handle_generate_batch(payload: dict):
+    """
+    :return: (오류 dict, 상태코드) 또는 결과 dict 이터레이터
+    """
+    if payload is None:
+        payload = {}
+    if not isinstance(payload, dict):
+        return {"error": "JSON body must be an object"}, 400
+    specs, invalid = parse_batch(payload)
+    if specs is None:
+        return {"error": invalid}, 400
+    # 워커 스레드는 슬롯이 날 때까지 기다림 (mode=async와 동일)
+    return stream_batch(specs, invalid, partial(render_video, slot_timeout=None))
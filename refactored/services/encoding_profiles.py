@@ -0,0 +1,89 @@
+# 📁 services/encoding_profiles.py
+from ..config import DEFAULT_ENCODING_PROFILE
+
+# 정지 이미지 합성 + 페이드 자막이라 대부분의 프레임이 동일
+# → 낮은 fps, -tune stillimage, 긴 GOP, CRF 품질 목표, faststart(moov 앞으로)
+ENCODING_PROFILES = {
+    "fast-draft": {
+        "fps": 12,
+        "preset": "ultrafast",
+        "crf": 30,
+        "gop_seconds": 10,
+        "audio_bitrate": "96k",
+    },
+    "balanced": {
+        "fps": 15,
+        "preset": "veryfast",
+        "crf": 23,
+        "gop_seconds": 5,
+        "audio_bitrate": "128k",
+    },
+    "small-file": {
+        "fps": 15,
+        "preset": "medium",
+        "crf": 28,
+        "gop_seconds": 10,
+        "audio_bitrate": "64k",
+    },
+}
+
+# 추가 해상도: 짧은 변 픽셀 수 (세로 9:16이면 가로 폭), "source" = 템플릿 프레임 원본 크기
+RENDITIONS = {
+    "source": None,
+    "1080p": 1080,
+    "720p": 720,
+    "480p": 480,
+    "360p": 360,
+}
+
+def rendition_size(name: str, frame_size) -> tuple:
+    """
+    렌디션 이름 + 프레임 (w, h) → 출력 (w, h), 원본 그대로면 None (업스케일 안 함)
+    :raises ValueError: 없는 렌디션 이름
+    """
+    if name not in RENDITIONS:
+        raise ValueError(f"Unknown rendition: {name} (choose from {', '.join(RENDITIONS)})")
+    short_side = RENDITIONS[name]
+    width, height = frame_size
+    if short_side is None or short_side >= min(width, height):
+        return None
+    scale = short_side / min(width, height)
+    # libx264 + yuv420p는 짝수 크기만
+    return (max(2, round(width * scale / 2) * 2), max(2, round(height * scale / 2) * 2))
+
+def resolve_encoding_profile(requested=None, template=None) -> str:
+    """
+    요청 파라미터 → 템플릿 설정(encoding_profile) → 기본값 순으로 선택
+    :raises ValueError: 없는 프로필 이름
+    """
+    template_profile = template.raw.get("encoding_profile") if template else None
+    name = requested or template_profile or DEFAULT_ENCODING_PROFILE
+    if name not in ENCODING_PROFILES:
+        raise ValueError(f"Unknown encoding profile: {name} (choose from {', '.join(ENCODING_PROFILES)})")
+    return name
+
+def input_frame_rate(profile_name: str) -> int:
+    """-loop 이미지 입력의 -framerate (필터 그래프가 처리할 프레임 수를 줄임)"""
+    return ENCODING_PROFILES[profile_name]["fps"]
+
+def encoding_args(profile_name: str, threads: int = 1, fragmented: bool = False) -> list:
+    """
+    :param fragmented: 파이프 출력용 fragmented MP4 (seek 불가 → faststart 대신 empty_moov)
+    """
+    profile = ENCODING_PROFILES[profile_name]
+    movflags = "frag_keyframe+empty_moov+default_base_moof" if fragmented else "+faststart"
+    fps = profile["fps"]
+    return [
+        "-r", str(fps),
+        "-c:v", "libx264",
+        "-preset", profile["preset"],
+        "-tune", "stillimage",
+        "-crf", str(profile["crf"]),
+        "-g", str(fps * profile["gop_seconds"]),
+        "-keyint_min", str(fps),
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-b:a", profile["audio_bitrate"],
+        "-movflags", movflags,
+        "-threads", str(threads),
+    ]
@@ -0,0 +1,247 @@
+# 📁 services/ffmpeg_runner.py
+import random
+import subprocess
+import threading
+import time
+from collections import deque
+from ..config import FFMPEG_BIN, DEFAULT_ENCODING_PROFILE, FFMPEG_LOG_TAIL_LINES, FFMPEG_LOG_SAMPLE_RATE
+from ..utils.logger import log
+from .encoding_profiles import encoding_args, input_frame_rate
+
+# -progress pipe:2 → 통계 줄 대신 key=value 블록을 stderr로 (progress=continue/end 로 끝남)
+PROGRESS_ARGS = ["-progress", "pipe:2", "-nostats"]
+_PROGRESS_KEYS = {
+    "frame", "fps", "bitrate", "total_size", "out_time_us", "out_time_ms", "out_time",
+    "dup_frames", "drop_frames", "speed", "progress",
+}
+
+def build_render_command(template_path: str, image_path: str, audio_path: str,
+                         filter_complex: str, output_path: str, duration: float,
+                         threads: int = 1, profile: str = DEFAULT_ENCODING_PROFILE) -> list:
+    """
+    입력 0: 템플릿 프레임, 1: 배경 이미지, 2: 오디오 → mp4 1개
+    output_path가 "pipe:1"이면 stdout으로 fragmented MP4 출력
+    """
+    fps = str(input_frame_rate(profile))
+    piped = output_path.startswith("pipe:")
+    output_args = ["-f", "mp4", output_path] if piped else [output_path]
+    return [
+        FFMPEG_BIN, "-y", *PROGRESS_ARGS,
+        "-loop", "1", "-framerate", fps, "-t", str(duration), "-i", template_path,
+        "-loop", "1", "-framerate", fps, "-t", str(duration), "-i", image_path,
+        "-i", audio_path,
+        "-filter_complex", filter_complex,
+        "-filter_complex_threads", str(threads),
+        "-map", "2:a",
+        "-shortest",
+    ] + encoding_args(profile, threads, fragmented=piped) + output_args
+
+class FFmpegProgress:
+    """
+    ffmpeg -progress 출력 파서 → 진행률/인코딩 fps/ETA
+    :param duration: 출력 길이(초, 오디오 길이) → 없으면 percent/eta는 None
+    :param on_update: 블록이 끝날 때마다 snapshot dict로 호출
+    """
+
+    def __init__(self, duration: float = None, on_update=None):
+        self.duration = duration
+        self.on_update = on_update
+        self.started = time.monotonic()
+        self._block = {}
+        self.snapshot = {"percent": 0.0, "fps": None, "speed": None, "eta_seconds": None,
+                         "out_seconds": 0.0, "frame": 0, "done": False}
+
+    def feed(self, line: str) -> bool:
+        """stderr 한 줄 → progress 줄이면 True (로그에서 빼도 됨)"""
+        key, sep, value = line.strip().partition("=")
+        # 일반 통계 줄(frame=  1 fps=...)은 = 가 여러 개
+        if not sep or "=" in value or key not in _PROGRESS_KEYS and not key.startswith("stream_"):
+            return False
+        self._block[key] = value.strip()
+        if key == "progress":
+            self._finish_block()
+        return True
+
+    def _finish_block(self):
+        block, self._block = self._block, {}
+        out_us = _to_float(block.get("out_time_us")) or _to_float(block.get("out_time_ms"))
+        out_seconds = max(0.0, out_us / 1_000_000) if out_us is not None else self.snapshot["out_seconds"]
+        speed = _to_float(block.get("speed", "").rstrip("x"))
+        done = block.get("progress") == "end"
+
+        percent = eta = None
+        if self.duration:
+            percent = 100.0 if done else min(99.9, out_seconds / self.duration * 100)
+            remaining = max(0.0, self.duration - out_seconds)
+            if done:
+                eta = 0.0
+            elif speed:
+                eta = remaining / speed
+            elif out_seconds > 0:
+                eta = remaining * (time.monotonic() - self.started) / out_seconds
+
+        self.snapshot = {
+            "percent": round(percent, 1) if percent is not None else None,
+            "fps": _to_float(block.get("fps")),
+            "speed": speed,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "out_seconds": round(out_seconds, 2),
+            "frame": int(_to_float(block.get("frame")) or 0),
+            "done": done,
+        }
+        if self.on_update:
+            try:
+                self.on_update(dict(self.snapshot))
+            except Exception:
+                pass  # 진행률 보고 실패가 렌더를 깨면 안 됨
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class StderrTail:
+    """ffmpeg stderr 마지막 max_lines줄 링 버퍼 (렌더 길이와 관계없이 메모리 고정)"""
+
+    MAX_LINE_CHARS = 2000
+
+    def __init__(self, max_lines: int = FFMPEG_LOG_TAIL_LINES):
+        self.lines = deque(maxlen=max_lines)
+        self.total = 0
+
+    def append(self, line: str):
+        self.lines.append(line[:self.MAX_LINE_CHARS])
+        self.total += 1
+
+    def text(self) -> str:
+        omitted = self.total - len(self.lines)
+        return (f"... ({omitted} lines omitted)\n" if omitted else "") + "".join(self.lines)
+
+def _read_stderr(stream, progress, tail: StderrTail):
+    """stderr를 줄 단위로 읽어 progress 줄은 파서로, 나머지는 링 버퍼에"""
+    for raw in iter(stream.readline, b""):
+        line = raw.decode(errors="replace")
+        if progress is None or not progress.feed(line):
+            tail.append(line)
+
+def log_ffmpeg_output(returncode: int, output: str, **fields):
+    """ffmpeg stderr 꼬리 기록: 실패하면 항상, 성공하면 FFMPEG_LOG_SAMPLE_RATE 확률로만"""
+    if returncode != 0:
+        log("🧨 ffmpeg failed", level="error", returncode=returncode, stderr_tail=output, **fields)
+    elif random.random() < FFMPEG_LOG_SAMPLE_RATE:
+        log("🎬 ffmpeg stderr (sampled)", returncode=returncode, stderr_tail=output, **fields)
+
+def run_ffmpeg(command: list, timeout: float = 180, progress: FFmpegProgress = None) -> tuple:
+    """
+    ffmpeg 실행 → (returncode, stderr 마지막 FFMPEG_LOG_TAIL_LINES줄)
+    stderr를 줄 단위로 읽으며 progress가 있으면 진행률 갱신 (progress 줄은 stderr 문자열에서 제외)
+    timeout 초과 시 프로세스를 종료하고 returncode -1
+    """
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    watchdog = threading.Timer(timeout, kill)
+    watchdog.start()
+    tail = StderrTail()
+    try:
+        _read_stderr(process.stderr, progress, tail)
+        process.wait()
+    finally:
+        watchdog.cancel()
+
+    output = tail.text()
+    if timed_out.is_set():
+        return -1, output + f"\nFFmpeg timed out after {timeout}s"
+    return process.returncode, output
+
+class FFmpegError(Exception):
+    def __init__(self, returncode: int, output: str):
+        super().__init__(f"FFmpeg failed with code {returncode}")
+        self.returncode = returncode
+        self.output = output
+
+class FFmpegStream:
+    """
+    ffmpeg stdout을 청크 단위로 넘겨주는 이터러블 (requests data= 에 바로 사용 → chunked 업로드)
+    전체 영상을 메모리/디스크에 쌓지 않음
+    끝까지 읽은 뒤 returncode != 0 이면 FFmpegError
+    """
+
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, command: list, timeout: float = 180, progress: FFmpegProgress = None):
+        self.command = command
+        self.timeout = timeout
+        self.progress = progress
+        self.returncode = None
+        self.output = ""
+        self.bytes_sent = 0
+        self._process = None
+
+    def close(self):
+        """소비 쪽이 중간에 포기했을 때 ffmpeg 종료"""
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+    def __iter__(self):
+        process = subprocess.Popen(self.command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._process = process
+        tail = StderrTail()
+        # stderr를 따로 비워주지 않으면 파이프가 차서 ffmpeg가 멈춤 (진행률도 여기서 파싱)
+        drain = threading.Thread(
+            target=_read_stderr, args=(process.stderr, self.progress, tail), daemon=True
+        )
+        drain.start()
+        watchdog = threading.Timer(self.timeout, process.kill)
+        watchdog.start()
+        try:
+            while True:
+                chunk = process.stdout.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.bytes_sent += len(chunk)
+                yield chunk
+            process.wait()
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:  # 업로드 쪽이 먼저 끊긴 경우
+                process.kill()
+                process.wait()
+            drain.join(timeout=5)
+            self.returncode = process.returncode
+            self.output = tail.text()
+
+        if self.returncode != 0:
+            raise FFmpegError(self.returncode, self.output)
+
+def build_multi_output_command(template_paths: list, image_path: str, audio_path: str,
+                               filter_complex: str, outputs: list, duration: float,
+                               threads: int = 1, profile: str = DEFAULT_ENCODING_PROFILE) -> list:
+    """
+    입력 0..N-1: 템플릿 프레임, N: 배경 이미지, N+1: 오디오 → 출력 여러 개 (ffmpeg 1회)
+    오디오는 1번 디코딩해서 각 mp4 출력이 같이 씀
+    :param outputs: [{"label", "path", "kind": "video" | "poster"}] (label = filter_complex 출력 라벨)
+    """
+    fps = str(input_frame_rate(profile))
+    audio_index = len(template_paths) + 1
+    command = [FFMPEG_BIN, "-y", *PROGRESS_ARGS]
+    for path in list(template_paths) + [image_path]:
+        command += ["-loop", "1", "-framerate", fps, "-t", str(duration), "-i", path]
+    command += [
+        "-i", audio_path,
+        "-filter_complex", filter_complex,
+        "-filter_complex_threads", str(threads),
+    ]
+    for output in outputs:
+        if output["kind"] == "poster":
+            command += ["-map", f"[{output['label']}]", "-frames:v", "1", "-q:v", "3", output["path"]]
+        else:
+            command += ["-map", f"[{output['label']}]", "-map", f"{audio_index}:a", "-shortest"]
+            command += encoding_args(profile, threads) + [output["path"]]
+    return command
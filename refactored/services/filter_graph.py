@@ -0,0 +1,62 @@
+# 📁 services/filter_graph.py
+
+def build_filter_complex(layout, subtitle_filter: str) -> str:
+    """
+    입력 0: 템플릿 프레임, 입력 1: 배경 이미지
+    배경을 video_area 크기로 맞춰 템플릿 위에 overlay → 자막 필터
+    """
+    area = layout.video_area
+    return (
+        f"[1:v]scale={area.w}:{area.h}[scaled];"
+        f"[0:v][scaled]overlay={area.x}:{area.y},{subtitle_filter}"
+    )
+
+def build_multi_output_filter(layouts: list, subtitle_filters: list, renditions: list,
+                              poster_at: float = None) -> tuple:
+    """
+    한 번의 ffmpeg 실행으로 여러 산출물 (템플릿 A/B × 해상도 + 포스터)
+    입력 0..N-1: 템플릿 프레임 (layouts 순서), 입력 N: 배경 이미지
+    배경은 1번만 디코딩해서 split → 템플릿별 scale/overlay/자막 (자막 래스터화는 템플릿당 1번)
+    → 합성 결과를 split → 렌디션별 scale (+ poster_at초 프레임 1장)
+    :param renditions: 템플릿별 [(이름, (w, h) 또는 None=프레임 원본 크기)]
+    :return: (filter_complex, [(템플릿 index, 이름, 출력 라벨)]) → 포스터는 이름 "poster"
+    """
+    count = len(layouts)
+    chains = []
+    backgrounds = [f"[bg{i}]" for i in range(count)]
+    if count > 1:
+        chains.append(f"[{count}:v]split={count}" + "".join(backgrounds))
+    else:
+        backgrounds = [f"[{count}:v]"]
+
+    outputs = []
+    for i, (layout, subtitle_filter) in enumerate(zip(layouts, subtitle_filters)):
+        area = layout.video_area
+        chains.append(f"{backgrounds[i]}scale={area.w}:{area.h}[scaled{i}]")
+        branches = [(name, size) for name, size in renditions[i]]
+        if poster_at is not None:
+            branches.append(("poster", None))
+
+        composed = f"[{i}:v][scaled{i}]overlay={area.x}:{area.y},{subtitle_filter}"
+        if len(branches) == 1:
+            name, size = branches[0]
+            label = f"t{i}_{name}"
+            chains.append(composed + _branch_filter(name, size, poster_at, prefix=",") + f"[{label}]")
+            outputs.append((i, name, label))
+            continue
+
+        chains.append(composed + f",split={len(branches)}" + "".join(f"[c{i}_{n}]" for n, _ in branches))
+        for name, size in branches:
+            label = f"t{i}_{name}"
+            chains.append(f"[c{i}_{name}]" + (_branch_filter(name, size, poster_at) or "null") + f"[{label}]")
+            outputs.append((i, name, label))
+
+    return ";".join(chains), outputs
+
+def _branch_filter(name: str, size, poster_at: float, prefix: str = "") -> str:
+    if name == "poster":
+        # 자막이 페이드인된 뒤의 프레임 1장
+        return f"{prefix}trim=start={poster_at},setpts=PTS-STARTPTS"
+    if size:
+        return f"{prefix}scale={size[0]}:{size[1]}"
+    return ""
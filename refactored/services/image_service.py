@@ -1,5 +1,22 @@
 import random
 import requests
+from ..utils.async_io import get_async_client
+from ..utils.logger import log
+from ..utils.metrics import api_call
+
+DALLE_URL = "https://api.openai.com/v1/images/generations"
+
+def _dalle_request(prompt: str):
+    headers = {
+        "Authorization": f"Bearer YOUR_OPENAI_KEY",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "prompt": prompt,
+        "n": 1,
+        "size": "1024x1024"
+    }
+    return headers, payload
 
 def get_image_url(is_paid: bool, prompt: str = "", default_pool=None) -> str:
     """
@@ -12,20 +29,27 @@ def get_image_url(is_paid: bool, prompt: str = "", default_pool=None) -> str:
 
     # 유료 → DALL·E API 호출
     try:
-        dalle_url = "https://api.openai.com/v1/images/generations"
-        headers = {
-            "Authorization": f"Bearer YOUR_OPENAI_KEY",
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "prompt": prompt,
-            "n": 1,
-            "size": "1024x1024"
-        }
-        res = requests.post(dalle_url, headers=headers, json=payload)
-        res.raise_for_status()
+        headers, payload = _dalle_request(prompt)
+        with api_call("openai_images"):
+            res = requests.post(DALLE_URL, headers=headers, json=payload)
+            res.raise_for_status()
         img_url = res.json()["data"][0]["url"]
         return img_url
     except Exception as e:
-        print("❌ DALL·E 오류 fallback → 기본 이미지 사용:", e)
+        log(f"❌ DALL·E 오류 fallback → 기본 이미지 사용: {e}", level="error")
+        return random.choice(default_pool or DEFAULT_IMAGE_POOL)
+
+async def get_image_url_async(is_paid: bool, prompt: str = "", default_pool=None) -> str:
+    """get_image_url의 비동기 버전 (공용 AsyncClient)"""
+    if not is_paid:
+        return random.choice(default_pool or DEFAULT_IMAGE_POOL)
+
+    try:
+        headers, payload = _dalle_request(prompt)
+        with api_call("openai_images"):
+            res = await get_async_client().post(DALLE_URL, headers=headers, json=payload)
+            res.raise_for_status()
+        return res.json()["data"][0]["url"]
+    except Exception as e:
+        log(f"❌ DALL·E 오류 fallback → 기본 이미지 사용: {e}", level="error")
         return random.choice(default_pool or DEFAULT_IMAGE_POOL)
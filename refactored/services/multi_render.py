@@ -0,0 +1,291 @@
+# 📁 services/multi_render.py
+import os
+import time
+import uuid
+from datetime import datetime
+from functools import partial
+from ..config import (
+    RENDER_ADMISSION_TIMEOUT, MAX_IMAGE_BYTES, MAX_AUDIO_BYTES, SUBTITLE_ENGINE,
+    MULTI_MAX_TEMPLATES, MULTI_MAX_RENDITIONS, POSTER_TIME_SECONDS
+)
+from ..utils.asset_cache import link_cached_asset
+from ..utils.http_fetcher import FetchError, fetch_concurrently, fetch_to_file
+from ..utils.logger import log
+from ..utils.metrics import metric_labels, stage, observe_stage, outcome_for_status, count_request
+from ..utils.media_probe import MediaProbeError, probe_media, probe_image_size
+from ..utils.scratch import create_scratch_dir, remove_scratch_dir
+from ..utils.supabase_utils import fix_url, sign_when_ready, supabase_insert_videos
+from ..utils.upload_manager import upload_artifacts
+from .encoding_profiles import RENDITIONS, rendition_size, resolve_encoding_profile
+from .ffmpeg_runner import build_multi_output_command, run_ffmpeg, log_ffmpeg_output
+from .filter_graph import build_multi_output_filter
+from .render_queue import submit_render_job, track_render_progress
+from .render_scheduler import RenderCapacityError, capacity_error_response, render_slot
+from .subtitle import DEFAULT_FRAME_SIZE, build_subtitle_cues, build_drawtext_filter, build_ass_filter
+from .template_registry import get_template, TemplateError, TemplateParseError
+
+# 같은 대본을 여러 산출물로: 템플릿 A/B × 해상도(1080p 마스터, 480p 미리보기...) + 포스터 이미지
+# ffmpeg 1회 → 오디오/배경 이미지 디코딩, 자막 큐 계산은 1번 (자막 래스터화는 템플릿당 1번)
+# 영상 출력마다 videos 행 1개 (각자 uuid → signed URL 갱신/TTL은 기존 경로 그대로)
+# 배경/오디오 객체는 그룹 uuid 이름으로 1번만 업로드해서 행끼리 공유
+#
+# 선택 컬럼 (없으면 빼고 저장, 응답에는 항상 포함):
+# poster_path가 있는 행은 signed URL 번들(단건/일괄)을 만들 때마다 포스터도 새로 서명해서 poster_url로 반환
+#   alter table videos add column rendition text;
+#   alter table videos add column poster_path text;
+
+OPTIONAL_COLUMNS = ("rendition", "poster_path")
+
+def _split_list(value) -> list:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+def parse_multi_params(req) -> dict:
+    """
+    요청 form → 다중 렌더 파라미터
+    template_ids / renditions: 쉼표 구분 (없으면 template_id 1개, source 1개)
+    """
+    template_ids = _split_list(req.form.get("template_ids")) or _split_list(req.form.get("template_id"))
+    return {
+        "image_url": fix_url(req.form.get("image_url")),
+        "audio_url": fix_url(req.form.get("mp3_url")),
+        "text": req.form.get("text"),
+        "user_id": req.form.get("user_id"),
+        "template_ids": list(dict.fromkeys(template_ids)),
+        "renditions": list(dict.fromkeys(_split_list(req.form.get("renditions")) or ["source"])),
+        "poster": req.form.get("poster", "true").lower() == "true",
+        "subtitle_engine": req.form.get("subtitle_engine"),
+        "encoding_profile": req.form.get("encoding_profile"),
+        "content_type": req.form.get("content_type"),
+    }
+
+def validate_multi_params(params: dict):
+    """입력 오류 메시지 (정상이면 None)"""
+    if not params["image_url"] or not params["audio_url"] or not params["text"] or not params["template_ids"]:
+        return "image_url, mp3_url, text, template_ids are required"
+    if len(params["template_ids"]) > MULTI_MAX_TEMPLATES:
+        return f"At most {MULTI_MAX_TEMPLATES} templates per request"
+    if len(params["renditions"]) > MULTI_MAX_RENDITIONS:
+        return f"At most {MULTI_MAX_RENDITIONS} renditions per request"
+    unknown = [name for name in params["renditions"] if name not in RENDITIONS]
+    if unknown:
+        return f"Unknown rendition: {', '.join(unknown)} (choose from {', '.join(RENDITIONS)})"
+    return None
+
+def handle_generate_multi(req):
+    params = parse_multi_params(req)
+    error = validate_multi_params(params)
+    if error:
+        return {"error": error}, 400
+
+    if req.form.get("mode") == "async":
+        try:
+            job_id = submit_render_job(partial(render_multi, slot_timeout=None), params)
+        except RenderCapacityError as e:
+            return capacity_error_response(e.retry_after)
+        return {
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/render_status/{job_id}"
+        }, 202
+
+    body, status_code = render_multi(params)
+    if status_code == 503 and "retry_after" in body:
+        return capacity_error_response(body["retry_after"])
+    return body, status_code
+
+def render_multi(params: dict, slot_timeout=RENDER_ADMISSION_TIMEOUT):
+    """
+    다운로드 → ffmpeg 1회(출력 여러 개) → 업로드 → 일괄 서명 → videos 행 일괄 저장
+    :return: (응답 dict, HTTP 상태코드)
+    """
+    job_dir = None
+    started = time.perf_counter()
+    # 지표 라벨은 첫 템플릿 기준 (A/B 조합마다 라벨을 만들지 않음)
+    with metric_labels(template_id=params["template_ids"][0], content_type=params.get("content_type")):
+        try:
+            group_id = str(uuid.uuid4())
+            job_dir = create_scratch_dir(group_id)
+            body, status_code = _render_multi_in(params, group_id, job_dir, slot_timeout)
+        except Exception as e:
+            body, status_code = {"error": str(e)}, 500
+        finally:
+            if job_dir:
+                remove_scratch_dir(job_dir)
+        observe_stage("total_multi", time.perf_counter() - started, outcome_for_status(status_code))
+        count_request("render_multi", status_code)
+    return body, status_code
+
+def _render_multi_in(params: dict, group_id: str, job_dir: str, slot_timeout):
+    text = params["text"]
+    user_id = params.get("user_id")
+    template_ids = params["template_ids"]
+
+    # ✅ 템플릿 레이아웃 (레지스트리 캐시)
+    templates = []
+    for template_id in template_ids:
+        try:
+            templates.append(get_template(template_id))
+        except TemplateParseError as e:
+            return {"error": str(e), "template_id": template_id}, 500
+        except TemplateError:
+            return {"error": "Failed to fetch template from DB", "template_id": template_id}, 400
+
+    # 프로필은 요청값 → 첫 템플릿 설정 → 기본값 (모든 출력이 같은 프로필)
+    try:
+        encoding_profile = resolve_encoding_profile(params.get("encoding_profile"), templates[0])
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    image_name = f"{group_id}_bg.jpg"
+    audio_name = f"{group_id}_audio.mp3"
+    image_path = os.path.join(job_dir, image_name)
+    audio_path = os.path.join(job_dir, audio_name)
+    template_paths = [os.path.join(job_dir, f"{group_id}_tpl{i}.jpg") for i in range(len(templates))]
+
+    # ✅ 입력 동시 다운로드 (배경/오디오 1번, 템플릿 프레임은 템플릿마다)
+    fetches = {
+        "image": partial(link_cached_asset, params["image_url"], image_path, MAX_IMAGE_BYTES),
+        "audio": partial(fetch_to_file, params["audio_url"], audio_path, MAX_AUDIO_BYTES),
+    }
+    for i, template in enumerate(templates):
+        fetches[f"template{i}"] = partial(
+            link_cached_asset, fix_url(template.frame_url), template_paths[i], MAX_IMAGE_BYTES
+        )
+    try:
+        fetch_concurrently(fetches)
+    except FetchError as e:
+        if e.name.startswith("template"):
+            return {"error": f"Failed to download template frame: {e}"}, 400
+        return {"error": "Failed to download image or audio", "detail": str(e)}, 400
+
+    try:
+        audio_duration = probe_media(audio_path).duration
+    except MediaProbeError as e:
+        return {"error": f"Failed to read audio: {e}"}, 400
+    duration = round(audio_duration, 2)
+
+    # ✅ 자막 큐는 1번, 필터는 템플릿 레이아웃마다
+    cues = build_subtitle_cues(text, audio_duration)
+    engine = params.get("subtitle_engine") or SUBTITLE_ENGINE
+    subtitle_filters, renditions = [], []
+    for i, template in enumerate(templates):
+        frame_size = probe_image_size(template_paths[i]) or DEFAULT_FRAME_SIZE
+        if engine == "drawtext":
+            subtitle_filters.append(build_drawtext_filter(cues, template))
+        else:
+            ass_path = os.path.join(job_dir, f"{group_id}_subs{i}.ass")
+            subtitle_filters.append(build_ass_filter(cues, template, ass_path, frame_size))
+        renditions.append([(name, rendition_size(name, frame_size)) for name in params["renditions"]])
+
+    poster_at = min(POSTER_TIME_SECONDS, duration / 2) if params.get("poster") else None
+    filter_complex, labels = build_multi_output_filter(templates, subtitle_filters, renditions, poster_at)
+
+    # 출력별 객체 이름: 영상은 행 uuid, 포스터는 그룹 uuid + 템플릿 순번
+    video_ids = {}
+    outputs = []
+    for index, name, label in labels:
+        if name == "poster":
+            object_name = f"{group_id}_{index}_poster.jpg"
+            kind = "poster"
+        else:
+            video_ids[(index, name)] = str(uuid.uuid4())
+            object_name = f"{video_ids[(index, name)]}_video.mp4"
+            kind = "video"
+        outputs.append({
+            "template_index": index, "name": name, "label": label, "kind": kind,
+            "object_name": object_name, "path": os.path.join(job_dir, object_name),
+        })
+
+    # ✅ ffmpeg 슬롯 1개로 전체 출력 (템플릿 수만큼 시간 제한 여유)
+    try:
+        with render_slot(slot_timeout) as ffmpeg_threads:
+            command = build_multi_output_command(
+                template_paths, image_path, audio_path, filter_complex, outputs,
+                duration, threads=ffmpeg_threads, profile=encoding_profile
+            )
+            log("🎬 ffmpeg start (multi)", level="debug", command=command, outputs=len(outputs))
+            with stage("ffmpeg_multi") as span, track_render_progress(duration) as progress:
+                returncode, ffmpeg_output = run_ffmpeg(command, timeout=180 * len(templates), progress=progress)
+                if returncode != 0:
+                    span.fail()
+    except RenderCapacityError as e:
+        return {"error": "Render capacity saturated", "retry_after": e.retry_after}, 503
+
+    log_ffmpeg_output(returncode, ffmpeg_output, template_ids=template_ids)
+    if returncode != 0:
+        return {"error": "FFmpeg failed", "ffmpeg_output": ffmpeg_output}, 500
+
+    missing = [o["object_name"] for o in outputs if not os.path.exists(o["path"])]
+    if missing:
+        return {"error": "Output file not found after FFmpeg", "missing": missing}, 500
+
+    # ⏫ 입력 2개 + 출력 전부 동시 업로드
+    artifacts = [
+        {"name": "audio", "path": audio_path, "object_name": audio_name, "content_type": "audio/mpeg"},
+        {"name": "image", "path": image_path, "object_name": image_name, "content_type": "image/jpeg"},
+    ] + [
+        {
+            "name": o["label"], "path": o["path"], "object_name": o["object_name"],
+            "content_type": "image/jpeg" if o["kind"] == "poster" else "video/mp4"
+        }
+        for o in outputs
+    ]
+    upload_results = upload_artifacts(artifacts)
+    if not all(r["ok"] for r in upload_results.values()):
+        failed = [name for name, r in upload_results.items() if not r["ok"]]
+        return {"error": "Upload to Supabase failed", "failed": failed}, 500
+
+    # ✍️ 전체 객체를 한 번의 요청으로 서명
+    signed = sign_when_ready([audio_name, image_name] + [o["object_name"] for o in outputs])
+    if not all(signed.values()):
+        return {"error": "Failed to generate one or more signed URLs"}, 500
+
+    posters = {o["template_index"]: o["object_name"] for o in outputs if o["kind"] == "poster"}
+    now = datetime.utcnow().isoformat()
+    rows = []
+    for o in outputs:
+        if o["kind"] != "video":
+            continue
+        rows.append({
+            "uuid": video_ids[(o["template_index"], o["name"])],
+            "image_path": f"uploads/{image_name}",
+            "audio_path": f"uploads/{audio_name}",
+            "video_path": f"uploads/{o['object_name']}",
+            "image_signed_url": signed[image_name],
+            "audio_signed_url": signed[audio_name],
+            "video_signed_url": signed[o["object_name"]],
+            "signed_created_at": now,
+            "user_id": user_id,
+            "text": text,
+            "template_id": template_ids[o["template_index"]],
+            "created_at": now,
+            "rendition": o["name"],
+            "poster_path": f"uploads/{posters[o['template_index']]}" if o["template_index"] in posters else None,
+        })
+
+    inserted = supabase_insert_videos(rows, optional_columns=OPTIONAL_COLUMNS)
+    if not inserted:
+        log(f"❌ Failed to insert video rows: {group_id}", level="error")
+    log(f"🎞️ 다중 렌더 {group_id}: 템플릿 {len(templates)}개, 출력 {len(outputs)}개")
+
+    results = []
+    for i, template_id in enumerate(template_ids):
+        results.append({
+            "template_id": template_id,
+            "poster_url": signed[posters[i]] if i in posters else None,
+            "renditions": [
+                {
+                    "rendition": o["name"],
+                    "video_url": signed[o["object_name"]],
+                    "log_id": video_ids[(i, o["name"])] if inserted else None,
+                }
+                for o in outputs if o["template_index"] == i and o["kind"] == "video"
+            ],
+        })
+
+    return {
+        "group_id": group_id,
+        "image_url": signed[image_name],
+        "audio_url": signed[audio_name],
+        "outputs": results
+    }, 200
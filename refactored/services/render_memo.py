@@ -0,0 +1,98 @@
+# 📁 services/render_memo.py
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from ..config import RENDER_MEMO_MAX_ENTRIES
+from ..utils.logger import log
+from ..utils.media_probe import file_content_hash
+
+# 렌더 지문 = hash(템플릿 id+버전, 배경 이미지 바이트, 오디오 바이트, 정규화한 텍스트, 프로필, 자막 엔진, user_id)
+# 색인: 프로세스 메모리 LRU (지문 → videos.uuid) + videos.render_fingerprint 컬럼 (워커/재시작 간 공유)
+# 같은 지문의 렌더가 진행 중이면 새로 시작하지 않고 그 결과를 기다림 (single-flight)
+#
+# 필요한 컬럼 (없으면 메모리 색인만 사용):
+#   alter table videos add column render_fingerprint text;
+#   create index videos_render_fingerprint_idx on videos (render_fingerprint);
+
+_index = OrderedDict()  # 지문 → videos.uuid (LRU)
+_inflight = {}  # 지문 → Future[(응답 dict, 상태코드)]
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+def normalize_text(text: str) -> str:
+    """자막 줄바꿈(textwrap)이 공백을 어차피 합치므로 결과가 같은 텍스트는 같은 값으로"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+def render_fingerprint(template, image_path: str, audio_path: str, text: str,
+                       encoding_profile: str, subtitle_engine: str, user_id) -> str:
+    parts = [
+        "v1",
+        str(template.template_id), str(template.version),
+        file_content_hash(image_path), file_content_hash(audio_path),
+        normalize_text(text), str(encoding_profile), str(subtitle_engine), str(user_id or ""),
+    ]
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=20).hexdigest()
+
+def remember(fingerprint: str, video_uuid: str):
+    with _lock:
+        _index[fingerprint] = video_uuid
+        _index.move_to_end(fingerprint)
+        while len(_index) > RENDER_MEMO_MAX_ENTRIES:
+            _index.popitem(last=False)
+
+def forget(fingerprint: str):
+    with _lock:
+        _index.pop(fingerprint, None)
+
+def lookup(fingerprint: str, db_lookup=None):
+    """지문 → 기존 videos.uuid (메모리 → DB 순), 없으면 None"""
+    with _lock:
+        video_uuid = _index.get(fingerprint)
+        if video_uuid:
+            _index.move_to_end(fingerprint)
+            return video_uuid
+    if db_lookup:
+        video_uuid = db_lookup(fingerprint)
+        if video_uuid:
+            remember(fingerprint, video_uuid)
+        return video_uuid
+    return None
+
+def memoized(fingerprint: str, reuse, render):
+    """
+    :param reuse: () → (응답, 상태) 또는 None (재사용할 산출물 없음)
+    :param render: () → (응답, 상태) 실제 렌더
+    같은 지문을 동시에 요청하면 첫 요청만 reuse/render를 실행하고 나머지는 그 결과를 공유
+    """
+    with _lock:
+        future = _inflight.get(fingerprint)
+        leader = future is None
+        if leader:
+            future = _inflight[fingerprint] = Future()
+        else:
+            _stats["coalesced"] += 1
+
+    if not leader:
+        log(f"🧬 진행 중인 동일 렌더 대기: {fingerprint[:12]}")
+        return future.result()
+
+    try:
+        result = reuse()
+        with _lock:
+            _stats["hits" if result else "misses"] += 1
+        if result is None:
+            result = render()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(fingerprint, None)
+
+def get_memo_stats() -> dict:
+    with _lock:
+        return dict(_stats, indexed=len(_index), inflight=len(_inflight))
@@ -0,0 +1,146 @@
+# 📁 services/render_queue.py
+import contextvars
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from ..config import RENDER_WORKERS, RENDER_JOB_TTL_SECONDS, RENDER_MAX_QUEUED_JOBS
+from ..utils.logger import log, bind_job_id
+from .ffmpeg_runner import FFmpegProgress
+from .render_scheduler import RenderCapacityError, estimate_wait_seconds, report_render_eta, clear_render_eta
+
+# 작업 상태: queued → running → done / failed
+_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+_jobs = {}
+_lock = threading.Lock()
+_finished = threading.Condition(_lock)  # 작업이 done/failed가 될 때마다 notify
+_changed = threading.Condition(_lock)  # 상태/진행률이 바뀔 때마다 notify (SSE)
+
+# 워커 스레드에서 실행 중인 작업 ID (렌더 함수가 진행률을 보고할 때 사용)
+current_job_id = contextvars.ContextVar("render_job_id", default=None)
+
+def submit_render_job(render_fn, params: dict) -> str:
+    """
+    렌더 작업을 워커 풀에 등록하고 job_id를 바로 반환
+    :param render_fn: params → (응답 dict, 상태코드) 를 반환하는 함수
+    :raises RenderCapacityError: 대기 중인 작업이 RENDER_MAX_QUEUED_JOBS 이상일 때
+    """
+    _prune_finished_jobs()
+
+    queued = count_queued_jobs()
+    if queued >= RENDER_MAX_QUEUED_JOBS:
+        raise RenderCapacityError(estimate_wait_seconds(queued))
+
+    job_id = str(uuid.uuid4())
+    with _lock:
+        _jobs[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "template_id": params.get("template_id"),
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "progress": None,
+            "version": 0,
+        }
+
+    _executor.submit(_run_job, job_id, render_fn, params)
+    log(f"📥 렌더 작업 등록: {job_id}")
+    return job_id
+
+def get_render_job(job_id: str):
+    """작업 상태 조회 (없으면 None)"""
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+def count_queued_jobs() -> int:
+    with _lock:
+        return sum(1 for job in _jobs.values() if job["status"] == "queued")
+
+def wait_for_jobs(job_ids, timeout: float = None) -> list:
+    """
+    job_ids 중 끝난(done/failed) 작업 목록 반환, 하나도 없으면 timeout까지 대기
+    (없어진 작업 ID는 무시)
+    """
+    def finished():
+        return [dict(_jobs[j]) for j in job_ids if j in _jobs and _jobs[j]["status"] in ("done", "failed")]
+
+    with _finished:
+        _finished.wait_for(finished, timeout)
+        return finished()
+
+@contextmanager
+def track_render_progress(duration: float):
+    """
+    ffmpeg 진행률 파서 → 작업 상태(progress, 폴링/SSE) + 스케줄러 ETA (대기 시간 추정)
+    사용 예:
+    with track_render_progress(duration) as progress:
+        run_ffmpeg(command, progress=progress)
+    """
+    # 파서 콜백은 stderr 읽는 스레드에서 불리므로 작업 ID를 미리 잡아둠
+    job_id = current_job_id.get()
+    key = object()
+
+    def publish(snapshot):
+        if job_id:
+            _update_job(job_id, progress=snapshot)
+        if snapshot["eta_seconds"] is not None:
+            report_render_eta(key, snapshot["eta_seconds"])
+
+    try:
+        yield FFmpegProgress(duration, on_update=publish)
+    finally:
+        clear_render_eta(key)
+
+def wait_for_job_change(job_id: str, seen_version: int, timeout: float = None):
+    """
+    작업의 version이 seen_version보다 커질 때까지 대기 → 작업 dict (없어지면 None)
+    timeout이 지나면 바뀌지 않았어도 그대로 반환
+    """
+    with _changed:
+        _changed.wait_for(lambda: job_id not in _jobs or _jobs[job_id]["version"] > seen_version, timeout)
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+def _update_job(job_id: str, **fields):
+    with _lock:
+        if job_id in _jobs:
+            _jobs[job_id].update(fields)
+            _jobs[job_id]["version"] += 1
+            _changed.notify_all()
+            if fields.get("status") in ("done", "failed"):
+                _finished.notify_all()
+
+def _run_job(job_id: str, render_fn, params: dict):
+    _update_job(job_id, status="running", started_at=time.time())
+    token = current_job_id.set(job_id)
+    try:
+        with bind_job_id(job_id):
+            body, status_code = render_fn(params)
+    except Exception as e:
+        body, status_code = {"error": str(e)}, 500
+    finally:
+        current_job_id.reset(token)
+
+    if status_code < 400:
+        _update_job(job_id, status="done", result=body, finished_at=time.time())
+        log(f"✅ 렌더 작업 완료: {job_id}")
+    else:
+        _update_job(job_id, status="failed", error=body.get("error"), result=body,
+                    finished_at=time.time())
+        log(f"❌ 렌더 작업 실패: {job_id} | {body.get('error')}", level="error")
+
+def _prune_finished_jobs():
+    """끝난 지 RENDER_JOB_TTL_SECONDS가 지난 작업은 메모리에서 제거"""
+    cutoff = time.time() - RENDER_JOB_TTL_SECONDS
+    with _lock:
+        expired = [
+            job_id for job_id, job in _jobs.items()
+            if job["finished_at"] and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del _jobs[job_id]
@@ -0,0 +1,171 @@
+# 📁 services/render_scheduler.py
+import heapq
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psutil
+from ..config import (
+    RENDER_MAX_PARALLEL, FFMPEG_THREADS, RENDER_MEM_PER_JOB_MB,
+    RENDER_MAX_WAITING, RENDER_ADMISSION_TIMEOUT
+)
+
+class RenderCapacityError(Exception):
+    """렌더 슬롯이 가득 차서 작업을 받을 수 없을 때 (retry_after: 재시도 권장 초)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Render capacity saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+_cond = threading.Condition()
+_active = 0
+_waiting = 0
+_rejected_total = 0
+_avg_render_seconds = 30.0  # 최근 렌더 시간 EWMA (초기값은 보수적으로)
+_etas = {}  # 실행 중인 렌더 key → (ffmpeg -progress 기반 남은 초, 보고 시각)
+
+def _cpu_count() -> int:
+    return psutil.cpu_count(logical=True) or os.cpu_count() or 1
+
+def ffmpeg_thread_budget() -> int:
+    """ffmpeg 1개가 쓸 스레드 수 (-threads)"""
+    if FFMPEG_THREADS > 0:
+        return FFMPEG_THREADS
+    return max(1, min(4, _cpu_count() // 2))
+
+def _max_parallel() -> int:
+    """
+    동시에 돌릴 수 있는 ffmpeg 수
+    CPU: 코어 수 / 스레드 예산, 메모리: 실행 중인 렌더 + 가용 메모리 / 렌더당 예상 메모리
+    """
+    cpu_slots = max(1, _cpu_count() // ffmpeg_thread_budget())
+    available_mb = psutil.virtual_memory().available // (1024 * 1024)
+    mem_slots = _active + available_mb // RENDER_MEM_PER_JOB_MB
+
+    slots = min(cpu_slots, mem_slots)
+    if RENDER_MAX_PARALLEL > 0:
+        slots = min(slots, RENDER_MAX_PARALLEL)
+    return max(1, slots)
+
+def report_render_eta(key, eta_seconds: float):
+    """실행 중인 렌더의 남은 시간 보고 (ffmpeg 진행률 → 대기 시간 추정에 사용)"""
+    with _cond:
+        _etas[key] = (eta_seconds, time.monotonic())
+
+def clear_render_eta(key):
+    with _cond:
+        _etas.pop(key, None)
+
+def _active_remaining(now: float) -> list:
+    """실행 중인 렌더별 남은 초 (ETA 보고 전인 렌더는 평균 렌더 시간)"""
+    remaining = [max(0.0, eta - (now - reported)) for eta, reported in _etas.values()]
+    unknown = max(0, _active - len(remaining))
+    return sorted(remaining)[:_active] + [_avg_render_seconds] * unknown
+
+def estimate_wait_seconds(queued: int = 0) -> int:
+    """
+    지금 들어온 작업이 슬롯을 얻기까지 예상 대기 시간 (Retry-After 힌트)
+    실행 중인 렌더의 실제 ETA로 슬롯이 비는 시각을 계산하고, 앞선 대기 작업은 평균 렌더 시간만큼 차지
+    """
+    with _cond:
+        slots = _max_parallel()
+        free_at = _active_remaining(time.monotonic())
+        heapq.heapify(free_at)
+        # 실행 중인 렌더가 슬롯 수보다 많으면 (메모리 감소 등) 초과분이 먼저 끝나야 자리가 남
+        while len(free_at) > slots:
+            heapq.heappop(free_at)
+        free_at += [0.0] * (slots - len(free_at))
+        heapq.heapify(free_at)
+
+        for _ in range(_waiting + queued):
+            heapq.heappush(free_at, heapq.heappop(free_at) + _avg_render_seconds)
+        return max(1, int(round(free_at[0])))
+
+def acquire_render_slot(timeout=RENDER_ADMISSION_TIMEOUT) -> int:
+    """
+    렌더 슬롯 획득 → ffmpeg 스레드 예산 반환
+    :param timeout: 대기 최대 초 (None이면 무한 대기, 0이면 즉시 거절)
+    :raises RenderCapacityError: 대기열이 꽉 찼거나 timeout 초과
+    """
+    global _active, _waiting, _rejected_total
+
+    with _cond:
+        if _active < _max_parallel():
+            _active += 1
+            return ffmpeg_thread_budget()
+
+        if timeout == 0 or _waiting >= RENDER_MAX_WAITING:
+            _rejected_total += 1
+            raise RenderCapacityError(estimate_wait_seconds())
+
+        # 실행 중인 렌더가 모두 ETA를 보고했으면, timeout 안에 슬롯이 안 날 게 확실할 때 바로 거절
+        if timeout is not None and _etas and len(_etas) >= _active:
+            wait = estimate_wait_seconds()
+            if wait > timeout:
+                _rejected_total += 1
+                raise RenderCapacityError(wait)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        _waiting += 1
+        try:
+            while _active >= _max_parallel():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    _rejected_total += 1
+                    raise RenderCapacityError(estimate_wait_seconds())
+                # 메모리 여유는 notify 없이도 바뀌므로 주기적으로 다시 계산
+                _cond.wait(timeout=1.0 if remaining is None else min(1.0, remaining))
+        finally:
+            _waiting -= 1
+
+        _active += 1
+        return ffmpeg_thread_budget()
+
+def release_render_slot(elapsed_seconds: float = None):
+    global _active, _avg_render_seconds
+
+    with _cond:
+        _active = max(0, _active - 1)
+        if elapsed_seconds is not None:
+            _avg_render_seconds = 0.8 * _avg_render_seconds + 0.2 * elapsed_seconds
+        _cond.notify()
+
+@contextmanager
+def render_slot(timeout=RENDER_ADMISSION_TIMEOUT):
+    """
+    사용 예:
+    with render_slot() as threads:
+        subprocess.run([... "-threads", str(threads) ...])
+    """
+    threads = acquire_render_slot(timeout)
+    started = time.monotonic()
+    try:
+        yield threads
+    finally:
+        release_render_slot(time.monotonic() - started)
+
+def capacity_error_response(retry_after: int):
+    """RenderCapacityError → 서비스 응답 (body, 503, Retry-After 헤더)"""
+    return (
+        {"error": "Render capacity saturated", "retry_after": retry_after},
+        503,
+        {"Retry-After": str(retry_after)}
+    )
+
+def get_render_utilization() -> dict:
+    """튜닝용 현재 사용량 스냅샷"""
+    memory = psutil.virtual_memory()
+    with _cond:
+        return {
+            "active": _active,
+            "waiting": _waiting,
+            "max_parallel": _max_parallel(),
+            "threads_per_job": ffmpeg_thread_budget(),
+            "cpu_count": _cpu_count(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "mem_available_mb": memory.available // (1024 * 1024),
+            "mem_per_job_mb": RENDER_MEM_PER_JOB_MB,
+            "avg_render_seconds": round(_avg_render_seconds, 2),
+            "active_eta_seconds": [round(s, 1) for s in _active_remaining(time.monotonic())],
+            "rejected_total": _rejected_total,
+        }
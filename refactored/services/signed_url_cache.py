@@ -0,0 +1,182 @@
+# 📁 services/signed_url_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from ..config import (
+    TTL_SECONDS, SIGNED_URL_CACHE_MARGIN, SIGNED_URL_REFRESH_AHEAD, SIGNED_URL_CACHE_MAX, SIGNED_URL_CACHE_DIR
+)
+from ..utils.logger import log
+
+# (uuid, user_id) → signed URL 번들 {"video_url", "image_url", "audio_url", "signed_created_at"}
+# 키에 user_id가 들어가므로 소유자가 아닌 요청은 항상 캐시를 지나쳐 DB에서 403 처리
+# SIGNED_URL_CACHE_DIR이 설정되면 워커 간 공유용 JSON 파일도 함께 사용 (asset_cache와 같은 원자적 교체)
+#
+# 시간축 (signed_created_at 기준):
+#   ... fresh ... | refresh_at: 백그라운드 갱신 시작 | stale_at: 캐시에서 버림 | 실제 만료 (TTL_SECONDS)
+
+class SignedUrlError(Exception):
+    """번들 로더 실패 → (메시지, HTTP 상태)"""
+
+    def __init__(self, message, status=500):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+_cache = OrderedDict()  # (uuid, user_id) → 번들 (LRU)
+_lock = threading.Lock()
+_refreshing = set()
+_stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+def signed_at_epoch(signed_created_at) -> float:
+    """signed_created_at (UTC ISO 문자열, tz 유무 무관) → epoch 초, 읽을 수 없으면 0"""
+    try:
+        dt = datetime.fromisoformat(str(signed_created_at).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def stale_at(signed_created_at) -> float:
+    return signed_at_epoch(signed_created_at) + TTL_SECONDS - SIGNED_URL_CACHE_MARGIN
+
+def refresh_at(signed_created_at) -> float:
+    return stale_at(signed_created_at) - SIGNED_URL_REFRESH_AHEAD
+
+def get_signed_bundle(uuid, user_id, loader) -> dict:
+    """
+    캐시된 번들 반환, 갱신 시점이 지났으면 그대로 반환하면서 백그라운드 갱신
+    캐시에 없거나 stale이면 loader(uuid, user_id)를 동기 호출
+    :raises SignedUrlError: loader 실패
+    """
+    key = (str(uuid), str(user_id))
+    now = time.time()
+    bundle = _lookup(key, now)
+
+    if bundle is None:
+        with _lock:
+            _stats["misses"] += 1
+        return _load(key, loader)
+
+    with _lock:
+        _stats["hits"] += 1
+    if now >= refresh_at(bundle["signed_created_at"]):
+        _refresh_in_background(key, loader)
+    return bundle
+
+def peek_signed_bundle(uuid, user_id):
+    """갱신 시점 전의 번들만 반환 (없으면 None, loader 호출 없음) → 일괄 조회용"""
+    key = (str(uuid), str(user_id))
+    bundle = _lookup(key, time.time())
+    fresh = bundle is not None and time.time() < refresh_at(bundle["signed_created_at"])
+    with _lock:
+        _stats["hits" if fresh else "misses"] += 1
+    return bundle if fresh else None
+
+def store_signed_bundle(uuid, user_id, bundle: dict):
+    key = (str(uuid), str(user_id))
+    _remember(key, bundle)
+    _write_shared(key, bundle)
+
+def invalidate_signed_bundles(uuids) -> int:
+    """uuid들의 모든 번들 제거 (TTL 정리로 signed URL을 비울 때) → 제거된 메모리 항목 수"""
+    targets = {str(uuid) for uuid in uuids}
+    with _lock:
+        keys = [key for key in _cache if key[0] in targets]
+        for key in keys:
+            del _cache[key]
+    if targets and SIGNED_URL_CACHE_DIR and os.path.isdir(SIGNED_URL_CACHE_DIR):
+        prefixes = tuple(_uuid_prefix(uuid) for uuid in targets)
+        for name in os.listdir(SIGNED_URL_CACHE_DIR):
+            if name.startswith(prefixes):
+                _remove(os.path.join(SIGNED_URL_CACHE_DIR, name))
+    return len(keys)
+
+def get_signed_cache_stats() -> dict:
+    with _lock:
+        return dict(_stats, size=len(_cache))
+
+def _lookup(key, now):
+    with _lock:
+        bundle = _cache.get(key)
+        if bundle is not None:
+            _cache.move_to_end(key)
+    if bundle is None:
+        bundle = _read_shared(key)
+        if bundle is not None:
+            _remember(key, bundle)
+    if bundle is None or now >= stale_at(bundle["signed_created_at"]):
+        return None
+    return bundle
+
+def _load(key, loader) -> dict:
+    bundle = loader(*key)
+    store_signed_bundle(*key, bundle)
+    return bundle
+
+def _remember(key, bundle):
+    with _lock:
+        _cache[key] = bundle
+        _cache.move_to_end(key)
+        while len(_cache) > SIGNED_URL_CACHE_MAX:
+            _cache.popitem(last=False)
+
+def _refresh_in_background(key, loader):
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+        _stats["refreshes"] += 1
+
+    def refresh():
+        try:
+            _load(key, loader)
+        except SignedUrlError as e:
+            log(f"⚠️ signed URL 갱신 실패 → 기존 값 유지: {key[0]} | {e.message}", level="warning")
+        except Exception as e:
+            log(f"⚠️ signed URL 갱신 오류: {key[0]} | {e}", level="warning")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+# ── 워커 간 공유 (선택) ──
+def _uuid_prefix(uuid: str) -> str:
+    return hashlib.sha256(uuid.encode()).hexdigest()[:16] + "_"
+
+def _shared_path(key) -> str:
+    owner = hashlib.sha256(key[1].encode()).hexdigest()[:16]
+    return os.path.join(SIGNED_URL_CACHE_DIR, f"{_uuid_prefix(key[0])}{owner}.json")
+
+def _read_shared(key):
+    if not SIGNED_URL_CACHE_DIR:
+        return None
+    try:
+        with open(_shared_path(key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_shared(key, bundle):
+    if not SIGNED_URL_CACHE_DIR:
+        return
+    try:
+        os.makedirs(SIGNED_URL_CACHE_DIR, exist_ok=True)
+        path = _shared_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(bundle, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log(f"⚠️ signed URL 공유 캐시 쓰기 실패: {e}", level="warning")
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,162 @@
+# 📁 services/subtitle.py
+import os
+import re
+import textwrap
+from ..config import SUBTITLE_FONT_FILE
+
+LINE_WIDTH = 14  # 공백 포함 기준 14자
+FADE_SECONDS = 0.5
+DEFAULT_FRAME_SIZE = (1080, 1920)
+
+def build_subtitle_cues(text: str, duration: float) -> list:
+    """
+    텍스트를 14자 단위로 줄바꿈하고 오디오 길이에 맞춰 균등 배분
+    :return: [{"start", "end", "text"}, ...]
+    """
+    lines = textwrap.wrap(text.strip(), width=LINE_WIDTH)
+    seconds_per_line = duration / len(lines)
+
+    cues = []
+    for i, line in enumerate(lines):
+        start = round(i * seconds_per_line, 2)
+        end = round(start + seconds_per_line, 2)
+        cues.append({"start": start, "end": end, "text": line})
+    return cues
+
+def line_spacing(layout) -> int:
+    return layout.font_size + 8
+
+def subtitle_base_y(layout, num_lines: int) -> int:
+    """첫 줄 y 좌표: headline 영역 → bottom 영역 → 영상 영역 순으로 세로 중앙 정렬"""
+    overlay_y = layout.video_area.y
+    block_height = line_spacing(layout) * num_lines
+    if layout.headline_area:
+        area = layout.headline_area
+        return max(overlay_y, area.y + (area.h - block_height) // 2)
+    if layout.bottom_area:
+        area = layout.bottom_area
+        return max(overlay_y, area.y + (area.h - block_height) // 2)
+    return overlay_y
+
+# ───────────── drawtext (기존 방식: 줄마다 필터 1개) ─────────────
+
+def build_drawtext_filter(cues: list, layout, font_path: str = SUBTITLE_FONT_FILE) -> str:
+    drawtext_filters = []
+
+    # ✅ dummy drawtext: 최소 하나는 출력되게
+    drawtext_filters.append(
+        f"drawtext=fontfile='{font_path}':text=' ':"
+        "fontcolor=white:fontsize=1:x=10:y=10:enable='between(t,0,0.5)'"
+    )
+
+    y_position = subtitle_base_y(layout, len(cues))
+    for sub in cues:
+        safe_text = sub["text"].replace("'", r"\'").replace(",", r"\,")
+        alpha_expr = (
+            f"if(lt(t,{sub['start']}),0,"
+            f"if(lt(t,{sub['start']}+0.5),(t-{sub['start']})/0.5,"
+            f"if(lt(t,{sub['end']}-0.5),1,(1-(t-{sub['end']}+0.5)/0.5))))"
+        )
+        drawtext_filters.append(
+            f"drawtext=fontfile='{font_path}':"
+            f"text='{safe_text}':"
+            f"fontcolor={layout.font_color}:fontsize={layout.font_size}:"
+            f"x=(w-text_w)/2:y={y_position}:"
+            f"alpha='{alpha_expr}':"
+            f"borderw=4:bordercolor=black:box=1:boxcolor={layout.box_color}:boxborderw=20:"
+            f"enable='between(t,{sub['start']},{sub['end']})'"
+        )
+        y_position += line_spacing(layout)  # 다음 줄로 y 위치 이동
+
+    return ",".join(drawtext_filters)
+
+# ───────────── ASS (자막 트랙 1개 + ass 필터 1개) ─────────────
+
+# drawtext(ffmpeg 색 문법)가 받던 이름 색 중 템플릿에서 쓸 만한 것들
+_NAMED_COLORS = {
+    "white": "FFFFFF", "black": "000000", "red": "FF0000", "green": "008000", "lime": "00FF00",
+    "blue": "0000FF", "yellow": "FFFF00", "cyan": "00FFFF", "magenta": "FF00FF", "orange": "FFA500",
+    "pink": "FFC0CB", "purple": "800080", "navy": "000080", "gray": "808080", "grey": "808080",
+}
+_HEX_COLOR = re.compile(r"[0-9A-Fa-f]{6}([0-9A-Fa-f]{2})?")
+
+def ass_color(color: str, default: str = "#FFFFFF") -> str:
+    """
+    "#RRGGBB" / "#RRGGBBAA" / "0xRRGGBB" / 이름("white", "black@0.5") → ASS "&HAABBGGRR"
+    ASS 알파는 반대 (00 = 불투명, FF = 투명), 해석할 수 없는 값은 default 색
+    """
+    name, _, alpha = (color or default).strip().partition("@")
+    value = _NAMED_COLORS.get(name.lower(), name).lstrip("#")
+    if value.lower().startswith("0x"):
+        value = value[2:]
+    if not _HEX_COLOR.fullmatch(value):
+        return ass_color(default)
+    r, g, b = value[0:2], value[2:4], value[4:6]
+    opacity = int(value[6:8], 16) if len(value) == 8 else 255
+    try:
+        opacity = round(min(max(float(alpha), 0.0), 1.0) * 255) if alpha else opacity
+    except ValueError:
+        pass
+    return f"&H{255 - opacity:02X}{b}{g}{r}".upper()
+
+def _ass_time(seconds: float) -> str:
+    centis = int(round(seconds * 100))
+    hours, centis = divmod(centis, 360000)
+    minutes, centis = divmod(centis, 6000)
+    secs, centis = divmod(centis, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+def _ass_text(text: str) -> str:
+    # 중괄호/역슬래시는 ASS 태그 문법이라 전각 문자로 치환
+    return text.replace("\\", "＼").replace("{", "｛").replace("}", "｝")
+
+def build_ass_document(cues: list, layout, frame_size=DEFAULT_FRAME_SIZE) -> str:
+    """
+    drawtext 방식과 같은 위치/페이드/박스 스타일의 ASS 문서 생성
+    (BorderStyle=3 → OutlineColour로 불투명 박스, Outline 값이 박스 여백)
+    """
+    width, height = frame_size
+    primary = ass_color(layout.font_color, "#FFFFFF")
+    box = ass_color(layout.box_color, "#000000AA")
+
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+        "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+        "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Default,{layout.font_family},{layout.font_size},{primary},{primary},{box},"
+        f"{box},0,0,0,0,100,100,0,0,3,20,0,8,0,0,0,1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+
+    y_position = subtitle_base_y(layout, len(cues))
+    for sub in cues:
+        fade_ms = int(min(FADE_SECONDS, (sub["end"] - sub["start"]) / 2) * 1000)
+        lines.append(
+            f"Dialogue: 0,{_ass_time(sub['start'])},{_ass_time(sub['end'])},Default,,0,0,0,,"
+            f"{{\\an8\\pos({width // 2},{y_position})\\fad({fade_ms},{fade_ms})}}{_ass_text(sub['text'])}"
+        )
+        y_position += line_spacing(layout)
+
+    return "\n".join(lines) + "\n"
+
+def build_ass_filter(cues: list, layout, ass_path: str, frame_size=DEFAULT_FRAME_SIZE,
+                     font_path: str = SUBTITLE_FONT_FILE) -> str:
+    """ASS 파일을 쓰고 이를 합성하는 ass 필터 문자열 반환"""
+    with open(ass_path, "w", encoding="utf-8") as f:
+        f.write(build_ass_document(cues, layout, frame_size))
+    fonts_dir = os.path.dirname(os.path.abspath(font_path))
+    return f"ass=filename='{_filter_path(ass_path)}':fontsdir='{_filter_path(fonts_dir)}'"
+
+def _filter_path(path: str) -> str:
+    # 필터 인자 안에서 특수문자인 \ : ' 이스케이프
+    return path.replace("\\", "/").replace(":", r"\:").replace("'", r"\'")
@@ -0,0 +1,174 @@
+# 📁 services/template_registry.py
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+import requests
+from ..config import TEMPLATE_CACHE_TTL_SECONDS
+from ..utils.supabase_client import get_supabase_client
+from ..utils.logger import log
+
+class TemplateError(Exception):
+    """템플릿 조회/파싱 실패 공통"""
+
+class TemplateNotFoundError(TemplateError):
+    pass
+
+class TemplateParseError(TemplateError):
+    pass
+
+@dataclass(frozen=True)
+class Area:
+    x: int
+    y: int
+    w: int
+    h: int
+
+    @classmethod
+    def from_raw(cls, raw, default=None):
+        """DB 값(JSON 문자열 또는 dict) → Area, 비어 있으면 default"""
+        if isinstance(raw, str):
+            raw = json.loads(raw) if raw.strip() else None
+        if not raw:
+            return default
+        base = default or cls(0, 0, 0, 0)
+        return cls(
+            x=int(raw.get("x", base.x)),
+            y=int(raw.get("y", base.y)),
+            w=int(raw.get("w", base.w)),
+            h=int(raw.get("h", base.h)),
+        )
+
+DEFAULT_VIDEO_AREA = Area(0, 0, 1080, 1080)
+
+@dataclass(frozen=True)
+class TemplateLayout:
+    template_id: str
+    frame_url: str
+    font_family: str
+    font_size: int
+    font_color: str
+    box_color: str
+    video_area: Area
+    headline_area: Optional[Area]
+    bottom_area: Optional[Area]
+    version: str  # updated_at 또는 row 해시 → 템플릿이 바뀌면 달라짐
+    raw: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_row(cls, row: dict):
+        """
+        templates 테이블 row → TemplateLayout
+        :raises TemplateParseError: 영역 JSON이 깨져 있을 때
+        """
+        try:
+            return cls(
+                template_id=str(row["template_id"]),
+                frame_url=row.get("frame_url"),
+                font_family=row.get("font_family") or "Noto Sans KR",
+                font_size=int(row.get("font_size") or 54),
+                font_color=row.get("font_color") or "#FFFFFF",
+                box_color=row.get("box_color") or "#000000AA",
+                video_area=Area.from_raw(row.get("video_area"), DEFAULT_VIDEO_AREA),
+                headline_area=Area.from_raw(row.get("headline_area")),
+                bottom_area=Area.from_raw(row.get("bottom_area")),
+                version=str(row.get("updated_at") or _row_hash(row)),
+                raw=row,
+            )
+        except (ValueError, TypeError, AttributeError, KeyError) as e:
+            raise TemplateParseError(f"Template JSON parsing error: {e}") from e
+
+def _row_hash(row: dict) -> str:
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+# template_id → (TemplateLayout, 로드 시각)
+_cache = {}
+_lock = threading.Lock()
+_refreshing = set()
+
+def _fetch_rows(query: str) -> list:
+    try:
+        res = get_supabase_client().rest("GET", f"templates?{query}")
+    except requests.RequestException as e:
+        raise TemplateError(f"Failed to fetch template from DB: {e}")
+    if res.status_code != 200:
+        raise TemplateError(f"Failed to fetch template from DB: {res.status_code}")
+    return res.json()
+
+def _load_template(template_id: str) -> TemplateLayout:
+    rows = _fetch_rows(f"select=*&template_id=eq.{template_id}")
+    if not rows:
+        raise TemplateNotFoundError("Failed to fetch template from DB")
+    layout = TemplateLayout.from_row(rows[0])
+    with _lock:
+        _cache[layout.template_id] = (layout, time.time())
+    return layout
+
+def get_template(template_id) -> TemplateLayout:
+    """
+    캐시된 템플릿 반환
+    TTL이 지난 항목은 일단 그대로 반환하고 백그라운드에서 갱신 (요청 경로에서 DB 조회 없음)
+    캐시에 없는 template_id만 동기 조회
+    """
+    template_id = str(template_id)
+    with _lock:
+        cached = _cache.get(template_id)
+
+    if not cached:
+        return _load_template(template_id)
+
+    layout, loaded_at = cached
+    if time.time() - loaded_at > TEMPLATE_CACHE_TTL_SECONDS:
+        _refresh_in_background(template_id)
+    return layout
+
+def is_known_template(template_id) -> bool:
+    """캐시에 적재된(=DB에 있는) template_id인지 (DB 조회 없음)"""
+    with _lock:
+        return str(template_id) in _cache
+
+def _refresh_in_background(template_id: str):
+    with _lock:
+        if template_id in _refreshing:
+            return
+        _refreshing.add(template_id)
+
+    def refresh():
+        try:
+            _load_template(template_id)
+        except TemplateError as e:
+            log(f"⚠️ 템플릿 갱신 실패 → 기존 값 유지: {template_id} | {e}", level="warning")
+        except Exception as e:
+            log(f"⚠️ 템플릿 갱신 오류: {template_id} | {e}", level="warning")
+        finally:
+            with _lock:
+                _refreshing.discard(template_id)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+def warm_up_templates() -> int:
+    """templates 전체를 한 번에 읽어 캐시 적재 → 적재된 개수 반환"""
+    loaded = 0
+    now = time.time()
+    for row in _fetch_rows("select=*"):
+        try:
+            layout = TemplateLayout.from_row(row)
+        except TemplateParseError as e:
+            log(f"⚠️ 템플릿 파싱 실패, 건너뜀: {row.get('template_id')} | {e}", level="warning")
+            continue
+        with _lock:
+            _cache[layout.template_id] = (layout, now)
+        loaded += 1
+    log(f"🧩 템플릿 {loaded}개 캐시 적재")
+    return loaded
+
+def invalidate_templates(template_id=None) -> int:
+    """template_id 하나 또는 전체 캐시 무효화 → 제거된 개수 반환"""
+    with _lock:
+        if template_id is None:
+            count = len(_cache)
+            _cache.clear()
+            return count
+        return 1 if _cache.pop(str(template_id), None) else 0
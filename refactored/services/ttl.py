@@ -0,0 +1,185 @@
+# 📁 services/ttl.py
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import requests
+from ..config import (
+    TTL_SECONDS,
+    TTL_CLEANUP_BATCH_SIZE, TTL_CLEANUP_MIN_BATCH, TTL_CLEANUP_SLOW_SECONDS,
+    TTL_CLEANUP_MAX_SECONDS, TTL_CLEANUP_MAX_RETRIES, TTL_CLEANUP_CHECKPOINT
+)
+from ..utils.logger import log
+from ..utils.supabase_client import get_supabase_client
+from .signed_url_cache import invalidate_signed_bundles
+
+# 만료된 signed URL 비우기
+# 1) signed_created_at < cutoff 행을 (signed_created_at, uuid) 순서로 batch_size개 select (uuid만)
+# 2) 그 uuid들만 PATCH (return=minimal, cutoff 조건을 한 번 더 걸어 그 사이 재서명된 행은 건드리지 않음)
+# 3) 마지막 위치를 체크포인트 파일에 기록 → 시간 상한에 걸리거나 실패하면 다음 실행이 이어서 진행
+# 느린 배치는 배치 크기를 줄이고 쉬었다가 진행, 빠르면 다시 키움
+# (재시도는 배치 단위 backoff로 여기서 직접 처리 → 클라이언트 재시도는 끔)
+
+_SIGNED_COLUMNS = {
+    "video_signed_url": None,
+    "audio_signed_url": None,
+    "image_signed_url": None,
+    "signed_created_at": None
+}
+
+class TTLCleanupError(Exception):
+    pass
+
+_lock = threading.Lock()
+_metrics = {"runs": 0, "rows_cleared_total": 0, "last_run": None}
+
+def _load_checkpoint():
+    try:
+        with open(TTL_CLEANUP_CHECKPOINT) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_checkpoint(checkpoint):
+    if checkpoint is None:
+        try:
+            os.remove(TTL_CLEANUP_CHECKPOINT)
+        except OSError:
+            pass
+        return
+    os.makedirs(os.path.dirname(TTL_CLEANUP_CHECKPOINT) or ".", exist_ok=True)
+    tmp_path = f"{TTL_CLEANUP_CHECKPOINT}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, TTL_CLEANUP_CHECKPOINT)
+
+def _select_batch(cutoff_iso, after, limit):
+    params = {
+        "select": "uuid,signed_created_at",
+        "signed_created_at": f"lt.{cutoff_iso}",
+        "order": "signed_created_at.asc,uuid.asc",
+        "limit": str(limit)
+    }
+    if after:
+        ts, uid = after["signed_created_at"], after["uuid"]
+        params["or"] = f'(signed_created_at.gt."{ts}",and(signed_created_at.eq."{ts}",uuid.gt.{uid}))'
+    res = get_supabase_client().rest("GET", "videos", params=params, retries=0)
+    if res.status_code != 200:
+        raise TTLCleanupError(f"select {res.status_code}: {res.text[:200]}")
+    return res.json()
+
+def _clear_batch(cutoff_iso, uuids):
+    params = {"uuid": f"in.({','.join(uuids)})", "signed_created_at": f"lt.{cutoff_iso}"}
+    res = get_supabase_client().rest(
+        "PATCH", "videos", headers={"Prefer": "return=minimal"},
+        params=params, json=_SIGNED_COLUMNS, retries=0
+    )
+    if res.status_code not in (200, 204):
+        raise TTLCleanupError(f"patch {res.status_code}: {res.text[:200]}")
+
+def _with_retries(fn, *args):
+    for attempt in range(TTL_CLEANUP_MAX_RETRIES + 1):
+        try:
+            return fn(*args)
+        except (TTLCleanupError, requests.RequestException) as e:
+            if attempt == TTL_CLEANUP_MAX_RETRIES:
+                raise TTLCleanupError(str(e)) from e
+            delay = min(30.0, 0.5 * 2 ** attempt)
+            log(f"⚠️ TTL 배치 재시도 {attempt + 1}/{TTL_CLEANUP_MAX_RETRIES} ({delay:.1f}s 후): {e}", level="warning")
+            time.sleep(delay)
+
+def run_ttl_cleanup(now=None) -> dict:
+    """
+    만료된 signed URL을 배치 단위로 비우고 이번 실행 지표 반환
+    동시에 두 번 실행되지 않음 (이미 실행 중이면 {"skipped": True})
+    """
+    if not _lock.acquire(blocking=False):
+        return {"skipped": True}
+    try:
+        return _run(now or datetime.utcnow())
+    finally:
+        _lock.release()
+
+def _run(now) -> dict:
+    started = time.monotonic()
+    checkpoint = _load_checkpoint()
+    # 이어서 진행할 때는 같은 cutoff를 유지해야 keyset 위치가 의미 있음
+    if checkpoint:
+        cutoff_iso = checkpoint["cutoff"]
+    else:
+        cutoff_iso = (now - timedelta(seconds=TTL_SECONDS)).isoformat()
+    after = checkpoint.get("after") if checkpoint else None
+    _save_checkpoint({"cutoff": cutoff_iso, "after": after})
+
+    run = {
+        "started_at": now.isoformat(),
+        "cutoff": cutoff_iso,
+        "resumed": checkpoint is not None,
+        "rows_cleared": 0,
+        "batches": 0,
+        "batch_latency_avg": 0.0,
+        "batch_latency_max": 0.0,
+        "completed": False,
+        "error": None
+    }
+    batch_size = TTL_CLEANUP_BATCH_SIZE
+    latency_total = 0.0
+
+    try:
+        while time.monotonic() - started < TTL_CLEANUP_MAX_SECONDS:
+            batch_started = time.monotonic()
+            rows = _with_retries(_select_batch, cutoff_iso, after, batch_size)
+            if not rows:
+                run["completed"] = True
+                break
+
+            _with_retries(_clear_batch, cutoff_iso, [row["uuid"] for row in rows])
+            invalidate_signed_bundles(row["uuid"] for row in rows)  # 비운 URL을 캐시에서 계속 내주지 않게
+            latency = time.monotonic() - batch_started
+
+            after = {"signed_created_at": rows[-1]["signed_created_at"], "uuid": rows[-1]["uuid"]}
+            _save_checkpoint({"cutoff": cutoff_iso, "after": after})
+
+            run["batches"] += 1
+            run["rows_cleared"] += len(rows)
+            latency_total += latency
+            run["batch_latency_max"] = max(run["batch_latency_max"], latency)
+
+            if len(rows) < batch_size:
+                run["completed"] = True
+                break
+            batch_size = _next_batch_size(batch_size, latency)
+    except TTLCleanupError as e:
+        run["error"] = str(e)
+        log(f"❌ TTL cleanup 중단 (체크포인트에서 다음 실행 재개): {e}", level="error")
+
+    if run["completed"]:
+        _save_checkpoint(None)
+    run["batch_latency_avg"] = round(latency_total / run["batches"], 3) if run["batches"] else 0.0
+    run["batch_latency_max"] = round(run["batch_latency_max"], 3)
+    run["duration"] = round(time.monotonic() - started, 3)
+
+    _metrics["runs"] += 1
+    _metrics["rows_cleared_total"] += run["rows_cleared"]
+    _metrics["last_run"] = run
+    log(f"🧹 TTL cleanup: {run['rows_cleared']}행 / {run['batches']}배치 / {run['duration']}s"
+        f"{'' if run['completed'] else ' (미완료, 다음 실행에서 이어서)'}")
+    return run
+
+def _next_batch_size(batch_size, latency):
+    """느리면 절반으로 줄이고 그만큼 쉬기, 빠르면 설정값까지 두 배씩 회복"""
+    if latency > TTL_CLEANUP_SLOW_SECONDS:
+        time.sleep(min(latency, 10.0))
+        return max(TTL_CLEANUP_MIN_BATCH, batch_size // 2)
+    if latency < TTL_CLEANUP_SLOW_SECONDS / 4:
+        return min(TTL_CLEANUP_BATCH_SIZE, batch_size * 2)
+    return batch_size
+
+def get_ttl_metrics() -> dict:
+    return {
+        "runs": _metrics["runs"],
+        "rows_cleared_total": _metrics["rows_cleared_total"],
+        "last_run": dict(_metrics["last_run"]) if _metrics["last_run"] else None,
+        "running": _lock.locked()
+    }
@@ -1,4 +1,5 @@
 import requests
+from ..utils.logger import log
 
 def dispatch_to_video_api(data: dict) -> dict:
     """
@@ -10,5 +11,5 @@ def dispatch_to_video_api(data: dict) -> dict:
         return res.json()  # 영상 URL or uuid 반환 예상
 
     except Exception as e:
-        print("❌ 영상 생성 API 호출 실패:", e)
+        log(f"❌ 영상 생성 API 호출 실패: {e}", level="error")
         return {"error": str(e)}
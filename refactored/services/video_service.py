@@ -1,292 +1,424 @@
 # 📁 services/video_service.py
+import json
 import os
+import time
 import uuid
-import requests
-import textwrap
-import subprocess
+from functools import partial
 from datetime import datetime
-from flask import request
-from pydub import AudioSegment
-from ..utils.audio_utils import get_audio_duration
+from ..utils.media_probe import MediaProbeError, probe_media, probe_image_size
+from .subtitle import (
+    DEFAULT_FRAME_SIZE, build_subtitle_cues, build_drawtext_filter, build_ass_filter
+)
+from .filter_graph import build_filter_complex
+from .ffmpeg_runner import FFmpegError, FFmpegStream, build_render_command, run_ffmpeg, log_ffmpeg_output
+from .encoding_profiles import resolve_encoding_profile
+from ..utils.asset_cache import link_cached_asset
+from ..utils.http_fetcher import FetchError, fetch_concurrently, fetch_to_file
+from ..utils.upload_manager import UploadError, upload_artifacts
+from ..utils.scratch import create_scratch_dir, remove_scratch_dir
+from ..utils.logger import log, job_id_var
+from ..utils.metrics import metric_labels, stage, observe_stage, outcome_for_status, count_request
+from .template_registry import get_template, TemplateError, TemplateParseError
 from ..utils.supabase_utils import (
-    fix_url, upload_to_supabase, get_signed_url, supabase_update_signed_urls
+    fix_url, upload_stream_to_supabase, delete_from_supabase,
+    sign_when_ready, supabase_insert_video, supabase_find_video_by_fingerprint
+)
+from .signed_url_cache import (
+    SignedUrlError, get_signed_bundle, peek_signed_bundle, store_signed_bundle, refresh_at
+)
+from .render_memo import render_fingerprint, memoized, lookup, remember, forget
+from .render_queue import (
+    submit_render_job, get_render_job, count_queued_jobs, track_render_progress, wait_for_job_change
+)
+from .render_scheduler import (
+    RenderCapacityError, capacity_error_response, render_slot, get_render_utilization
+)
+from ..config import (
+    RENDER_ADMISSION_TIMEOUT,
+    MAX_IMAGE_BYTES, MAX_AUDIO_BYTES, SUBTITLE_ENGINE, STREAMING_UPLOAD, BULK_SIGN_MAX_ITEMS,
+    RENDER_MEMO_ENABLED, RENDER_SSE_MAX_SECONDS, RENDER_SSE_HEARTBEAT_SECONDS
 )
-from ..config import SUPABASE_REST, SUPABASE_SERVICE_KEY, UPLOAD_FOLDER, OUTPUT_FOLDER
+
+def parse_render_params(req) -> dict:
+    """
+    요청 form → 렌더 파라미터 dict
+    (백그라운드 워커는 request 컨텍스트 밖에서 돌기 때문에 값만 미리 뽑아둔다)
+    """
+    return {
+        "image_url": fix_url(req.form.get("image_url")),
+        "audio_url": fix_url(req.form.get("mp3_url")),
+        "text": req.form.get("text"),
+        "user_id": req.form.get("user_id"),
+        "template_id": req.form.get("template_id"),  # ✅ 추가됨
+        "subtitle_engine": req.form.get("subtitle_engine"),
+        "encoding_profile": req.form.get("encoding_profile"),
+        "content_type": req.form.get("content_type"),
+    }
 
 def handle_upload_and_generate(req):
-    image_url = fix_url(request.form.get("image_url"))
-    audio_url = fix_url(request.form.get("mp3_url"))
-    text = request.form.get("text")
-    user_id = request.form.get("user_id")
-    template_id = request.form.get("template_id")  # ✅ 추가됨
+    params = parse_render_params(req)
 
-    if not image_url or not audio_url or not text or not template_id:
+    if not params["image_url"] or not params["audio_url"] or not params["text"] or not params["template_id"]:
         return {"error": "image_url, mp3_url, text, template_id are required"}, 400
 
+    # ✅ mode=async → 작업 ID만 바로 반환하고 렌더는 워커 풀에서 진행
+    if req.form.get("mode") == "async":
+        try:
+            # 워커 스레드는 슬롯이 날 때까지 기다림 (거절은 큐 적재 시점에만)
+            job_id = submit_render_job(partial(render_video, slot_timeout=None), params)
+        except RenderCapacityError as e:
+            return capacity_error_response(e.retry_after)
+        return {
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/render_status/{job_id}"
+        }, 202
+
+    body, status_code = render_video(params)
+    if status_code == 503 and "retry_after" in body:
+        return capacity_error_response(body["retry_after"])
+    return body, status_code
+
+def handle_get_render_capacity():
+    utilization = get_render_utilization()
+    utilization["queued_jobs"] = count_queued_jobs()
+    return utilization, 200
+
+def handle_get_render_status(job_id):
+    job = get_render_job(job_id)
+    if not job:
+        return {"error": "Job not found"}, 404
+    return job, 200
+
+def stream_render_events(job_id):
+    """
+    SSE: 작업 상태/진행률이 바뀔 때마다 `data: {...}` 한 건, 끝나면(done/failed) 종료
+    변화가 없으면 RENDER_SSE_HEARTBEAT_SECONDS마다 주석 줄 (프록시 idle 타임아웃 방지)
+    gunicorn 스레드를 잡고 있으므로 RENDER_SSE_MAX_SECONDS 후 끊음 → 클라이언트가 재연결
+    """
+    deadline = time.monotonic() + RENDER_SSE_MAX_SECONDS
+    job = get_render_job(job_id)
+    if not job:
+        yield 'event: error\ndata: {"error": "Job not found"}\n\n'
+        return
+    while job and time.monotonic() < deadline:
+        yield f"data: {json.dumps(_render_event(job), ensure_ascii=False)}\n\n"
+        if job["status"] in ("done", "failed"):
+            return
+        seen = job["version"]
+        job = wait_for_job_change(job_id, seen, timeout=RENDER_SSE_HEARTBEAT_SECONDS)
+        while job and job["version"] == seen and time.monotonic() < deadline:
+            yield ": keep-alive\n\n"
+            job = wait_for_job_change(job_id, seen, timeout=RENDER_SSE_HEARTBEAT_SECONDS)
+
+def _render_event(job: dict) -> dict:
+    event = {"job_id": job["job_id"], "status": job["status"], "progress": job["progress"]}
+    if job["status"] in ("done", "failed"):
+        event["result"] = job["result"]
+    return event
+
+def render_video(params: dict, slot_timeout=RENDER_ADMISSION_TIMEOUT):
+    """
+    다운로드 → ffmpeg 렌더 → 업로드 → signed URL → DB 저장 전체 파이프라인
+    단계별 소요 시간은 /metrics (shorts_stage_seconds, template_id/content_type 라벨)
+    :param slot_timeout: ffmpeg 슬롯 대기 최대 초 (None이면 무한 대기)
+    :return: (응답 dict, HTTP 상태코드)
+    """
+    started = time.perf_counter()
+    with metric_labels(template_id=params["template_id"], content_type=params.get("content_type")):
+        body, status_code = _render_video(params, slot_timeout)
+        observe_stage("total", time.perf_counter() - started, outcome_for_status(status_code))
+        count_request("render", status_code)
+    return body, status_code
+
+def _render_video(params: dict, slot_timeout):
+    image_url = params["image_url"]
+    audio_url = params["audio_url"]
+    text = params["text"]
+    user_id = params.get("user_id")
+    template_id = params["template_id"]
+
+    job_dir = None
+    uid = str(uuid.uuid4())
+    # 큐 작업이 아니면(동기 요청) 영상 uuid를 로그 job_id로
+    job_token = job_id_var.set(job_id_var.get() or uid)
     try:
-        r_img = requests.get(image_url)
-        r_audio = requests.get(audio_url)
-        if r_img.status_code != 200 or r_audio.status_code != 200:
-            return {"error": "Failed to download image or audio"}, 400
-
-        uid = str(uuid.uuid4())
-        image_name = f"{uid}_bg.jpg"
-        audio_name = f"{uid}_audio.mp3"
-        video_name = f"{uid}_video.mp4"
-
-        image_path = os.path.join(UPLOAD_FOLDER, image_name)
-        audio_path = os.path.join(UPLOAD_FOLDER, audio_name)
-        output_path = os.path.join(OUTPUT_FOLDER, video_name)
-
-        with open(image_path, "wb") as f:
-            f.write(r_img.content)
-        with open(audio_path, "wb") as f:
-            f.write(r_audio.content)
-
-        audio = AudioSegment.from_file(audio_path)
-        audio_duration = audio.duration_seconds
-        duration = round(audio_duration, 2)  # 🔥 duration 값을 명시적으로 설정
-
-
-        # ✅ 템플릿 정보 가져오기
-        template_res = requests.get(
-            f"{SUPABASE_REST}/templates?select=*&template_id=eq.{template_id}",
-            headers={
-                "apikey": SUPABASE_SERVICE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}"
-            }
-        )
+        # 🧽 작업 전용 임시 디렉터리 (가능하면 tmpfs) → 끝나면 finally에서 통째로 삭제
+        job_dir = create_scratch_dir(uid)
+        image_path = os.path.join(job_dir, f"{uid}_bg.jpg")
+        audio_path = os.path.join(job_dir, f"{uid}_audio.mp3")
+
+        # ✅ 템플릿 정보 가져오기 (레지스트리 캐시, 파싱된 레이아웃)
+        with stage("template_fetch") as span:
+            try:
+                template = get_template(template_id)
+            except TemplateParseError as e:
+                span.fail()
+                return {"error": str(e)}, 500
+            except TemplateError:
+                span.fail()
+                return {"error": "Failed to fetch template from DB"}, 400
 
-        if template_res.status_code != 200 or not template_res.json():
-            return {"error": "Failed to fetch template from DB"}, 400
-
-        template = template_res.json()[0]
-
-        headline_area_raw = template.get("headline_area")
-        bottom_area_raw = template.get("bottom_area")
-        overlay_area_raw = template.get("video_area")
-        
         try:
-            headline_area = json.loads(headline_area_raw) if isinstance(headline_area_raw, str) else headline_area_raw
-            bottom_area = json.loads(bottom_area_raw) if isinstance(bottom_area_raw, str) else bottom_area_raw
-            overlay_area = json.loads(overlay_area_raw) if isinstance(overlay_area_raw, str) else overlay_area_raw
-        except Exception as e:
-            return {"error": f"Template JSON parsing error: {str(e)}"}, 500
-            
-        font_family = template.get("font_family", "Noto Sans KR")
-        font_size = template.get("font_size", 54)
-        font_color = template.get("font_color", "#FFFFFF")
-        box_color = template.get("box_color", "#000000AA")
-        video_area = template.get("video_area", {})
-        overlay_x = video_area.get("x", 0)
-        overlay_y = video_area.get("y", 0)
-        overlay_width = video_area.get("w", 1080)
-        overlay_height = video_area.get("h", 1080)
-
-        template_image_url = fix_url(template.get("frame_url"))
-
-        # 템플릿 이미지 다운로드
-        r_tpl = requests.get(template_image_url)
-        template_name = f"{uid}_tpl.jpg"
-        template_path = os.path.join(UPLOAD_FOLDER, template_name)
-        with open(template_path, "wb") as f:
-            f.write(r_tpl.content)
-
-        lines = textwrap.wrap(text.strip(), width=14)
-        seconds_per_line = audio_duration / len(lines)
-
-        # drawtext 생성 함수
-        subtitles = []
-        for i, line in enumerate(lines):
-            start = round(i * seconds_per_line, 2)
-            end = round(start + seconds_per_line, 2)
-            subtitles.append({"start": start, "end": end, "text": line})
-        
-        font_path = "NotoSansKR-VF.ttf"
-        drawtext_filters = []
-        
-        # ✅ dummy drawtext: 최소 하나는 출력되게
-        drawtext_filters.append(
-            "drawtext=fontfile='NotoSansKR-VF.ttf':text=' ':"
-            "fontcolor=white:fontsize=1:x=10:y=10:enable='between(t,0,0.5)'"
+            encoding_profile = resolve_encoding_profile(params.get("encoding_profile"), template)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        template_image_url = fix_url(template.frame_url)
+        template_path = os.path.join(job_dir, f"{uid}_tpl.jpg")
+
+        # ✅ 입력 3개 동시 다운로드 (공유 커넥션 풀, 청크 스트리밍)
+        # 배경/템플릿 이미지는 자산 캐시(ETag/Last-Modified 재검증)에서 작업 경로로 하드링크
+        with stage("download") as span:
+            try:
+                fetch_concurrently({
+                    "image": partial(link_cached_asset, image_url, image_path, MAX_IMAGE_BYTES),
+                    "audio": partial(fetch_to_file, audio_url, audio_path, MAX_AUDIO_BYTES),
+                    "template": partial(link_cached_asset, template_image_url, template_path, MAX_IMAGE_BYTES),
+                })
+            except FetchError as e:
+                span.fail()
+                if e.name == "template":
+                    return {"error": f"Failed to download template frame: {e}"}, 400
+                return {"error": "Failed to download image or audio", "detail": str(e)}, 400
+
+        # 🧬 같은 입력(지문)이면 기존 산출물 재사용, 같은 렌더가 진행 중이면 그 결과를 기다림
+        engine = params.get("subtitle_engine") or SUBTITLE_ENGINE
+        render = partial(_render_and_publish, params, template, encoding_profile, engine,
+                         uid, job_dir, slot_timeout)
+        if not RENDER_MEMO_ENABLED:
+            return render()
+        fingerprint = render_fingerprint(template, image_path, audio_path, text, encoding_profile, engine, user_id)
+        return memoized(
+            fingerprint,
+            partial(_reuse_render, fingerprint, user_id),
+            partial(render, fingerprint=fingerprint)
         )
-        
-        line_spacing = font_size + 8
-        num_lines = len(subtitles)
-        
-        # ✅ y 좌표 기준점 계산
-        if headline_area:
-            base_y = max(overlay_y, headline_area["y"] + (headline_area["h"] - line_spacing * num_lines) // 2)
-        elif bottom_area:
-            base_y = max(overlay_y, bottom_area["y"] + (bottom_area["h"] - line_spacing * num_lines) // 2)
-        else:
-            base_y = overlay_y
-        
-        # ✅ drawtext 필터 생성
-        for sub in subtitles:
-            wrapped_lines = textwrap.wrap(sub["text"], width=14)  # 공백 포함 기준 14자
-            for i, line in enumerate(wrapped_lines):
-                y_position = base_y
-                safe_text = line.replace("'", r"\'").replace(",", r"\,")
-                alpha_expr = (
-                    f"if(lt(t,{sub['start']}),0,"
-                    f"if(lt(t,{sub['start']}+0.5),(t-{sub['start']})/0.5,"
-                    f"if(lt(t,{sub['end']}-0.5),1,(1-(t-{sub['end']}+0.5)/0.5))))"
-                )
-        
-                drawtext = (
-                    f"drawtext=fontfile='{font_path}':"
-                    f"text='{safe_text}':"
-                    f"fontcolor={font_color}:fontsize={font_size}:"
-                    f"x=(w-text_w)/2:y={y_position}:"
-                    f"alpha='{alpha_expr}':"
-                    f"borderw=4:bordercolor=black:box=1:boxcolor={box_color}:boxborderw=20:"
-                    f"enable='between(t,{sub['start']},{sub['end']})'"
-                )
-                drawtext_filters.append(drawtext)
-                base_y += line_spacing  # 다음 줄로 y 위치 이동
-        
-        # ✅ 최종 filter_complex 조립
-        filter_complex = (
-            f"[1:v]scale={overlay_width}:{overlay_height}[scaled];"
-            f"[0:v][scaled]overlay={overlay_x}:{overlay_y}," +
-            ",".join(drawtext_filters)
-        )
-
-
 
-        print("🎯 drawtext filter:", drawtext)
-
-        
-        print("🧩 TEMPLATE DEBUG ===========================")
-        print("📌 template_id:", template_id)
-        print("📥 template loaded:", template.get("frame_url"))
-        print("🖼️ overlay area:", template.get("video_area"))
-        print("🖋️ headline_area:", template.get("headline_area"))
-        print("🖋️ bottom_area:", template.get("bottom_area"))
-        print("🔤 font:", template.get("font_family"), template.get("font_size"), template.get("font_color"))
-        print("🧱 box_color:", template.get("box_color"))
-        print("--------------------------------------------")
-        print("📂 image_path:", image_path, "| size:", os.path.getsize(image_path))
-        print("📂 audio_path:", audio_path, "| size:", os.path.getsize(audio_path))
-        print("--------------------------------------------")
-      
-        print("============================================")
-        audio = AudioSegment.from_file(audio_path)
-        audio_duration = audio.duration_seconds
-        duration = round(audio_duration, 2)  # 🔥 duration 값을 명시적으로 설정
-
-
-        command = [
-            "ffmpeg", "-y",
-            "-loop", "1", "-t", str(duration), "-i", template_path,
-            "-loop", "1", "-t", str(duration), "-i", image_path,
-            "-i", audio_path,
-            "-filter_complex", filter_complex,
-            "-map", "2:a",
-            "-shortest",
-            "-c:v", "libx264",
-            "-preset", "ultrafast",
-            output_path
-        ]
-
-
-
-        
-        print("🎬 FFmpeg Command:")
-        print(" ".join(command))
-        print(f"📏 overlay width, height: {overlay_width} {overlay_height}")
-        print(f"📍 overlay position: {overlay_x} {overlay_y}")
-        print("🎞️ Final output path:", output_path)
-
-
-        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate(timeout=180)
-
-        # ✅ stderr 로그 출력
-        print("🧨 FFmpeg STDERR ======================")
-        print(stderr.decode())
-        print("======================================")
-
-        if process.returncode != 0:
-            return {"error": "FFmpeg failed", "ffmpeg_output": stderr.decode()}, 500
-
-        if not os.path.exists(output_path):
-            return {"error": "Output file not found after FFmpeg"}, 500
-
-        video_path = f"uploads/{video_name}"
-        audio_path_db = f"uploads/{audio_name}"
-        image_path_db = f"uploads/{image_name}"
-
-        with open(output_path, "rb") as f:
-            video_uploaded = upload_to_supabase(f.read(), video_name, "video/mp4")
-        with open(audio_path, "rb") as f:
-            audio_uploaded = upload_to_supabase(f.read(), audio_name, "audio/mpeg")
-        with open(image_path, "rb") as f:
-            image_uploaded = upload_to_supabase(f.read(), image_name, "image/jpeg")
+    except Exception as e:
+        return {"error": str(e)}, 500
 
-        if not (video_uploaded and image_uploaded and audio_uploaded):
-            return {"error": "Upload to Supabase failed"}, 500
+    finally:
+        job_id_var.reset(job_token)
+        if job_dir:
+            remove_scratch_dir(job_dir)
+
+def _render_and_publish(params: dict, template, encoding_profile: str, engine: str, uid: str, job_dir: str,
+                        slot_timeout, fingerprint: str = None):
+    """
+    입력이 job_dir에 준비된 뒤의 단계: 자막 → ffmpeg → 업로드 → signed URL → DB 저장
+    :return: (응답 dict, HTTP 상태코드)
+    """
+    text = params["text"]
+    user_id = params.get("user_id")
+    template_id = params["template_id"]
+
+    image_name = f"{uid}_bg.jpg"
+    audio_name = f"{uid}_audio.mp3"
+    video_name = f"{uid}_video.mp4"
+    image_path = os.path.join(job_dir, image_name)
+    audio_path = os.path.join(job_dir, audio_name)
+    output_path = os.path.join(job_dir, video_name)
+    template_path = os.path.join(job_dir, f"{uid}_tpl.jpg")
+
+    # ✅ 오디오 길이: 헤더만 읽어서 확인 (PCM 디코딩 없음, 콘텐츠 해시로 메모이즈)
+    with stage("audio_probe") as span:
+        try:
+            audio_info = probe_media(audio_path)
+        except MediaProbeError as e:
+            span.fail()
+            return {"error": f"Failed to read audio: {e}"}, 400
+    audio_duration = audio_info.duration
+    duration = round(audio_duration, 2)  # 🔥 duration 값을 명시적으로 설정
+
+    # ✅ 자막: 기본은 ASS 트랙 1개 (줄 수와 관계없이 필터 1개), SUBTITLE_ENGINE=drawtext면 기존 방식
+    with stage("filter_build"):
+        cues = build_subtitle_cues(text, audio_duration)
+        if engine == "drawtext":
+            subtitle_filter = build_drawtext_filter(cues, template)
+        else:
+            frame_size = probe_image_size(template_path) or DEFAULT_FRAME_SIZE
+            ass_path = os.path.join(job_dir, f"{uid}_subs.ass")
+            subtitle_filter = build_ass_filter(cues, template, ass_path, frame_size)
 
-        time.sleep(2)
+        # ✅ 최종 filter_complex 조립
+        filter_complex = build_filter_complex(template, subtitle_filter)
+
+    # 🧩 디버그 정보는 필드로만 넘김 (DEBUG가 꺼져 있으면 포맷/출력 비용 없음)
+    log("🧩 render inputs", level="debug", template_id=template_id, template_version=template.version,
+        subtitle_engine=engine, subtitle_lines=len(cues), video_area=template.video_area,
+        duration=duration, encoding_profile=encoding_profile)
+
+    # ✅ ffmpeg 슬롯 확보 (CPU/메모리 여유가 없으면 대기 후 503)
+    # 📡 STREAMING_UPLOAD: ffmpeg stdout → 스토리지로 바로 (인코딩과 업로드가 겹침)
+    # 📊 ffmpeg -progress → 작업 진행률(%, fps, ETA) + 스케줄러 대기 시간 추정
+    streaming = STREAMING_UPLOAD
+    stream_error = None
+    wait_started = time.monotonic()
+    try:
+        with render_slot(slot_timeout) as ffmpeg_threads:
+            observe_stage("slot_wait", time.monotonic() - wait_started)
+            with stage("ffmpeg") as span, track_render_progress(duration) as progress:
+                command = build_render_command(
+                    template_path, image_path, audio_path, filter_complex,
+                    "pipe:1" if streaming else output_path,
+                    duration, threads=ffmpeg_threads, profile=encoding_profile
+                )
 
-        video_signed_url = get_signed_url(video_name)
-        audio_signed_url = get_signed_url(audio_name)
-        image_signed_url = get_signed_url(image_name)
+                log("🎬 ffmpeg start", level="debug", command=command, streaming=streaming)
+
+                if streaming:
+                    returncode, ffmpeg_output, stream_error = _stream_render_to_storage(
+                        command, video_name, progress
+                    )
+                else:
+                    returncode, ffmpeg_output = run_ffmpeg(command, timeout=180, progress=progress)
+                if returncode != 0 or stream_error:
+                    span.fail()
+    except RenderCapacityError as e:
+        observe_stage("slot_wait", time.monotonic() - wait_started, "rejected")
+        return {"error": "Render capacity saturated", "retry_after": e.retry_after}, 503
+
+    if stream_error:
+        # 업로드 쪽에서 끊김 → ffmpeg returncode는 중단 코드라 FFmpeg 실패로 보고하지 않음
+        return {"error": "Upload to Supabase failed", "failed": ["video"], "detail": stream_error}, 500
+
+    # ✅ stderr 꼬리(링 버퍼): 실패했을 때만, 성공은 샘플링
+    log_ffmpeg_output(returncode, ffmpeg_output, template_id=template_id)
+
+    if returncode != 0:
+        return {"error": "FFmpeg failed", "ffmpeg_output": ffmpeg_output}, 500
+
+    if not streaming and not os.path.exists(output_path):
+        return {"error": "Output file not found after FFmpeg"}, 500
+
+    video_path = f"uploads/{video_name}"
+    audio_path_db = f"uploads/{audio_name}"
+    image_path_db = f"uploads/{image_name}"
+
+    # ⏫ 산출물 동시 업로드 (디스크 스트리밍, 큰 영상은 TUS 재개 가능 업로드)
+    artifacts = [
+        {"name": "audio", "path": audio_path, "object_name": audio_name, "content_type": "audio/mpeg"},
+        {"name": "image", "path": image_path, "object_name": image_name, "content_type": "image/jpeg"},
+    ]
+    if not streaming:
+        artifacts.append(
+            {"name": "video", "path": output_path, "object_name": video_name, "content_type": "video/mp4"}
+        )
+    with stage("upload") as span:
+        upload_results = upload_artifacts(artifacts)
+        if streaming:
+            upload_results["video"] = {"ok": True}
+        if not all(r["ok"] for r in upload_results.values()):
+            span.fail()
+
+    if not all(r["ok"] for r in upload_results.values()):
+        failed = [name for name, r in upload_results.items() if not r["ok"]]
+        return {"error": "Upload to Supabase failed", "failed": failed}, 500
+
+    # ✍️ 한 번의 요청으로 3개 서명, 아직 안 보이는 객체만 짧게 재시도
+    with stage("sign") as span:
+        signed = sign_when_ready([video_name, audio_name, image_name])
+        video_signed_url = signed[video_name]
+        audio_signed_url = signed[audio_name]
+        image_signed_url = signed[image_name]
 
         if not all([video_signed_url, audio_signed_url, image_signed_url]):
+            span.fail()
             return {"error": "Failed to generate one or more signed URLs"}, 500
 
-        db_data = {
-            "uuid": uid,
-            "image_path": image_path_db,
-            "audio_path": audio_path_db,
-            "video_path": video_path,
-            "image_signed_url": image_signed_url,
-            "audio_signed_url": audio_signed_url,
-            "video_signed_url": video_signed_url,
-            "signed_created_at": datetime.utcnow().isoformat(),
-            "user_id": user_id,
-            "text": text,
-            "template_id": template_id,
-            "created_at": datetime.utcnow().isoformat()
-        }
-
-        res = requests.post(
-            f"{SUPABASE_REST}/videos",
-            headers={
-                "apikey": SUPABASE_SERVICE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-                "Content-Type": "application/json",
-                "Prefer": "return=representation"
-            },
-            json=db_data
-        )
+    db_data = {
+        "uuid": uid,
+        "image_path": image_path_db,
+        "audio_path": audio_path_db,
+        "video_path": video_path,
+        "image_signed_url": image_signed_url,
+        "audio_signed_url": audio_signed_url,
+        "video_signed_url": video_signed_url,
+        "signed_created_at": datetime.utcnow().isoformat(),
+        "user_id": user_id,
+        "text": text,
+        "template_id": template_id,
+        "created_at": datetime.utcnow().isoformat()
+    }
+    if fingerprint:
+        db_data["render_fingerprint"] = fingerprint
+
+    # render_fingerprint 컬럼이 아직 없는 DB면 그 컬럼만 빼고 저장 (메모는 메모리에만 남음)
+    with stage("db_insert") as span:
+        inserted = supabase_insert_video(db_data, optional_columns=("render_fingerprint",))
+        if not inserted:
+            span.fail()
+    log_id = inserted.get("uuid") if inserted else None
+    if not log_id:
+        log(f"❌ Failed to get log_id: {uid}", level="error")
+    elif fingerprint:
+        remember(fingerprint, log_id)
+
+    return {
+        "video_url": video_signed_url,
+        "image_url": image_signed_url,
+        "audio_url": audio_signed_url,
+        "log_id": log_id
+    }, 200
+
+def _reuse_render(fingerprint: str, user_id):
+    """
+    같은 지문으로 이미 만들어진 영상이 있으면 새 signed URL 묶음으로 응답, 없으면 None
+    (메모리 인덱스 → DB render_fingerprint 컬럼 순으로 조회)
+    """
+    uid = lookup(fingerprint, supabase_find_video_by_fingerprint)
+    if not uid:
+        return None
 
-        try:
-            log_id = res.json()[0]["uuid"]
-        except Exception as e:
-            print("❌ Failed to get log_id:", res.text)
-            log_id = None
+    try:
+        bundle = get_signed_bundle(uid, user_id, _load_signed_bundle)
+    except SignedUrlError as e:
+        if e.status == 404:
+            # 원본 행이 TTL 정리 등으로 사라짐 → 색인에서 빼고 새로 렌더
+            forget(fingerprint)
+        return None
+
+    log(f"♻️ render memo hit: {fingerprint[:12]} → {uid}")
+    return {
+        "video_url": bundle["video_url"],
+        "image_url": bundle["image_url"],
+        "audio_url": bundle["audio_url"],
+        "log_id": uid,
+        "reused": True
+    }, 200
+
+def _stream_render_to_storage(command: list, video_name: str, progress=None):
+    """
+    ffmpeg 출력 파이프를 chunked 업로드로 바로 전송
+    :return: (ffmpeg returncode, ffmpeg stderr, 업로드 오류 메시지 또는 None)
+    """
+    stream = FFmpegStream(command, timeout=180, progress=progress)
+    try:
+        upload_stream_to_supabase(stream, video_name, "video/mp4")
+    except FFmpegError as e:
+        # 중간까지 올라간 불완전한 객체 정리
+        delete_from_supabase(video_name)
+        return e.returncode, e.output, None
+    except UploadError as e:
+        # 스토리지가 2xx가 아닌 응답 (스트림을 다 읽기 전일 수 있음) → HTTP 상태 그대로 보고
+        return _abort_stream(stream, video_name, str(e))
+    except Exception as e:
+        # 연결 끊김 등 요청 자체 실패
+        return _abort_stream(stream, video_name, f"Streaming upload error: {e}")
 
-        return {
-            "video_url": video_signed_url,
-            "image_url": image_signed_url,
-            "audio_url": audio_signed_url,
-            "log_id": log_id
-        }, 200
+    log(f"📡 streamed {stream.bytes_sent} bytes → {video_name}", level="debug")
+    return stream.returncode, stream.output, None
 
-    except Exception as e:
-        return {"error": str(e)}, 500
+def _abort_stream(stream, video_name: str, error: str):
+    """업로드 쪽 실패 → ffmpeg 중단, 불완전한 객체 정리, 업로드 실패로 처리"""
+    stream.close()
+    delete_from_supabase(video_name)
+    log(f"❌ 스트리밍 업로드 실패: {error}", level="error")
+    return stream.returncode, stream.output, error
 
 # 📁 services/video_service.py (계속)
 def handle_get_signed_urls(request):
-    from ..utils.supabase_utils import (
-        supabase_get_video_by_uuid,
-        supabase_update_signed_urls,
-        get_signed_url
-    )
-
     data = request.json
     uuid = data.get("uuid")
     user_id = data.get("user_id")
@@ -294,64 +426,180 @@ def handle_get_signed_urls(request):
     if not uuid:
         return {"error": "UUID is required"}, 400
 
+    # 🔏 (uuid, user_id) 번들 캐시 → 대부분 PostgREST 조회 없이 응답
+    try:
+        return get_signed_bundle(uuid, user_id, _load_signed_bundle), 200
+    except SignedUrlError as e:
+        return {"error": e.message}, e.status
+
+def _load_signed_bundle(uuid, user_id) -> dict:
+    """
+    DB 행 조회 → 갱신 시점이 지났으면 재서명 후 PATCH
+    :raises SignedUrlError: 행 없음(404) / 소유자 불일치(403) / 서명·저장 실패(500)
+    """
+    from ..utils.supabase_utils import (
+        supabase_get_video_by_uuid,
+        supabase_update_signed_urls,
+        get_signed_urls
+    )
+
     video_row = supabase_get_video_by_uuid(uuid)
     if not video_row:
-        return {"error": "Video not found"}, 404
+        raise SignedUrlError("Video not found", 404)
 
     if user_id != video_row.get("user_id"):
-        return {"error": "Unauthorized access"}, 403
+        raise SignedUrlError("Unauthorized access", 403)
 
     video_path = video_row.get("video_path")
     image_path = video_row.get("image_path")
     audio_path = video_row.get("audio_path")
-    signed_created_at = video_row.get("signed_created_at")
-
-    video_old = video_row.get("video_signed_url")
-    image_old = video_row.get("image_signed_url")
-    audio_old = video_row.get("audio_signed_url")
-
-    needs_refresh = False
-    if not signed_created_at:
-        needs_refresh = True
-    else:
-        try:
-            last_time = datetime.fromisoformat(signed_created_at)
-            if datetime.utcnow() - last_time > timedelta(hours=1):
-                needs_refresh = True
-        except:
-            needs_refresh = True
-
-    if needs_refresh:
-        signed_time = datetime.utcnow().isoformat()
-        video_signed = get_signed_url(video_path)
-        image_signed = get_signed_url(image_path)
-        audio_signed = get_signed_url(audio_path)
+    poster_path = video_row.get("poster_path")  # 다중 렌더 행만 (서명 URL은 저장하지 않고 번들 만들 때마다 서명)
+
+    if not _needs_resign(video_row):
+        bundle = _bundle_from_row(video_row)
+        if poster_path:
+            bundle["poster_url"] = get_signed_urls([poster_path])[poster_path]
+        return bundle
+
+    signed_time = datetime.utcnow().isoformat()
+    signed = get_signed_urls([p for p in (video_path, image_path, audio_path, poster_path) if p])
+    video_signed = signed[video_path]
+    image_signed = signed[image_path]
+    audio_signed = signed[audio_path]
+
+    if not all([video_signed, image_signed, audio_signed]):
+        raise SignedUrlError("Failed to generate signed URLs", 500)
+
+    patch_res = supabase_update_signed_urls(uuid, {
+        "signed_created_at": signed_time,
+        "video_signed_url": video_signed,
+        "image_signed_url": image_signed,
+        "audio_signed_url": audio_signed
+    })
+
+    if not patch_res:
+        raise SignedUrlError("Failed to update signed URLs in DB", 500)
+
+    bundle = {
+        "video_url": video_signed,
+        "image_url": image_signed,
+        "audio_url": audio_signed,
+        "signed_created_at": signed_time
+    }
+    if poster_path:
+        bundle["poster_url"] = signed.get(poster_path)
+    return bundle
+
+def _needs_resign(row) -> bool:
+    # 실제 만료 직전 URL을 내주지 않도록 캐시와 같은 갱신 시점 사용
+    signed_created_at = row.get("signed_created_at")
+    return not signed_created_at or time.time() >= refresh_at(signed_created_at)
+
+def _bundle_from_row(row) -> dict:
+    return {
+        "video_url": row.get("video_signed_url"),
+        "image_url": row.get("image_signed_url"),
+        "audio_url": row.get("audio_signed_url"),
+        "signed_created_at": row.get("signed_created_at")
+    }
+
+def handle_get_signed_urls_bulk(request):
+    """
+    여러 uuid의 signed URL 번들을 한 번에 반환 (갤러리/피드)
+    캐시 → 나머지는 uuid=in.(...) 1회 조회 → 만료된 것만 일괄 서명 → upsert 1회
+    응답 items는 요청 순서 그대로, 항목별 실패는 {"uuid", "error", "status"}
+    """
+    from ..utils.supabase_utils import (
+        supabase_get_videos_by_uuids,
+        supabase_upsert_signed_urls,
+        get_signed_urls
+    )
 
-        if not all([video_signed, image_signed, audio_signed]):
-            return {"error": "Failed to generate signed URLs"}, 500
+    data = request.json or {}
+    user_id = data.get("user_id")
+    requested = data.get("uuids")
 
-        patch_res = supabase_update_signed_urls(uuid, {
-            "signed_created_at": signed_time,
-            "video_signed_url": video_signed,
-            "image_signed_url": image_signed,
-            "audio_signed_url": audio_signed
-        })
+    if not isinstance(requested, list) or not requested:
+        return {"error": "uuids must be a non-empty list"}, 400
+    if len(requested) > BULK_SIGN_MAX_ITEMS:
+        return {"error": f"At most {BULK_SIGN_MAX_ITEMS} uuids per request"}, 400
 
-        if not patch_res:
-            return {"error": "Failed to update signed URLs in DB"}, 500
+    uuids = []
+    for value in requested:
+        try:
+            uuids.append(str(uuid.UUID(str(value))))
+        except ValueError:
+            return {"error": f"Invalid uuid: {value}"}, 400
+
+    bundles = {}
+    for video_id in uuids:
+        cached = peek_signed_bundle(video_id, user_id)
+        if cached:
+            bundles[video_id] = cached
+
+    missing = [video_id for video_id in dict.fromkeys(uuids) if video_id not in bundles]
+    rows = supabase_get_videos_by_uuids(missing) if missing else []
+    if rows is None:
+        return {"error": "Failed to fetch videos"}, 502
+
+    errors = {}
+    to_sign = []
+    fresh = []
+    for row in rows:
+        video_id = row.get("uuid")
+        if user_id != row.get("user_id"):
+            errors[video_id] = ("Unauthorized access", 403)
+        elif _needs_resign(row):
+            to_sign.append(row)
+        else:
+            fresh.append(row)
 
-        return {
-            "video_url": video_signed,
-            "image_url": image_signed,
-            "audio_url": audio_signed,
-            "signed_created_at": signed_time
-        }, 200
+    # 만료된 행의 영상/이미지/오디오 + 포스터(서명 URL을 저장하지 않음)는 한 번에 서명
+    posters = {row["uuid"]: row["poster_path"] for row in to_sign + fresh if row.get("poster_path")}
+    paths = [row.get(f"{kind}_path") for row in to_sign for kind in ("video", "image", "audio")]
+    signed = get_signed_urls([p for p in paths + list(posters.values()) if p]) if to_sign or posters else {}
 
-    else:
-        return {
-            "video_url": video_old,
-            "image_url": image_old,
-            "audio_url": audio_old,
-            "signed_created_at": signed_created_at
-        }, 200
+    for row in fresh:
+        bundles[row["uuid"]] = _bundle_from_row(row)
 
+    updates = []
+    if to_sign:
+        signed_time = datetime.utcnow().isoformat()
+        for row in to_sign:
+            urls = {kind: signed.get(row.get(f"{kind}_path")) for kind in ("video", "image", "audio")}
+            if not all(urls.values()):
+                errors[row["uuid"]] = ("Failed to generate signed URLs", 500)
+                continue
+            updates.append({
+                "uuid": row["uuid"],
+                "user_id": row["user_id"],
+                "video_path": row.get("video_path"),
+                "image_path": row.get("image_path"),
+                "audio_path": row.get("audio_path"),
+                "signed_created_at": signed_time,
+                "video_signed_url": urls["video"],
+                "image_signed_url": urls["image"],
+                "audio_signed_url": urls["audio"]
+            })
+
+    if updates and not supabase_upsert_signed_urls(updates):
+        for row in updates:
+            errors[row["uuid"]] = ("Failed to update signed URLs in DB", 500)
+        updates = []
+
+    for row in updates:
+        bundles[row["uuid"]] = _bundle_from_row(row)
+
+    for row in fresh + updates:
+        if row["uuid"] in posters:
+            bundles[row["uuid"]]["poster_url"] = signed.get(posters[row["uuid"]])
+        store_signed_bundle(row["uuid"], user_id, bundles[row["uuid"]])
+
+    items = []
+    for video_id in uuids:
+        if video_id in bundles:
+            items.append({"uuid": video_id, **bundles[video_id]})
+        else:
+            message, status = errors.get(video_id, ("Video not found", 404))
+            items.append({"uuid": video_id, "error": message, "status": status})
+    return {"items": items}, 200
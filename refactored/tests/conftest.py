@@ -0,0 +1,30 @@
+import os
+
+# config.py는 SUPABASE_SERVICE_ROLE이 없으면 import 시점에 실패함 → 오프라인 테스트용 더미 값
+os.environ.setdefault("SUPABASE_SERVICE_ROLE", "test-service-role")
+
+import pytest
+
+class _VerbSession:
+    """SupabaseClient 세션 자리에 끼우는 어댑터: request(method, url, ...) → fake.<method>(url, ...)"""
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def request(self, method, url, **kwargs):
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        return getattr(self.fake, method.lower())(url, **kwargs)
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """fake 객체(get/post/patch/... 메서드)를 공용 Supabase 클라이언트 뒤에 설치"""
+    from refactored.utils import supabase_client
+
+    def install(fake, max_retries=0):
+        client = supabase_client.SupabaseClient(
+            rest_url="https://db.test/rest/v1", storage_url="https://db.test/storage/v1",
+            session=_VerbSession(fake), max_retries=max_retries
+        )
+        monkeypatch.setattr(supabase_client, "_client", client)
+        return client
+    return install
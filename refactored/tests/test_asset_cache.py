@@ -0,0 +1,86 @@
+import os
+from refactored.utils import asset_cache
+
+class FakeSession:
+    def __init__(self, get):
+        self.get = get
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def close(self):
+        pass
+
+def test_revalidates_with_etag_and_links(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_REVALIDATE_SECONDS", 0)
+    calls = []
+
+    def fake_get(url, headers, stream, timeout):
+        calls.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, b"frame-bytes", {"ETag": '"v1"'})
+
+    monkeypatch.setattr(asset_cache, "get_http_session", lambda: FakeSession(fake_get))
+
+    first = asset_cache.link_cached_asset("https://cdn/tpl.jpg", str(tmp_path / "a.jpg"))
+    second = asset_cache.link_cached_asset("https://cdn/tpl.jpg", str(tmp_path / "b.jpg"))
+
+    assert calls[1] == {"If-None-Match": '"v1"'}
+    assert open(first, "rb").read() == open(second, "rb").read() == b"frame-bytes"
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_MAX_BYTES", 10)
+    fake_get = lambda url, headers, stream, timeout: FakeResponse(200, url.encode()[-6:])
+    monkeypatch.setattr(asset_cache, "get_http_session", lambda: FakeSession(fake_get))
+
+    old_path = asset_cache.get_cached_asset("https://cdn/old.jpg")
+    os.utime(asset_cache._meta_path("https://cdn/old.jpg"), (0, 0))
+    new_path = asset_cache.get_cached_asset("https://cdn/new.jpg")
+
+    assert not os.path.exists(old_path)
+    assert os.path.exists(new_path)
+
+def test_oversized_asset_survives_its_own_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_MAX_BYTES", 4)
+    fake_get = lambda url, headers, stream, timeout: FakeResponse(200, b"larger-than-cache")
+    monkeypatch.setattr(asset_cache, "get_http_session", lambda: FakeSession(fake_get))
+
+    path = asset_cache.link_cached_asset("https://cdn/big.jpg", str(tmp_path / "big.jpg"))
+
+    assert open(path, "rb").read() == b"larger-than-cache"
+
+def test_blob_evicted_before_link_is_fetched_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_cache, "ASSET_CACHE_DIR", str(tmp_path / "cache"))
+    calls = []
+
+    def fake_get(url, headers, stream, timeout):
+        calls.append(url)
+        return FakeResponse(200, b"frame-bytes")
+
+    monkeypatch.setattr(asset_cache, "get_http_session", lambda: FakeSession(fake_get))
+    real_link = os.link
+
+    def evicted_first(src, dest):
+        if len(calls) == 1:
+            os.remove(src)  # 다른 요청의 LRU 정리 흉내
+        real_link(src, dest)
+
+    monkeypatch.setattr(asset_cache.os, "link", evicted_first)
+    path = asset_cache.link_cached_asset("https://cdn/tpl.jpg", str(tmp_path / "a.jpg"))
+
+    assert len(calls) == 2
+    assert open(path, "rb").read() == b"frame-bytes"
@@ -0,0 +1,60 @@
+import asyncio
+import time
+import httpx
+import pytest
+from refactored.utils import async_io, supabase_client
+from refactored.utils.async_io import gather, run_async
+from refactored.utils.openmeteo_weather import get_openmeteo_forecast_async
+
+@pytest.fixture
+def transport(monkeypatch):
+    """공용 AsyncClient를 MockTransport로 교체 (핸들러는 테스트가 지정)"""
+    handlers = {}
+
+    async def handle(request):
+        await asyncio.sleep(handlers.get("delay", 0))
+        return handlers["fn"](request)
+
+    def install(fn, delay=0):
+        handlers.update(fn=fn, delay=delay)
+        monkeypatch.setattr(async_io, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+    return install
+
+def test_forecast_async_picks_closest_hour(transport):
+    transport(lambda request: httpx.Response(200, json={"hourly": {
+        "time": ["2025-04-16T14:00", "2025-04-16T15:00"],
+        "temperature_2m": [17.0, 18.5], "humidity_2m": [60, 62], "windspeed_10m": [3.0, 3.8]
+    }}))
+    res = run_async(get_openmeteo_forecast_async(37.57, 126.98, "2025-04-16T15:10"))
+    assert res == {"temperature": 18.5, "humidity": 62, "windspeed": 3.8, "time": "2025-04-16T15:00"}
+
+def test_calls_gathered_in_one_run_overlap(transport):
+    transport(lambda request: httpx.Response(500), delay=0.2)
+    started = time.monotonic()
+    results = run_async(gather(*[
+        get_openmeteo_forecast_async(37.0, 127.0, "2025-04-16T15:00") for _ in range(5)
+    ]))
+    assert all("error" in r for r in results)
+    assert time.monotonic() - started < 0.6  # 순차라면 1초
+
+def test_supabase_async_retries_then_reads_row(transport, monkeypatch):
+    monkeypatch.setattr(supabase_client, "_client", supabase_client.SupabaseClient(
+        rest_url="https://db.test/rest/v1", max_retries=2
+    ))
+    monkeypatch.setattr(supabase_client.random, "uniform", lambda a, b: 0)
+    responses = [httpx.Response(503), httpx.Response(200, json=[{"uuid": "u1"}])]
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return responses.pop(0)
+
+    transport(handler)
+    res = run_async(supabase_client.get_supabase_client().arest("GET", "videos", params={"uuid": "eq.u1"}))
+    assert res.json() == [{"uuid": "u1"}]
+    assert len(seen) == 2 and seen[0].headers["apikey"]
+    assert seen[0].url.params["uuid"] == "eq.u1"
+
+def test_run_async_timeout_raises():
+    with pytest.raises(TimeoutError):
+        run_async(asyncio.sleep(1), timeout=0.05)
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+import pytest
+from refactored.services import batch_render
+from refactored.services.render_scheduler import RenderCapacityError
+from refactored.services.template_registry import TemplateNotFoundError
+
+@pytest.fixture
+def assets(monkeypatch):
+    calls = {"templates": [], "assets": []}
+
+    def fake_template(template_id):
+        calls["templates"].append(template_id)
+        if template_id == "missing":
+            raise TemplateNotFoundError("no row")
+        return SimpleNamespace(frame_url=f"https://cdn/{template_id}.jpg")
+
+    def fake_asset(url, max_bytes=None):
+        calls["assets"].append(url)
+        return "/cache/blob"
+
+    monkeypatch.setattr(batch_render, "get_template", fake_template)
+    monkeypatch.setattr(batch_render, "get_cached_asset", fake_asset)
+    return calls
+
+def item(text, template_id="t1", image="https://img/bg.jpg"):
+    return {"image_url": image, "mp3_url": "https://a/x.mp3", "text": text, "template_id": template_id}
+
+def fake_render(params):
+    if params["text"] == "boom":
+        return {"error": "FFmpeg failed"}, 500
+    return {"video_url": f"v:{params['text']}", "user": params["user_id"]}, 200
+
+def run(payload):
+    specs, invalid = batch_render.parse_batch(payload)
+    return list(batch_render.stream_batch(specs, invalid, fake_render, wait_seconds=0.05))
+
+def test_batch_reports_each_item_and_summary(assets):
+    lines = run({"user_id": "u1", "items": [
+        item("a"), item("b", "t2"), item("boom"), item("c", "missing"), {"text": "no urls"}, item("d", "t2")
+    ]})
+
+    summary = lines[-1]["summary"]
+    assert summary["total"] == 6 and summary["done"] == 3 and summary["failed"] == 3
+
+    by_index = {line["index"]: line for line in lines[:-1]}
+    assert by_index[0]["result"] == {"video_url": "v:a", "user": "u1"}
+    assert by_index[2]["error"] == "FFmpeg failed"
+    assert by_index[3]["error"] == "Failed to fetch template from DB"
+    assert by_index[4]["error"].startswith("missing:")
+
+def test_shared_assets_are_fetched_once_per_batch(assets):
+    run({"user_id": "u1", "items": [item(str(i), f"t{i % 2}") for i in range(6)]})
+
+    assert sorted(assets["templates"]) == ["t0", "t1"]
+    assert sorted(assets["assets"]) == ["https://cdn/t0.jpg", "https://cdn/t1.jpg", "https://img/bg.jpg"]
+
+def test_full_queue_applies_backpressure_instead_of_failing(assets, monkeypatch):
+    real_submit = batch_render.submit_render_job
+    refusals = iter([True, False, True, False, False])
+
+    def flaky_submit(render_fn, params):
+        if next(refusals, False):
+            raise RenderCapacityError(1)
+        return real_submit(render_fn, params)
+
+    monkeypatch.setattr(batch_render, "submit_render_job", flaky_submit)
+    lines = run({"user_id": "u1", "items": [item("a"), item("b"), item("c")]})
+    assert lines[-1]["summary"]["done"] == 3
+
+def test_top_level_validation():
+    assert batch_render.handle_generate_batch({"items": []})[1] == 400
+    assert batch_render.handle_generate_batch({"items": [item("x")] * 51})[1] == 400
+    assert batch_render.handle_generate_batch([item("x")])[1] == 400
+    assert batch_render.handle_generate_batch("items")[1] == 400
@@ -0,0 +1,22 @@
+import pytest
+from refactored.services.encoding_profiles import encoding_args, resolve_encoding_profile
+from refactored.services.template_registry import TemplateLayout
+
+TEMPLATE = TemplateLayout.from_row({"template_id": "t1", "encoding_profile": "small-file"})
+
+def test_request_overrides_template():
+    assert resolve_encoding_profile("fast-draft", TEMPLATE) == "fast-draft"
+    assert resolve_encoding_profile(None, TEMPLATE) == "small-file"
+    assert resolve_encoding_profile(None, None) == "balanced"
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        resolve_encoding_profile("4k-hdr")
+
+def test_still_image_args():
+    args = encoding_args("fast-draft", threads=2)
+
+    assert args[args.index("-tune") + 1] == "stillimage"
+    assert args[args.index("-g") + 1] == "120"
+    assert args[args.index("-movflags") + 1] == "+faststart"
+    assert args[args.index("-threads") + 1] == "2"
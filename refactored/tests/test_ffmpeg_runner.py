@@ -0,0 +1,92 @@
+import sys
+import pytest
+from refactored.services.ffmpeg_runner import (
+    FFmpegError, FFmpegProgress, FFmpegStream, build_render_command, run_ffmpeg
+)
+
+def _fake_ffmpeg(script):
+    return [sys.executable, "-c", script]
+
+def test_stream_yields_stdout_in_chunks():
+    stream = FFmpegStream(_fake_ffmpeg(
+        "import sys; sys.stderr.write('frame=1'); sys.stdout.buffer.write(b'x' * 600000)"
+    ))
+
+    total = sum(len(chunk) for chunk in stream)
+
+    assert total == stream.bytes_sent == 600000
+    assert stream.returncode == 0
+    assert "frame=1" in stream.output
+
+def test_stream_raises_on_ffmpeg_failure():
+    stream = FFmpegStream(_fake_ffmpeg(
+        "import sys; sys.stdout.buffer.write(b'partial'); sys.stderr.write('boom'); sys.exit(3)"
+    ))
+
+    with pytest.raises(FFmpegError) as exc:
+        list(stream)
+
+    assert exc.value.returncode == 3
+    assert "boom" in exc.value.output
+
+def test_piped_command_uses_fragmented_mp4():
+    command = build_render_command("tpl.jpg", "bg.jpg", "a.mp3", "null", "pipe:1", 3.0)
+
+    assert command[-3:] == ["-f", "mp4", "pipe:1"]
+    assert "frag_keyframe+empty_moov+default_base_moof" in command
+    assert "+faststart" not in command
+
+PROGRESS_SCRIPT = (
+    "import sys\n"
+    "sys.stderr.write('Input #0, mp3\\n')\n"
+    "for us, end in ((1000000, 'continue'), (4000000, 'end')):\n"
+    "    sys.stderr.write(f'frame=15\\nfps=30.0\\nout_time_us={us}\\nspeed=2.0x\\nprogress={end}\\n')\n"
+)
+
+def test_run_ffmpeg_reports_progress_and_strips_it_from_output():
+    updates = []
+    progress = FFmpegProgress(duration=4.0, on_update=updates.append)
+
+    returncode, output = run_ffmpeg(_fake_ffmpeg(PROGRESS_SCRIPT), progress=progress)
+
+    assert returncode == 0
+    assert output == "Input #0, mp3\n"
+    assert updates[0]["percent"] == 25.0
+    assert updates[0]["eta_seconds"] == 1.5  # 남은 3초 / 2배속
+    assert updates[0]["fps"] == 30.0
+    assert updates[-1]["done"] and updates[-1]["percent"] == 100.0
+
+def test_stats_line_is_not_progress():
+    progress = FFmpegProgress(duration=4.0)
+    assert not progress.feed("frame=   10 fps=0.0 q=28.0 size=0kB time=00:00:00.50 speed=1x")
+
+def test_run_ffmpeg_timeout():
+    returncode, output = run_ffmpeg(_fake_ffmpeg("import time; time.sleep(5)"), timeout=0.2)
+
+    assert returncode == -1
+    assert "timed out" in output
+
+def test_streaming_upload_rejected_early_is_an_upload_error(fake_supabase):
+    from types import SimpleNamespace
+    from refactored.services import video_service
+
+    class Storage:
+        deleted = []
+
+        def post(self, url, data, **kwargs):
+            next(data)  # 첫 청크만 읽고 거절
+            return SimpleNamespace(status_code=413)
+
+        def delete(self, url, **kwargs):
+            self.deleted.append(url)
+            return SimpleNamespace(status_code=200)
+
+    storage = Storage()
+    fake_supabase(storage)
+    command = _fake_ffmpeg("import sys\nwhile True: sys.stdout.buffer.write(b'x' * 65536)")
+
+    returncode, _, error = video_service._stream_render_to_storage(command, "v_video.mp4")
+
+    assert "HTTP 413" in error
+    assert returncode != 0  # ffmpeg는 중단됨 (FFmpeg 실패로 보고하지 않음)
+    assert storage.deleted
@@ -0,0 +1,38 @@
+import pytest
+from refactored.utils.http_fetcher import FetchError, fetch_concurrently, iter_response_chunks
+
+class FakeResponse:
+    def __init__(self, chunks, headers=None):
+        self.chunks = chunks
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+def test_size_limit_from_content_length():
+    res = FakeResponse([b"x" * 10], {"Content-Length": "10"})
+    with pytest.raises(FetchError):
+        list(iter_response_chunks(res, max_bytes=5))
+
+def test_size_limit_while_streaming():
+    res = FakeResponse([b"x" * 4, b"x" * 4])
+    with pytest.raises(FetchError):
+        list(iter_response_chunks(res, max_bytes=6))
+
+def test_fetch_concurrently_reports_timings(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"abc")
+
+    results = fetch_concurrently({"image": lambda: str(path)})
+
+    assert results["image"]["bytes"] == 3
+    assert results["image"]["seconds"] >= 0
+
+def test_fetch_concurrently_names_failed_asset(tmp_path):
+    def broken():
+        raise FetchError("HTTP 404")
+
+    with pytest.raises(FetchError) as exc:
+        fetch_concurrently({"audio": broken, "image": lambda: str(tmp_path)})
+
+    assert exc.value.name == "audio"
@@ -0,0 +1,87 @@
+import os
+import pytest
+from refactored.utils import janitor, scratch
+
+NOW = 1_800_000_000
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    root, uploads, outputs = tmp_path / "scratch", tmp_path / "uploads", tmp_path / "outputs"
+    for d in (root, uploads, outputs):
+        d.mkdir()
+    monkeypatch.setattr(scratch, "_root", str(root))
+    monkeypatch.setattr(janitor, "UPLOAD_FOLDER", str(uploads))
+    monkeypatch.setattr(janitor, "OUTPUT_FOLDER", str(outputs))
+    monkeypatch.setattr(janitor, "JANITOR_MAX_AGE_SECONDS", 3600)
+    monkeypatch.setattr(janitor, "JANITOR_MIN_AGE_SECONDS", 300)
+    return root, uploads, outputs
+
+def make_file(folder, name, age, size=100):
+    path = folder / name
+    path.write_bytes(b"x" * size)
+    os.utime(path, (NOW - age, NOW - age))
+    return path
+
+def test_scratch_dir_is_removed_with_its_files(dirs):
+    job_dir = scratch.create_scratch_dir("abc")
+    with open(os.path.join(job_dir, "abc_video.mp4"), "wb") as f:
+        f.write(b"x" * 10)
+    assert scratch.is_active(job_dir)
+
+    assert scratch.remove_scratch_dir(job_dir) == 10
+    assert not os.path.exists(job_dir) and not scratch.is_active(job_dir)
+
+def test_old_files_and_orphaned_jobs_are_swept_by_age(dirs, monkeypatch):
+    root, uploads, outputs = dirs
+    monkeypatch.setattr(janitor, "_usage", lambda path: 0.1)
+    old = make_file(uploads, "old_bg.jpg", age=7200, size=300)
+    recent = make_file(outputs, "recent_video.mp4", age=60)
+    orphan = root / "job-dead"
+    orphan.mkdir()
+    make_file(orphan, "dead_audio.mp3", age=7200, size=200)
+    os.utime(orphan, (NOW - 7200, NOW - 7200))
+
+    run = janitor.run_janitor(now=NOW)
+
+    assert not old.exists() and not orphan.exists() and recent.exists()
+    assert run["by_age"] == 2 and run["bytes_reclaimed"] == 500
+
+def test_high_water_mark_removes_oldest_until_low_water(dirs, monkeypatch):
+    root, uploads, outputs = dirs
+    files = [make_file(outputs, f"{i}_video.mp4", age=3000 - i * 100) for i in range(5)]
+    fresh = make_file(outputs, "fresh_video.mp4", age=10)
+    usage = {"value": 0.9}
+
+    def fake_usage(path):
+        return usage["value"]
+
+    real_remove = janitor._remove
+
+    def remove_and_free(path, is_dir):
+        usage["value"] -= 0.08
+        return real_remove(path, is_dir)
+
+    monkeypatch.setattr(janitor, "_usage", fake_usage)
+    monkeypatch.setattr(janitor, "_remove", remove_and_free)
+
+    run = janitor.run_janitor(now=NOW)
+
+    # 0.90 → 0.82 → 0.74 → 0.66 (< 0.70에서 멈춤)
+    assert run["by_pressure"] == 3
+    assert [f.exists() for f in files] == [False, False, False, True, True]
+    assert fresh.exists()
+    assert janitor.get_janitor_metrics()["bytes_reclaimed_total"] >= 300
+
+def test_other_workers_running_job_survives_high_water_sweep(dirs, monkeypatch):
+    root, uploads, outputs = dirs
+    monkeypatch.setattr(janitor, "_usage", lambda path: 0.99)
+    monkeypatch.setattr(scratch, "_active", set())
+    job_dir = scratch.create_scratch_dir("waiting")
+    os.utime(job_dir, (NOW - 1000, NOW - 1000))
+    scratch.touch_active_dirs()
+    # 다른 워커 입장: 이 프로세스의 _active에 없음 → mtime만 보고 판단
+    monkeypatch.setattr(scratch, "_active", set())
+
+    janitor.run_janitor(now=os.stat(job_dir).st_mtime + 60)
+
+    assert os.path.isdir(job_dir)
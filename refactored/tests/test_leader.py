@@ -0,0 +1,65 @@
+import pytest
+from refactored.utils import leader
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = ""
+
+    def json(self):
+        return self._payload
+
+class FakeLeaseTable:
+    """scheduler_leases 한 행을 흉내내는 PostgREST"""
+
+    def __init__(self):
+        self.row = None
+
+    def patch(self, url, json, params, **kwargs):
+        if self.row is None or "or" not in params:
+            if self.row and params.get("holder") == f"eq.{self.row['holder']}":
+                self.row["expires_at"] = json["expires_at"]
+            return FakeResponse(200, [])
+        now = params["or"].split('expires_at.lt."')[1].rstrip('")')
+        if self.row["holder"] == json["holder"] or self.row["expires_at"] < now:
+            self.row = dict(json)
+            return FakeResponse(200, [self.row])
+        return FakeResponse(200, [])
+
+    def post(self, url, json, **kwargs):
+        if self.row is not None:
+            return FakeResponse(201, [])
+        self.row = dict(json)
+        return FakeResponse(201, [self.row])
+
+@pytest.fixture
+def table(monkeypatch, tmp_path, fake_supabase):
+    fake = FakeLeaseTable()
+    fake_supabase(fake)
+    monkeypatch.setattr(leader, "LEADER_LOCK_FILE", str(tmp_path / "leader.lock"))
+    monkeypatch.setattr(leader, "_lease_available", True)
+    yield fake
+    leader.resign()
+
+def test_first_candidate_takes_lease_and_keeps_it(table):
+    assert leader.heartbeat() and leader.is_leader()
+    assert table.row["holder"] == leader.HOLDER_ID
+    assert leader.heartbeat()
+
+def test_live_lease_of_other_host_blocks_leadership(table):
+    table.row = {"name": "background-jobs", "holder": "other-host", "expires_at": "9999-01-01T00:00:00+00:00"}
+    assert not leader.heartbeat()
+    assert leader.leader_only(lambda: "ran")() is None
+
+def test_expired_lease_is_taken_over(table):
+    table.row = {"name": "background-jobs", "holder": "dead-host", "expires_at": "2000-01-01T00:00:00+00:00"}
+    assert leader.heartbeat()
+    assert leader.leader_only(lambda: "ran")() == "ran"
+
+def test_second_worker_on_same_host_is_blocked_by_file_lock(table, monkeypatch):
+    assert leader.heartbeat()
+    held_fd = leader._lock_fd
+    monkeypatch.setattr(leader, "_lock_fd", None)  # 같은 락 파일을 여는 두 번째 워커
+    assert not leader._acquire_file_lock()
+    monkeypatch.setattr(leader, "_lock_fd", held_fd)
@@ -0,0 +1,50 @@
+import json
+import logging
+import queue
+from refactored.services import ffmpeg_runner
+from refactored.services.ffmpeg_runner import StderrTail, log_ffmpeg_output
+from refactored.utils import logger
+
+def _record(msg):
+    return logging.LogRecord("app", logging.INFO, __file__, 1, msg, None, None)
+
+def test_queue_handler_tags_job_id_and_formats_json_later():
+    q = queue.Queue()
+    handler = logger._ContextQueueHandler(q)
+
+    with logger.bind_job_id("job-1"):
+        record = _record("렌더 시작")
+        record.fields = {"stage": "ffmpeg"}
+        handler.handle(record)
+
+    line = json.loads(logger.JsonFormatter().format(q.get_nowait()))
+    assert line["msg"] == "렌더 시작"
+    assert line["job_id"] == "job-1"
+    assert line["stage"] == "ffmpeg"
+
+def test_full_queue_drops_instead_of_blocking(monkeypatch):
+    monkeypatch.setattr(logger, "_dropped", 0)
+    handler = logger._ContextQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(_record("a"))
+    handler.handle(_record("b"))
+
+    assert logger.get_log_stats()["dropped"] == 1
+
+def test_stderr_tail_is_bounded():
+    tail = StderrTail(max_lines=3)
+    for i in range(10):
+        tail.append(f"line {i}\n")
+
+    assert tail.text() == "... (7 lines omitted)\nline 7\nline 8\nline 9\n"
+
+def test_ffmpeg_output_logged_only_on_failure(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ffmpeg_runner, "log", lambda msg, **kw: calls.append(kw))
+    monkeypatch.setattr(ffmpeg_runner, "FFMPEG_LOG_SAMPLE_RATE", 0.0)
+
+    log_ffmpeg_output(0, "ok output")
+    log_ffmpeg_output(1, "boom")
+
+    assert len(calls) == 1
+    assert calls[0]["level"] == "error" and calls[0]["stderr_tail"] == "boom"
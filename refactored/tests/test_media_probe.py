@@ -0,0 +1,73 @@
+import struct
+import pytest
+from refactored.utils import media_probe
+from refactored.utils.media_probe import MediaProbeError, probe_media
+
+# MPEG1 Layer III, 128kbps, 44.1kHz, 스테레오 → 프레임당 417바이트
+FRAME_HEADER = b"\xff\xfb\x90\x00"
+FRAME_SIZE = 417
+
+@pytest.fixture(autouse=True)
+def no_ffprobe(monkeypatch):
+    monkeypatch.setattr(media_probe, "FFPROBE_BIN", "ffprobe-not-installed")
+
+def _write_cbr(path, frames):
+    id3 = b"ID3\x03\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    path.write_bytes(id3 + (FRAME_HEADER + b"\x00" * (FRAME_SIZE - 4)) * frames)
+
+def test_cbr_duration_from_headers(tmp_path):
+    path = tmp_path / "voice.mp3"
+    _write_cbr(path, frames=100)
+
+    info = probe_media(str(path))
+
+    assert info.duration == pytest.approx(100 * FRAME_SIZE * 8 / 128000)
+    assert (info.sample_rate, info.channels, info.codec) == (44100, 2, "mp3")
+
+def test_xing_frame_count(tmp_path):
+    xing = FRAME_HEADER + b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, 1000)
+    path = tmp_path / "vbr.mp3"
+    path.write_bytes(xing + b"\x00" * (FRAME_SIZE - len(xing)))
+
+    assert probe_media(str(path)).duration == pytest.approx(1000 * 1152 / 44100)
+
+def test_memoized_by_content(tmp_path, monkeypatch):
+    first, second = tmp_path / "a.mp3", tmp_path / "b.mp3"
+    _write_cbr(first, frames=7)
+    _write_cbr(second, frames=7)
+    probe_media(str(first))
+
+    monkeypatch.setattr(media_probe, "_probe_mp3_headers", lambda path: pytest.fail("not memoized"))
+    assert probe_media(str(second)).duration > 0
+
+def test_not_audio(tmp_path):
+    path = tmp_path / "note.txt"
+    path.write_bytes(b"hello world" * 10)
+    with pytest.raises(MediaProbeError):
+        probe_media(str(path))
+
+def test_truncated_xing_is_a_probe_error(tmp_path):
+    path = tmp_path / "broken.mp3"
+    path.write_bytes(FRAME_HEADER + b"\x00" * 32 + b"Xing\x00\x00")
+
+    with pytest.raises(MediaProbeError):
+        probe_media(str(path))
+
+def test_ffprobe_timeout_falls_back_to_headers(tmp_path, monkeypatch):
+    path = tmp_path / "voice.mp3"
+    _write_cbr(path, frames=10)
+
+    def timeout(command, **kwargs):
+        raise media_probe.subprocess.TimeoutExpired(command, 30)
+
+    monkeypatch.setattr(media_probe.subprocess, "run", timeout)
+    assert probe_media(str(path)).duration == pytest.approx(10 * FRAME_SIZE * 8 / 128000)
+
+def test_truncated_image_has_no_size(tmp_path):
+    jpeg = tmp_path / "bg.jpg"
+    jpeg.write_bytes(b"\xff\xd8\xff\xc0\x00")
+    png = tmp_path / "bg.png"
+    png.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+
+    assert media_probe.probe_image_size(str(jpeg)) is None
+    assert media_probe.probe_image_size(str(png)) is None
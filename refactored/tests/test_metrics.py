@@ -0,0 +1,51 @@
+import pytest
+from prometheus_client import REGISTRY
+from refactored.services import template_registry
+from refactored.utils.metrics import api_call, count_request, metric_labels, metrics_response, stage
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+def test_stage_inherits_request_labels_and_marks_failures(monkeypatch):
+    monkeypatch.setitem(template_registry._cache, "t9", (object(), 0))
+    labels = {"stage": "t_probe", "template_id": "t9", "content_type": "뉴스"}
+    ok_before = _sample("shorts_stage_seconds_count", outcome="ok", **labels)
+    error_before = _sample("shorts_stage_seconds_count", outcome="error", **labels)
+
+    with metric_labels(template_id="t9", content_type="뉴스"):
+        with stage("t_probe"):
+            pass
+        with stage("t_probe") as span:
+            span.fail()
+        with pytest.raises(RuntimeError):
+            with stage("t_probe"):
+                raise RuntimeError("boom")
+
+    assert _sample("shorts_stage_seconds_count", outcome="ok", **labels) == ok_before + 1
+    assert _sample("shorts_stage_seconds_count", outcome="error", **labels) == error_before + 2
+
+def test_unknown_content_type_is_bucketed():
+    labels = {"endpoint": "t_render", "template_id": "none", "content_type": "other", "outcome": "client_error"}
+    before = _sample("shorts_requests_total", **labels)
+
+    count_request("t_render", 400, content_type="GPT가 지어낸 유형")
+
+    assert _sample("shorts_requests_total", **labels) == before + 1
+
+def test_unregistered_template_id_is_bucketed():
+    labels = {"endpoint": "t_render", "template_id": "unknown", "content_type": "none", "outcome": "ok"}
+    before = _sample("shorts_requests_total", **labels)
+
+    count_request("t_render", 200, template_id="아무거나-1234")
+
+    assert _sample("shorts_requests_total", **labels) == before + 1
+    assert _sample("shorts_requests_total", endpoint="t_render", template_id="아무거나-1234",
+                   content_type="none", outcome="ok") == 0
+
+def test_api_call_and_exposition():
+    with api_call("t_weather") as span:
+        span.fail()
+
+    body, content_type = metrics_response()
+    assert content_type.startswith("text/plain")
+    assert b'shorts_external_api_seconds_count{api="t_weather",outcome="error"} 1.0' in body
@@ -0,0 +1,51 @@
+import pytest
+from refactored.services.encoding_profiles import rendition_size
+from refactored.services.ffmpeg_runner import build_multi_output_command
+from refactored.services.filter_graph import build_multi_output_filter
+from refactored.services.template_registry import TemplateLayout
+
+TEMPLATE_A = TemplateLayout.from_row({"template_id": "a", "video_area": {"x": 0, "y": 420, "w": 1080, "h": 1080}})
+TEMPLATE_B = TemplateLayout.from_row({"template_id": "b", "video_area": {"x": 40, "y": 300, "w": 1000, "h": 800}})
+
+def test_rendition_size_scales_short_side_without_upscaling():
+    assert rendition_size("480p", (1080, 1920)) == (480, 854)
+    assert rendition_size("source", (1080, 1920)) is None
+    assert rendition_size("1080p", (720, 1280)) is None
+    with pytest.raises(ValueError):
+        rendition_size("8k", (1080, 1920))
+
+def test_single_output_matches_single_render_graph():
+    graph, outputs = build_multi_output_filter([TEMPLATE_A], ["subs"], [[("source", None)]])
+
+    assert graph == "[1:v]scale=1080:1080[scaled0];[0:v][scaled0]overlay=0:420,subs[t0_source]"
+    assert outputs == [(0, "source", "t0_source")]
+
+def test_templates_share_one_background_decode_and_split_per_rendition():
+    graph, outputs = build_multi_output_filter(
+        [TEMPLATE_A, TEMPLATE_B], ["subsA", "subsB"],
+        [[("source", None), ("480p", (480, 854))]] * 2,
+        poster_at=1.0
+    )
+    chains = graph.split(";")
+
+    assert chains[0] == "[2:v]split=2[bg0][bg1]"
+    assert "[bg1]scale=1000:800[scaled1]" in chains
+    assert "[1:v][scaled1]overlay=40:300,subsB,split=3[c1_source][c1_480p][c1_poster]" in chains
+    assert "[c0_480p]scale=480:854[t0_480p]" in chains
+    assert "[c0_poster]trim=start=1.0,setpts=PTS-STARTPTS[t0_poster]" in chains
+    assert [o[1] for o in outputs] == ["source", "480p", "poster"] * 2
+
+def test_multi_output_command_maps_audio_to_every_video():
+    command = build_multi_output_command(
+        ["a.jpg", "b.jpg"], "bg.jpg", "voice.mp3", "graph",
+        [
+            {"label": "t0_source", "path": "a.mp4", "kind": "video"},
+            {"label": "t1_source", "path": "b.mp4", "kind": "video"},
+            {"label": "t0_poster", "path": "a.jpg", "kind": "poster"},
+        ],
+        3.0
+    )
+
+    assert command.count("-i") == 4
+    assert command.count("3:a") == 2
+    assert command[command.index("[t0_poster]") + 1:] == ["-frames:v", "1", "-q:v", "3", "a.jpg"]
@@ -0,0 +1,132 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from refactored.services import render_memo
+from refactored.utils import supabase_utils
+
+@pytest.fixture(autouse=True)
+def clean_memo(monkeypatch):
+    monkeypatch.setattr(render_memo, "_index", render_memo.OrderedDict())
+    monkeypatch.setattr(render_memo, "_inflight", {})
+
+def _inputs(tmp_path, image=b"img", audio=b"aud"):
+    image_path = tmp_path / "bg.jpg"
+    audio_path = tmp_path / "audio.mp3"
+    image_path.write_bytes(image)
+    audio_path.write_bytes(audio)
+    return str(image_path), str(audio_path)
+
+TEMPLATE = SimpleNamespace(template_id="t1", version="2024-01-01")
+
+def test_fingerprint_ignores_whitespace_but_not_inputs(tmp_path):
+    image_path, audio_path = _inputs(tmp_path)
+    fp = render_memo.render_fingerprint(TEMPLATE, image_path, audio_path, "안녕  하세요\n", "1080p", "ass", "u1")
+
+    assert fp == render_memo.render_fingerprint(TEMPLATE, image_path, audio_path, " 안녕 하세요", "1080p", "ass", "u1")
+    assert fp != render_memo.render_fingerprint(TEMPLATE, image_path, audio_path, "안녕 하세요", "720p", "ass", "u1")
+    assert fp != render_memo.render_fingerprint(TEMPLATE, image_path, audio_path, "안녕 하세요", "1080p", "ass", "u2")
+
+    newer = SimpleNamespace(template_id="t1", version="2024-02-01")
+    assert fp != render_memo.render_fingerprint(newer, image_path, audio_path, "안녕 하세요", "1080p", "ass", "u1")
+
+    (tmp_path / "audio.mp3").write_bytes(b"other")
+    assert fp != render_memo.render_fingerprint(TEMPLATE, image_path, audio_path, "안녕 하세요", "1080p", "ass", "u1")
+
+def test_concurrent_duplicates_share_one_render():
+    renders = []
+    started = threading.Event()
+
+    def render():
+        renders.append(1)
+        started.set()
+        time.sleep(0.1)
+        return {"log_id": "v1"}, 200
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(render_memo.memoized("fp", lambda: None, render)))
+    leader.start()
+    started.wait(1)
+    followers = [
+        threading.Thread(target=lambda: results.append(render_memo.memoized("fp", lambda: None, render)))
+        for _ in range(3)
+    ]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join(2)
+
+    assert len(renders) == 1
+    assert results == [({"log_id": "v1"}, 200)] * 4
+    assert render_memo.get_memo_stats()["inflight"] == 0
+
+def test_reuse_skips_render():
+    result = render_memo.memoized("fp", lambda: ({"log_id": "old", "reused": True}, 200), lambda: pytest.fail("rendered"))
+    assert result == ({"log_id": "old", "reused": True}, 200)
+
+def test_lookup_falls_back_to_db_and_indexes(monkeypatch):
+    calls = []
+
+    def db_lookup(fp):
+        calls.append(fp)
+        return "v9"
+
+    assert render_memo.lookup("fp", db_lookup) == "v9"
+    assert render_memo.lookup("fp", db_lookup) == "v9"
+    assert calls == ["fp"]
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+class Videos:
+    def __init__(self, error=None):
+        self.bodies = []
+        self.gets = []
+        self.error = error or {"code": "PGRST204", "message": "Could not find the 'render_fingerprint' column"}
+
+    def get(self, url, **kwargs):
+        self.gets.append(kwargs)
+        return FakeResponse(200, [])
+
+    def post(self, url, json, **kwargs):
+        self.bodies.append(json)
+        if "render_fingerprint" in json[0]:
+            return FakeResponse(400, self.error)
+        return FakeResponse(201, json)
+
+def test_insert_retries_without_missing_optional_column(fake_supabase, monkeypatch):
+    monkeypatch.setattr(supabase_utils, "_missing_columns", set())
+    videos = Videos()
+    fake_supabase(videos)
+
+    row = supabase_utils.supabase_insert_video(
+        {"uuid": "v1", "render_fingerprint": "fp"}, optional_columns=("render_fingerprint",)
+    )
+    assert row == {"uuid": "v1"}
+    assert len(videos.bodies) == 2
+
+    # 한 번 확인된 뒤로는 조회도 안 하고 처음부터 컬럼을 뺌
+    assert supabase_utils.supabase_find_video_by_fingerprint("fp") is None
+    supabase_utils.supabase_insert_video({"uuid": "v2", "render_fingerprint": "fp"}, optional_columns=("render_fingerprint",))
+    assert videos.gets == []
+    assert len(videos.bodies) == 3
+
+def test_insert_does_not_retry_other_client_errors(fake_supabase, monkeypatch):
+    monkeypatch.setattr(supabase_utils, "_missing_columns", set())
+    videos = Videos(error={"code": "23505", "message": "duplicate key value"})
+    fake_supabase(videos)
+
+    row = supabase_utils.supabase_insert_video(
+        {"uuid": "v1", "render_fingerprint": "fp"}, optional_columns=("render_fingerprint",)
+    )
+
+    assert row is None
+    assert len(videos.bodies) == 1
+    assert not supabase_utils.is_column_missing("render_fingerprint")
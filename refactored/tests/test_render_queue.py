@@ -0,0 +1,47 @@
+import time
+from refactored.services.render_queue import submit_render_job, get_render_job, track_render_progress
+from refactored.services.video_service import stream_render_events
+
+def _wait_for(job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = get_render_job(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+def test_job_done():
+    job_id = submit_render_job(lambda p: ({"video_url": "v", "log_id": p["template_id"]}, 200),
+                               {"template_id": "t1"})
+    job = _wait_for(job_id)
+
+    assert job["status"] == "done"
+    assert job["result"]["log_id"] == "t1"
+
+def test_job_failed():
+    def boom(params):
+        raise RuntimeError("ffmpeg exploded")
+
+    job = _wait_for(submit_render_job(boom, {"template_id": "t1"}))
+
+    assert job["status"] == "failed"
+    assert "ffmpeg exploded" in job["error"]
+
+def test_unknown_job():
+    assert get_render_job("nope") is None
+
+def test_progress_reaches_job_and_event_stream():
+    def render(params):
+        with track_render_progress(10.0) as progress:
+            for line in ("out_time_us=5000000", "speed=1x", "progress=continue"):
+                progress.feed(line)
+        return {"log_id": "v1"}, 200
+
+    job_id = submit_render_job(render, {"template_id": "t1"})
+    events = [e for e in stream_render_events(job_id) if e.startswith("data:")]
+    job = _wait_for(job_id)
+
+    assert job["progress"]["percent"] == 50.0
+    assert job["progress"]["eta_seconds"] == 5.0
+    assert '"status": "done"' in events[-1]
@@ -0,0 +1,44 @@
+import time
+import pytest
+from refactored.services import render_scheduler
+from refactored.services.render_scheduler import (
+    RenderCapacityError, render_slot, get_render_utilization, ffmpeg_thread_budget
+)
+
+def test_slot_gives_thread_budget():
+    with render_slot(timeout=0) as threads:
+        assert threads == ffmpeg_thread_budget()
+        assert get_render_utilization()["active"] == 1
+
+    assert get_render_utilization()["active"] == 0
+
+def test_saturated_slot_rejects_with_retry_hint(monkeypatch):
+    monkeypatch.setattr(render_scheduler, "_max_parallel", lambda: 1)
+
+    with render_slot(timeout=0):
+        with pytest.raises(RenderCapacityError) as exc:
+            with render_slot(timeout=0.05):
+                pass
+
+    assert exc.value.retry_after >= 1
+    assert get_render_utilization()["rejected_total"] >= 1
+
+def test_wait_estimate_uses_reported_etas(monkeypatch):
+    monkeypatch.setattr(render_scheduler, "_max_parallel", lambda: 1)
+
+    with render_slot(timeout=0):
+        render_scheduler.report_render_eta("job", 4.0)
+        try:
+            assert render_scheduler.estimate_wait_seconds() == 4
+            # 앞에 대기 작업 1개 → 실행 중 렌더 ETA + 평균 렌더 시간
+            avg = get_render_utilization()["avg_render_seconds"]
+            assert render_scheduler.estimate_wait_seconds(queued=1) == round(4 + avg)
+
+            # ETA상 timeout 안에 슬롯이 안 나면 기다리지 않고 바로 거절
+            started = time.monotonic()
+            with pytest.raises(RenderCapacityError) as exc:
+                render_scheduler.acquire_render_slot(timeout=1)
+            assert time.monotonic() - started < 0.5
+            assert exc.value.retry_after == 4
+        finally:
+            render_scheduler.clear_render_eta("job")
@@ -0,0 +1,76 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+from refactored.services import signed_url_cache
+from refactored.services.signed_url_cache import SignedUrlError, get_signed_bundle
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(signed_url_cache, "TTL_SECONDS", 3600)
+    monkeypatch.setattr(signed_url_cache, "SIGNED_URL_CACHE_MARGIN", 300)
+    monkeypatch.setattr(signed_url_cache, "SIGNED_URL_REFRESH_AHEAD", 300)
+    monkeypatch.setattr(signed_url_cache, "SIGNED_URL_CACHE_DIR", "")
+    signed_url_cache._cache.clear()
+    signed_url_cache._refreshing.clear()
+
+def bundle_signed(seconds_ago):
+    signed = (datetime.utcnow() - timedelta(seconds=seconds_ago)).isoformat()
+    return {"video_url": f"v@{signed}", "image_url": "i", "audio_url": "a", "signed_created_at": signed}
+
+class Loader:
+    def __init__(self, *bundles):
+        self.bundles = list(bundles)
+        self.calls = 0
+
+    def __call__(self, uuid, user_id):
+        self.calls += 1
+        return self.bundles.pop(0)
+
+def wait_for_refresh():
+    deadline = time.time() + 2
+    while signed_url_cache._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_fresh_bundle_is_served_from_memory():
+    loader = Loader(bundle_signed(0))
+    first = get_signed_bundle("u1", "owner", loader)
+    assert get_signed_bundle("u1", "owner", loader) == first
+    assert loader.calls == 1
+
+def test_other_user_never_sees_cached_bundle():
+    loader = Loader(bundle_signed(0))
+    get_signed_bundle("u1", "owner", loader)
+
+    def deny(uuid, user_id):
+        raise SignedUrlError("Unauthorized access", 403)
+
+    with pytest.raises(SignedUrlError) as e:
+        get_signed_bundle("u1", "intruder", deny)
+    assert e.value.status == 403
+
+def test_bundle_near_expiry_is_served_then_refreshed_in_background():
+    old, new = bundle_signed(3600 - 400), bundle_signed(0)
+    loader = Loader(old, new)
+    get_signed_bundle("u1", "owner", loader)
+
+    assert get_signed_bundle("u1", "owner", loader) == old
+    wait_for_refresh()
+    assert get_signed_bundle("u1", "owner", loader) == new
+    assert loader.calls == 2
+
+def test_stale_bundle_is_reloaded_synchronously():
+    loader = Loader(bundle_signed(3600 - 100), bundle_signed(0))
+    first = get_signed_bundle("u1", "owner", loader)
+    assert get_signed_bundle("u1", "owner", loader) != first
+    assert loader.calls == 2
+
+def test_shared_directory_serves_other_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(signed_url_cache, "SIGNED_URL_CACHE_DIR", str(tmp_path))
+    bundle = bundle_signed(0)
+    get_signed_bundle("u1", "owner", Loader(bundle))
+
+    signed_url_cache._cache.clear()  # 다른 워커 프로세스 흉내
+    assert get_signed_bundle("u1", "owner", Loader()) == bundle
+
+    signed_url_cache.invalidate_signed_bundles(["u1"])
+    assert list(tmp_path.iterdir()) == []
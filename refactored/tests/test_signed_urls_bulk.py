@@ -0,0 +1,129 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from refactored.services import signed_url_cache, video_service
+from refactored.utils import supabase_utils
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    monkeypatch.setattr(signed_url_cache, "SIGNED_URL_CACHE_DIR", "")
+    signed_url_cache._cache.clear()
+
+def make_row(owner, seconds_ago):
+    video_id = str(uuid.uuid4())
+    signed = (datetime.utcnow() - timedelta(seconds=seconds_ago)).isoformat()
+    return {
+        "uuid": video_id, "user_id": owner,
+        "video_path": f"{video_id}_video.mp4", "image_path": f"{video_id}_bg.jpg",
+        "audio_path": f"{video_id}_audio.mp3", "signed_created_at": signed,
+        "video_signed_url": "old-v", "image_signed_url": "old-i", "audio_signed_url": "old-a"
+    }
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = {row["uuid"]: row for row in rows}
+        self.calls = {"select": 0, "sign": 0, "upsert": 0}
+        self.upserted = []
+
+    def select(self, uuids):
+        self.calls["select"] += 1
+        return [self.rows[u] for u in uuids if u in self.rows]
+
+    def sign(self, paths):
+        self.calls["sign"] += 1
+        return {p: f"signed:{p}" for p in paths}
+
+    def upsert(self, rows):
+        self.calls["upsert"] += 1
+        self.upserted.extend(rows)
+        return True
+
+def call_bulk(monkeypatch, fake, body):
+    monkeypatch.setattr(supabase_utils, "supabase_get_videos_by_uuids", fake.select)
+    monkeypatch.setattr(supabase_utils, "get_signed_urls", fake.sign)
+    monkeypatch.setattr(supabase_utils, "supabase_upsert_signed_urls", fake.upsert)
+    return video_service.handle_get_signed_urls_bulk(SimpleNamespace(json=body))
+
+def test_bulk_resigns_only_expired_rows_in_one_batch(monkeypatch):
+    fresh, expired, other = make_row("me", 60), make_row("me", 7200), make_row("someone", 60)
+    missing = str(uuid.uuid4())
+    fake = FakeSupabase([fresh, expired, other])
+
+    body, status = call_bulk(monkeypatch, fake, {
+        "user_id": "me", "uuids": [fresh["uuid"], expired["uuid"], other["uuid"], missing]
+    })
+
+    assert status == 200
+    assert fake.calls == {"select": 1, "sign": 1, "upsert": 1}
+    assert [row["uuid"] for row in fake.upserted] == [expired["uuid"]]
+    items = body["items"]
+    assert items[0]["video_url"] == "old-v"
+    assert items[1]["video_url"] == f"signed:{expired['video_path']}"
+    assert items[2]["status"] == 403
+    assert items[3]["status"] == 404
+
+def test_bulk_second_call_is_served_from_cache(monkeypatch):
+    rows = [make_row("me", 7200) for _ in range(3)]
+    fake = FakeSupabase(rows)
+    request_body = {"user_id": "me", "uuids": [row["uuid"] for row in rows]}
+
+    call_bulk(monkeypatch, fake, request_body)
+    body, _ = call_bulk(monkeypatch, fake, request_body)
+
+    assert fake.calls == {"select": 1, "sign": 1, "upsert": 1}
+    assert all(item["video_url"].startswith("signed:") for item in body["items"])
+
+def test_bulk_rejects_invalid_uuid(monkeypatch):
+    body, status = call_bulk(monkeypatch, FakeSupabase([]), {"user_id": "me", "uuids": ["1),or(x"]})
+    assert status == 400
+
+def test_bulk_signs_posters_for_fresh_and_expired_rows(monkeypatch):
+    fresh, expired, plain = make_row("me", 60), make_row("me", 7200), make_row("me", 60)
+    for row in (fresh, expired):
+        row["poster_path"] = f"{row['uuid']}_poster.jpg"
+    fake = FakeSupabase([fresh, expired, plain])
+
+    body, _ = call_bulk(monkeypatch, fake, {"user_id": "me", "uuids": [fresh["uuid"], expired["uuid"], plain["uuid"]]})
+
+    assert fake.calls == {"select": 1, "sign": 1, "upsert": 1}
+    items = body["items"]
+    assert items[0]["poster_url"] == f"signed:{fresh['poster_path']}"
+    assert items[1]["poster_url"] == f"signed:{expired['poster_path']}"
+    assert "poster_url" not in items[2]
+
+def test_single_bundle_signs_poster(monkeypatch):
+    row = make_row("me", 60)
+    row["poster_path"] = f"{row['uuid']}_poster.jpg"
+    monkeypatch.setattr(supabase_utils, "supabase_get_video_by_uuid", lambda video_id: row)
+    monkeypatch.setattr(supabase_utils, "get_signed_urls", FakeSupabase([]).sign)
+
+    bundle = video_service._load_signed_bundle(row["uuid"], "me")
+
+    assert bundle["video_url"] == "old-v"
+    assert bundle["poster_url"] == f"signed:{row['poster_path']}"
+
+class _Response:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+def test_select_drops_poster_column_missing_before_migration(fake_supabase, monkeypatch):
+    monkeypatch.setattr(supabase_utils, "_missing_columns", set())
+    selects = []
+
+    class Videos:
+        def get(self, url, params, **kwargs):
+            selects.append(params["select"])
+            if "poster_path" in params["select"]:
+                return _Response(400, {"code": "42703", "message": "column videos.poster_path does not exist"})
+            return _Response(200, [{"uuid": "v1"}])
+
+    fake_supabase(Videos())
+
+    assert supabase_utils.supabase_get_videos_by_uuids(["v1"]) == [{"uuid": "v1"}]
+    assert supabase_utils.supabase_get_videos_by_uuids(["v1"]) == [{"uuid": "v1"}]
+    assert [("poster_path" in s) for s in selects] == [True, False, False]
@@ -0,0 +1,46 @@
+from refactored.services.subtitle import (
+    ass_color, build_ass_document, build_subtitle_cues, subtitle_base_y
+)
+from refactored.services.template_registry import TemplateLayout
+
+LAYOUT = TemplateLayout.from_row({
+    "template_id": "t1",
+    "frame_url": "https://cdn/frame.jpg",
+    "font_size": 54,
+    "font_color": "#FFFFFF",
+    "box_color": "#000000AA",
+    "video_area": {"x": 0, "y": 420, "w": 1080, "h": 1080},
+    "headline_area": {"x": 0, "y": 100, "w": 1080, "h": 300},
+})
+
+def test_cues_split_duration_evenly():
+    cues = build_subtitle_cues("가나다라마바사 아자차카타파 하하", 9.0)
+
+    assert [c["text"] for c in cues] == ["가나다라마바사 아자차카타파", "하하"]
+    assert cues[1] == {"start": 4.5, "end": 9.0, "text": "하하"}
+
+def test_ass_color_inverts_alpha():
+    assert ass_color("#FFFFFF") == "&H00FFFFFF"
+    assert ass_color("#000000AA") == "&H55000000"
+    assert ass_color("#112233") == "&H00332211"
+
+def test_ass_color_accepts_drawtext_named_colors():
+    assert ass_color("white") == "&H00FFFFFF"
+    assert ass_color("Yellow") == "&H0000FFFF"
+    assert ass_color("black@0.5", "#000000AA") == "&H7F000000"
+    assert ass_color("0x112233") == "&H00332211"
+    # 모르는 이름 → 기본 색
+    assert ass_color("chartreuse-ish", "#000000AA") == "&H55000000"
+    assert ass_color("notacolor") == "&H00FFFFFF"
+
+def test_ass_document_positions_and_fades():
+    cues = build_subtitle_cues("첫번째 줄 입니다 {태그} 두번째 줄", 4.0)
+    doc = build_ass_document(cues, LAYOUT, (1080, 1920))
+    dialogues = [line for line in doc.splitlines() if line.startswith("Dialogue:")]
+
+    base_y = subtitle_base_y(LAYOUT, len(cues))
+    assert len(dialogues) == len(cues)
+    assert f"\\pos(540,{base_y})\\fad(500,500)" in dialogues[0]
+    assert f"\\pos(540,{base_y + 62})" in dialogues[1]
+    assert "{태그}" not in doc
+    assert "PlayResY: 1920" in doc
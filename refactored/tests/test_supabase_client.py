@@ -0,0 +1,65 @@
+import requests
+import pytest
+from refactored.utils import supabase_client
+from refactored.utils.supabase_client import SupabaseClient
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class ScriptedSession:
+    """미리 정한 응답/예외를 순서대로 돌려주는 세션"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(supabase_client.time, "sleep", sleeps.append)
+    return sleeps
+
+def make_client(session, retries=3):
+    return SupabaseClient(rest_url="https://db/rest/v1", storage_url="https://db/storage/v1",
+                          session=session, max_retries=retries)
+
+def test_retries_5xx_and_connection_errors_then_succeeds():
+    session = ScriptedSession(FakeResponse(503), requests.ConnectionError("reset"), FakeResponse(200))
+    client = make_client(session)
+
+    assert client.rest("GET", "videos", params={"uuid": "eq.x"}).status_code == 200
+    assert len(session.calls) == 3
+    stats = client.get_stats()["GET rest/videos"]
+    assert stats["calls"] == 3 and stats["errors"] == 2 and stats["retries"] == 2
+
+def test_4xx_is_returned_without_retry():
+    session = ScriptedSession(FakeResponse(404))
+    assert make_client(session).rest("GET", "videos").status_code == 404
+    assert len(session.calls) == 1
+
+def test_429_honors_retry_after(no_sleep):
+    session = ScriptedSession(FakeResponse(429, {"Retry-After": "2"}), FakeResponse(200))
+    make_client(session).storage("POST", "/object/sign/uploads", json={})
+    assert no_sleep == [2.0]
+
+def test_streaming_body_is_never_replayed():
+    session = ScriptedSession(FakeResponse(503))
+    res = make_client(session).storage("POST", "/object/uploads/v.mp4", op="upload", data=iter([b"x"]))
+    assert res.status_code == 503 and len(session.calls) == 1
+
+def test_op_timeouts_are_applied():
+    session = ScriptedSession(FakeResponse(200), FakeResponse(200))
+    client = make_client(session)
+    client.rest("GET", "videos")
+    client.storage("POST", "/object/uploads/a.mp3", op="upload", data=b"x")
+    assert session.calls[0][2]["timeout"] == client.timeouts["rest"]
+    assert session.calls[1][2]["timeout"] == client.timeouts["upload"]
@@ -0,0 +1,49 @@
+from refactored.utils import supabase_utils
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+class FakeSignEndpoint:
+    """video.mp4는 두 번째 요청부터 보이는 스토리지"""
+
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, json, **kwargs):
+        self.requests.append(sorted(json["paths"]))
+        visible = len(self.requests) > 1
+        return FakeResponse(200, [
+            {"path": p, "signedURL": f"/object/sign/uploads/{p}?token=t", "error": None}
+            if p != "video.mp4" or visible else
+            {"path": p, "signedURL": None, "error": "Either the object does not exist"}
+            for p in json["paths"]
+        ])
+
+def test_sign_when_ready_retries_only_missing_objects(monkeypatch, fake_supabase):
+    endpoint = FakeSignEndpoint()
+    fake_supabase(endpoint)
+    monkeypatch.setattr(supabase_utils.time, "sleep", lambda s: None)
+
+    signed = supabase_utils.sign_when_ready(["video.mp4", "uploads/audio.mp3"])
+
+    assert endpoint.requests == [["audio.mp3", "video.mp4"], ["video.mp4"]]
+    assert signed["uploads/audio.mp3"].endswith("/object/sign/uploads/audio.mp3?token=t")
+    assert signed["video.mp4"].endswith("/object/sign/uploads/video.mp4?token=t")
+
+def test_sign_when_ready_gives_up_after_bounded_retries(monkeypatch, fake_supabase):
+    class NeverVisible(FakeSignEndpoint):
+        def post(self, url, json, **kwargs):
+            self.requests.append(json["paths"])
+            return FakeResponse(200, [{"path": p, "signedURL": None, "error": "not found"} for p in json["paths"]])
+
+    endpoint = NeverVisible()
+    fake_supabase(endpoint)
+    monkeypatch.setattr(supabase_utils.time, "sleep", lambda s: None)
+
+    assert supabase_utils.sign_when_ready(["video.mp4"], retries=2) == {"video.mp4": None}
+    assert len(endpoint.requests) == 3
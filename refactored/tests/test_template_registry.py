@@ -0,0 +1,47 @@
+import pytest
+from refactored.services import template_registry
+from refactored.services.template_registry import (
+    Area, TemplateLayout, TemplateParseError, get_template, invalidate_templates, warm_up_templates
+)
+
+ROW = {
+    "template_id": 7,
+    "frame_url": "//cdn/frame.jpg",
+    "font_size": 60,
+    "video_area": '{"x": 0, "y": 420, "w": 1080, "h": 1080}',
+    "headline_area": {"x": 0, "y": 120, "w": 1080, "h": 260},
+    "bottom_area": None,
+    "updated_at": "2025-05-01T00:00:00",
+}
+
+def test_from_row_parses_areas():
+    layout = TemplateLayout.from_row(ROW)
+
+    assert layout.template_id == "7"
+    assert layout.video_area == Area(0, 420, 1080, 1080)
+    assert layout.headline_area.h == 260
+    assert layout.bottom_area is None
+    assert layout.font_color == "#FFFFFF"
+
+def test_from_row_rejects_broken_json():
+    with pytest.raises(TemplateParseError):
+        TemplateLayout.from_row(dict(ROW, video_area="{broken"))
+
+def test_warm_up_serves_from_memory(monkeypatch):
+    queries = []
+
+    def fake_fetch(query):
+        queries.append(query)
+        return [ROW]
+
+    monkeypatch.setattr(template_registry, "_fetch_rows", fake_fetch)
+    invalidate_templates()
+
+    assert warm_up_templates() == 1
+    assert get_template(7).font_size == 60
+    assert get_template("7").version == "2025-05-01T00:00:00"
+    assert queries == ["select=*"]
+
+    assert invalidate_templates("7") == 1
+    get_template("7")
+    assert len(queries) == 2
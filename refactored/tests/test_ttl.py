@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+import pytest
+from refactored.services import ttl
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = ""
+
+    def json(self):
+        return self._payload
+
+class FakeVideosTable:
+    def __init__(self, expired, fresh, fail_patches=0):
+        self.rows = {}
+        for i in range(expired):
+            self.rows[f"e{i:03d}"] = (NOW - timedelta(hours=2, seconds=i)).isoformat()
+        for i in range(fresh):
+            self.rows[f"f{i:03d}"] = NOW.isoformat()
+        self.fail_patches = fail_patches
+        self.fail_on_calls = set()
+        self.patch_calls = 0
+        self.limits = []
+        self.patch_headers = []
+
+    def get(self, url, params, **kwargs):
+        cutoff = params["signed_created_at"][3:]
+        matches = sorted(
+            (ts, uid) for uid, ts in self.rows.items() if ts is not None and ts < cutoff
+        )
+        if "or" in params:
+            after = params["or"].split("gt.")[1].split(",")[0].strip('"')
+            matches = [m for m in matches if m[0] > after]
+        limit = int(params["limit"])
+        self.limits.append(limit)
+        return FakeResponse(200, [{"uuid": uid, "signed_created_at": ts} for ts, uid in matches[:limit]])
+
+    def patch(self, url, headers, params, json, **kwargs):
+        self.patch_headers.append(headers["Prefer"])
+        self.patch_calls += 1
+        if self.patch_calls in self.fail_on_calls:
+            return FakeResponse(503)
+        if self.fail_patches:
+            self.fail_patches -= 1
+            return FakeResponse(503)
+        for uid in params["uuid"][4:-1].split(","):
+            self.rows[uid] = None
+        return FakeResponse(204)
+
+@pytest.fixture
+def table(monkeypatch, tmp_path, fake_supabase):
+    monkeypatch.setattr(ttl, "TTL_CLEANUP_CHECKPOINT", str(tmp_path / "ttl.json"))
+    monkeypatch.setattr(ttl, "TTL_CLEANUP_BATCH_SIZE", 10)
+    monkeypatch.setattr(ttl, "TTL_CLEANUP_MAX_RETRIES", 1)
+    monkeypatch.setattr(ttl.time, "sleep", lambda s: None)
+
+    def install(**kwargs):
+        fake = FakeVideosTable(**kwargs)
+        fake_supabase(fake)
+        return fake
+    return install
+
+def test_cleanup_runs_in_bounded_batches_with_minimal_return(table):
+    fake = table(expired=25, fresh=5)
+    run = ttl.run_ttl_cleanup(now=NOW)
+
+    assert run["completed"] and run["rows_cleared"] == 25 and run["batches"] == 3
+    assert max(fake.limits) == 10
+    assert set(fake.patch_headers) == {"return=minimal"}
+    assert sum(ts is not None for ts in fake.rows.values()) == 5
+    assert ttl._load_checkpoint() is None
+
+def test_cleanup_resumes_from_checkpoint_after_failure(table):
+    fake = table(expired=25, fresh=0)
+    fake.fail_on_calls = {2, 3}  # 두 번째 배치는 재시도까지 실패
+    first = ttl.run_ttl_cleanup(now=NOW)
+    assert not first["completed"] and first["rows_cleared"] == 10
+
+    resumed = ttl.run_ttl_cleanup(now=NOW + timedelta(hours=1))
+    assert resumed["resumed"] and resumed["cutoff"] == first["cutoff"]
+    assert resumed["completed"] and resumed["rows_cleared"] == 15
+    assert all(ts is None for ts in fake.rows.values())
+
+def test_cleanup_stops_with_checkpoint_when_database_keeps_failing(table):
+    fake = table(expired=25, fresh=0, fail_patches=10)
+    run = ttl.run_ttl_cleanup(now=NOW)
+
+    assert not run["completed"] and run["error"]
+    assert ttl._load_checkpoint()["cutoff"] == run["cutoff"]
+    assert ttl.get_ttl_metrics()["last_run"]["error"] == run["error"]
+
+def test_cleanup_drops_cached_bundles_of_cleared_rows(table, monkeypatch):
+    from refactored.services import signed_url_cache
+    monkeypatch.setattr(signed_url_cache, "SIGNED_URL_CACHE_DIR", "")
+    monkeypatch.setattr(signed_url_cache, "_cache", signed_url_cache.OrderedDict())
+    table(expired=3, fresh=1)
+    for uid in ("e001", "f000"):
+        signed_url_cache.store_signed_bundle(uid, "owner", {"video_url": "v", "signed_created_at": NOW.isoformat()})
+
+    ttl.run_ttl_cleanup(now=NOW)
+
+    assert list(signed_url_cache._cache) == [("f000", "owner")]
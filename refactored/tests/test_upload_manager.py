@@ -0,0 +1,80 @@
+from refactored.utils import upload_manager
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+
+class FakeTusServer:
+    """첫 번째 PATCH는 절반만 받고 연결이 끊기는 TUS 서버"""
+
+    def __init__(self):
+        self.received = b""
+        self.patches = 0
+
+    def post(self, url, headers, **kwargs):
+        assert headers["Upload-Length"] == "10"
+        return FakeResponse(201, {"Location": "https://tus/upload/1"})
+
+    def patch(self, url, data, headers, **kwargs):
+        self.patches += 1
+        assert int(headers["Upload-Offset"]) == len(self.received)
+        if self.patches == 1:
+            self.received += data[:2]
+            raise ConnectionError("connection reset")
+        self.received += data
+        return FakeResponse(204, {"Upload-Offset": str(len(self.received))})
+
+    def head(self, url, headers, **kwargs):
+        return FakeResponse(200, {"Upload-Offset": str(len(self.received))})
+
+def test_resumable_upload_resumes_from_server_offset(tmp_path, monkeypatch, fake_supabase):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"0123456789")
+    server = FakeTusServer()
+    fake_supabase(server)
+    monkeypatch.setattr(upload_manager, "RESUMABLE_CHUNK_SIZE", 4)
+    monkeypatch.setattr(upload_manager, "_backoff", lambda attempt: None)
+
+    upload_manager.upload_resumable(str(path), "video.mp4", "video/mp4")
+
+    assert server.received == b"0123456789"
+
+def test_upload_artifacts_reports_per_artifact(tmp_path, monkeypatch):
+    (tmp_path / "a.mp3").write_bytes(b"a" * 100)
+    (tmp_path / "b.jpg").write_bytes(b"b" * 10)
+
+    def fake_upload(path, object_name, content_type):
+        if object_name == "b.jpg":
+            raise upload_manager.UploadError("HTTP 400")
+
+    monkeypatch.setattr(upload_manager, "upload_file", fake_upload)
+    results = upload_manager.upload_artifacts([
+        {"name": "audio", "path": str(tmp_path / "a.mp3"), "object_name": "a.mp3", "content_type": "audio/mpeg"},
+        {"name": "image", "path": str(tmp_path / "b.jpg"), "object_name": "b.jpg", "content_type": "image/jpeg"},
+    ])
+
+    assert results["audio"]["ok"] and results["audio"]["bytes"] == 100
+    assert results["audio"]["method"] == "single"
+    assert not results["image"]["ok"] and "400" in results["image"]["error"]
+
+def test_single_upload_retry_overwrites_possibly_stored_object(tmp_path, monkeypatch, fake_supabase):
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(b"abc")
+    sent = []
+
+    class Storage:
+        def post(self, url, data, headers, **kwargs):
+            sent.append(dict(headers))
+            if len(sent) == 1:
+                raise ConnectionError("response lost")  # 저장은 됐을 수도 있음
+            return FakeResponse(200)
+
+    fake_supabase(Storage())
+    monkeypatch.setattr(upload_manager, "_backoff", lambda attempt: None)
+
+    upload_manager.upload_file(str(path), "audio.mp3", "audio/mpeg")
+
+    assert "x-upsert" not in sent[0]
+    assert sent[1]["x-upsert"] == "true"
@@ -0,0 +1,208 @@
+# 📁 utils/asset_cache.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from ..config import (
+    ASSET_CACHE_DIR, ASSET_CACHE_MAX_BYTES, ASSET_CACHE_REVALIDATE_SECONDS, FETCH_DEADLINE_SECONDS
+)
+from .http_fetcher import DEFAULT_TIMEOUT, FetchError, get_http_session, iter_response_chunks
+from .logger import log
+
+# 구조: {ASSET_CACHE_DIR}/blobs/{sha256(content)}  ← 실제 파일 (같은 내용은 한 번만 저장)
+#       {ASSET_CACHE_DIR}/index/{sha256(url)}.json ← URL별 메타 (etag, last_modified, 검증 시각)
+# 메타 파일의 mtime = 마지막 사용 시각 → LRU 정리 기준
+
+_lock = threading.Lock()
+
+class AssetFetchError(FetchError):
+    """원본 다운로드 실패 + 캐시에도 없음"""
+
+def _blob_dir():
+    return os.path.join(ASSET_CACHE_DIR, "blobs")
+
+def _index_dir():
+    return os.path.join(ASSET_CACHE_DIR, "index")
+
+def _meta_path(url: str) -> str:
+    return os.path.join(_index_dir(), hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+def _load_meta(url: str):
+    try:
+        with open(_meta_path(url)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    blob_path = os.path.join(_blob_dir(), meta.get("content_hash", ""))
+    return meta if os.path.isfile(blob_path) else None
+
+def _save_meta(url: str, meta: dict):
+    path = _meta_path(url)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
+
+def get_cached_asset(url: str, max_bytes: int = None,
+                     deadline_seconds: float = FETCH_DEADLINE_SECONDS) -> str:
+    """
+    URL 자산을 캐시에서 찾아 경로 반환 (없거나 재검증 주기가 지나면 조건부 요청)
+    :raises AssetFetchError: 다운로드 실패 + 캐시 없음
+    """
+    os.makedirs(_blob_dir(), exist_ok=True)
+    os.makedirs(_index_dir(), exist_ok=True)
+
+    meta = _load_meta(url)
+    if meta and time.time() - meta["validated_at"] < ASSET_CACHE_REVALIDATE_SECONDS:
+        return _touch(url, meta)
+
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        res = get_http_session().get(url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT)
+        try:
+            if res.status_code == 304 and meta:
+                meta["validated_at"] = time.time()
+                _save_meta(url, meta)
+                return _touch(url, meta)
+
+            res.raise_for_status()
+            content_hash, size = _store_blob(res, max_bytes, time.monotonic() + deadline_seconds)
+            meta = {
+                "url": url,
+                "content_hash": content_hash,
+                "size": size,
+                "etag": res.headers.get("ETag"),
+                "last_modified": res.headers.get("Last-Modified"),
+                "validated_at": time.time(),
+            }
+        finally:
+            res.close()
+    except Exception as e:
+        if meta:
+            log(f"⚠️ 자산 재검증 실패 → 기존 캐시 사용: {url} | {e}", level="warning")
+            return _touch(url, meta)
+        raise AssetFetchError(f"Failed to download {url}: {e}") from e
+
+    _save_meta(url, meta)
+    _evict_if_needed(keep_url=url)
+    return _touch(url, meta)
+
+def link_cached_asset(url: str, dest_path: str, max_bytes: int = None,
+                      deadline_seconds: float = FETCH_DEADLINE_SECONDS) -> str:
+    """
+    캐시 파일을 작업 경로에 하드링크 (다른 파일시스템이면 복사)
+    링크라서 나중에 캐시에서 지워져도 작업 중인 파일은 그대로 남음
+    경로를 받은 뒤 링크 전에 다른 요청의 LRU 정리로 blob이 지워지면 메타를 버리고 한 번 더 받음
+    :raises AssetFetchError: 다운로드 실패 + 캐시 없음
+    """
+    for _ in range(2):
+        blob_path = get_cached_asset(url, max_bytes, deadline_seconds)
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        try:
+            _link_or_copy(blob_path, dest_path)
+            return dest_path
+        except FileNotFoundError:
+            if os.path.exists(blob_path):
+                raise  # blob은 그대로 → 작업 경로 쪽 문제
+            _drop_meta(url)
+    raise AssetFetchError(f"Cached asset for {url} was evicted while linking")
+
+def _link_or_copy(src: str, dest: str):
+    try:
+        os.link(src, dest)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(src, dest)
+
+def _drop_meta(url: str):
+    try:
+        os.remove(_meta_path(url))
+    except OSError:
+        pass
+
+def _store_blob(res, max_bytes: int = None, deadline: float = None) -> tuple:
+    """응답 본문을 청크 단위로 저장하면서 해시 계산 → (content_hash, size)"""
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=_blob_dir(), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter_response_chunks(res, max_bytes, deadline):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        content_hash = digest.hexdigest()
+        blob_path = os.path.join(_blob_dir(), content_hash)
+        if os.path.exists(blob_path):
+            os.remove(tmp_path)  # 같은 내용이 이미 있음 (다른 URL로 받은 경우 포함)
+        else:
+            os.replace(tmp_path, blob_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return content_hash, size
+
+def _touch(url: str, meta: dict) -> str:
+    try:
+        os.utime(_meta_path(url))
+    except OSError:
+        pass
+    return os.path.join(_blob_dir(), meta["content_hash"])
+
+def _evict_if_needed(keep_url: str = None):
+    """
+    총 용량이 ASSET_CACHE_MAX_BYTES를 넘으면 오래 안 쓴 URL부터 제거
+    keep_url: 방금 저장해서 곧 경로를 돌려줄 항목 (한도보다 커도 이번 호출에서는 지우지 않음)
+    """
+    keep_path = _meta_path(keep_url) if keep_url else None
+    with _lock:
+        entries = []
+        for name in os.listdir(_index_dir()):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(_index_dir(), name)
+            try:
+                with open(path) as f:
+                    meta = json.load(f)
+                entries.append((os.path.getmtime(path), path, meta))
+            except (OSError, ValueError):
+                continue
+
+        blob_sizes = {}
+        for _, _, meta in entries:
+            blob_sizes[meta["content_hash"]] = meta.get("size", 0)
+        total = sum(blob_sizes.values())
+        if total <= ASSET_CACHE_MAX_BYTES:
+            return
+
+        entries.sort(key=lambda e: e[0])
+        refs = {}
+        for _, _, meta in entries:
+            refs[meta["content_hash"]] = refs.get(meta["content_hash"], 0) + 1
+
+        for _, path, meta in entries:
+            if total <= ASSET_CACHE_MAX_BYTES:
+                break
+            if path == keep_path:
+                continue
+            os.remove(path)
+            content_hash = meta["content_hash"]
+            refs[content_hash] -= 1
+            if refs[content_hash] == 0:
+                try:
+                    os.remove(os.path.join(_blob_dir(), content_hash))
+                except OSError:
+                    pass
+                total -= blob_sizes[content_hash]
+                log(f"🧹 자산 캐시 제거: {meta.get('url')}")
@@ -0,0 +1,57 @@
+# 📁 utils/async_io.py
+import asyncio
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import httpx
+from ..config import (
+    FETCH_CONNECT_TIMEOUT, ASYNC_HTTP_MAX_CONNECTIONS, ASYNC_HTTP_MAX_KEEPALIVE, ASYNC_HTTP_TIMEOUT
+)
+
+# 프로세스당 이벤트 루프 스레드 1개 + httpx.AsyncClient 1개
+# Flask 요청 스레드는 run_async()로 코루틴을 넘기고 결과만 기다림
+# → 요청 하나가 여러 외부 API를 동시에 기다리고, 루프 하나가 모든 요청의 소켓 대기를 겹쳐서 처리
+#
+#   result = run_async(get_openmeteo_forecast_async(lat, lon, time_iso))
+#   weather, route = run_async(gather(weather_coro, route_coro))
+
+_lock = threading.Lock()
+_loop = None
+_client = None
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-io", daemon=True).start()
+            _loop = loop
+    return _loop
+
+def get_async_client() -> httpx.AsyncClient:
+    """공용 AsyncClient (이벤트 루프 스레드 안에서만 사용)"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(ASYNC_HTTP_TIMEOUT, connect=FETCH_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_HTTP_MAX_KEEPALIVE
+            ),
+        )
+    return _client
+
+def run_async(coro, timeout: float = None):
+    """
+    코루틴을 공용 루프에서 실행하고 결과 반환 (동기 코드용 진입점)
+    :raises: 코루틴 예외 그대로, timeout 초과 시 TimeoutError (코루틴은 취소)
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _ensure_loop())
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+async def gather(*coros, return_exceptions=False):
+    """asyncio.gather 그대로 (run_async 한 번으로 여러 호출을 동시에 기다릴 때)"""
+    return await asyncio.gather(*coros, return_exceptions=return_exceptions)
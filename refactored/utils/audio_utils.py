@@ -1,7 +1,6 @@
 # 📁 utils/audio_utils.py
-from pydub import AudioSegment
+from .media_probe import probe_media
 
 def get_audio_duration(audio_path):
-    """MP3 또는 오디오 파일의 길이를 초 단위로 반환"""
-    audio = AudioSegment.from_file(audio_path)
-    return round(audio.duration_seconds, 2)
+    """MP3 또는 오디오 파일의 길이를 초 단위로 반환 (헤더만 읽음, 디코딩 없음)"""
+    return round(probe_media(audio_path).duration, 2)
@@ -0,0 +1,112 @@
+# 📁 utils/http_fetcher.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from ..config import (
+    HTTP_POOL_SIZE, FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT, FETCH_DEADLINE_SECONDS
+)
+from .logger import log
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_TIMEOUT = (FETCH_CONNECT_TIMEOUT, FETCH_READ_TIMEOUT)
+
+class FetchError(Exception):
+    """다운로드 실패 (상태코드, 크기 초과, 데드라인 초과 등)"""
+
+    def __init__(self, message: str, name: str = None):
+        super().__init__(message)
+        self.name = name
+
+# 🔁 keep-alive 커넥션 풀을 프로세스 전체가 공유
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+def get_http_session() -> requests.Session:
+    return _session
+
+def iter_response_chunks(res, max_bytes: int = None, deadline: float = None):
+    """
+    응답 본문을 청크 단위로 yield (전체를 메모리에 올리지 않음)
+    :param max_bytes: 초과하면 FetchError
+    :param deadline: time.monotonic() 기준 마감 시각, 지나면 FetchError
+    """
+    length = res.headers.get("Content-Length")
+    if max_bytes and length and length.isdigit() and int(length) > max_bytes:
+        raise FetchError(f"Asset too large: {length} > {max_bytes} bytes")
+
+    received = 0
+    for chunk in res.iter_content(chunk_size=CHUNK_SIZE):
+        if not chunk:
+            continue
+        received += len(chunk)
+        if max_bytes and received > max_bytes:
+            raise FetchError(f"Asset too large: > {max_bytes} bytes")
+        if deadline and time.monotonic() > deadline:
+            raise FetchError("Download deadline exceeded")
+        yield chunk
+
+def fetch_to_file(url: str, dest_path: str, max_bytes: int = None,
+                  deadline_seconds: float = FETCH_DEADLINE_SECONDS) -> str:
+    """
+    URL → 파일 스트리밍 저장 (실패 시 부분 파일 삭제)
+    :raises FetchError
+    """
+    deadline = time.monotonic() + deadline_seconds
+    try:
+        with _session.get(url, stream=True, timeout=DEFAULT_TIMEOUT) as res:
+            if res.status_code != 200:
+                raise FetchError(f"HTTP {res.status_code} for {url}")
+            with open(dest_path, "wb") as f:
+                for chunk in iter_response_chunks(res, max_bytes, deadline):
+                    f.write(chunk)
+    except requests.RequestException as e:
+        _remove_quietly(dest_path)
+        raise FetchError(f"Failed to download {url}: {e}") from e
+    except FetchError:
+        _remove_quietly(dest_path)
+        raise
+    return dest_path
+
+def fetch_concurrently(tasks: dict) -> dict:
+    """
+    여러 다운로드를 동시에 실행
+    :param tasks: 이름 → 인자 없는 함수 (경로 반환)
+    :return: 이름 → {"path", "bytes", "seconds"}
+    :raises FetchError: 하나라도 실패하면 (name에 실패한 자산 이름)
+    """
+    def timed(name, task):
+        started = time.monotonic()
+        path = task()
+        return {
+            "path": path,
+            "bytes": os.path.getsize(path),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    with ThreadPoolExecutor(max_workers=len(tasks) or 1, thread_name_prefix="fetch") as pool:
+        futures = {name: pool.submit(timed, name, task) for name, task in tasks.items()}
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except FetchError as e:
+            e.name = name
+            raise
+        except Exception as e:
+            raise FetchError(str(e), name=name) from e
+
+    log("⏬ 입력 다운로드: " + ", ".join(
+        f"{name}={r['bytes']}B/{r['seconds']}s" for name, r in results.items()
+    ))
+    return results
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,124 @@
+# 📁 utils/janitor.py
+import os
+import shutil
+import threading
+import time
+from ..config import (
+    UPLOAD_FOLDER, OUTPUT_FOLDER, JANITOR_MAX_AGE_SECONDS, JANITOR_MIN_AGE_SECONDS,
+    JANITOR_HIGH_WATER, JANITOR_LOW_WATER
+)
+from .logger import log
+from .scratch import JOB_PREFIX, dir_size, is_active, scratch_root
+
+# 로컬 디스크 정리 (호스트별 작업이라 리더 선출 대상 아님)
+# 대상: 작업 임시 디렉터리 잔여물(프로세스가 죽어 finally가 못 돈 경우) + uploads/ outputs/의 예전 산출물
+# 1) 나이 기준: JANITOR_MAX_AGE_SECONDS보다 오래된 항목 삭제
+# 2) 고수위: 디스크 사용률이 JANITOR_HIGH_WATER를 넘으면 LOW_WATER까지 오래된 것부터 삭제
+#    (JANITOR_MIN_AGE_SECONDS보다 최근 항목과 이 프로세스의 진행 중 작업은 제외,
+#     다른 워커의 진행 중 작업은 scratch.touch_active_dirs()로 mtime이 계속 갱신돼서 "최근"으로 보임)
+
+_lock = threading.Lock()
+_metrics = {"runs": 0, "files_removed_total": 0, "bytes_reclaimed_total": 0, "last_run": None}
+
+def _candidates():
+    """(mtime, 경로, 크기, 디렉터리 여부) 목록"""
+    entries = []
+    root = scratch_root()
+    for folder in (root, UPLOAD_FOLDER, OUTPUT_FOLDER):
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(folder, name)
+            is_job_dir = folder == root and name.startswith(JOB_PREFIX)
+            if name.startswith(".") or is_active(path):
+                continue
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if is_job_dir and os.path.isdir(path):
+                entries.append((st.st_mtime, path, dir_size(path), True))
+            elif os.path.isfile(path):
+                entries.append((st.st_mtime, path, st.st_size, False))
+    return sorted(entries)
+
+def _remove(path, is_dir) -> bool:
+    try:
+        if is_dir:
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False  # 다른 워커가 먼저 정리
+    except OSError as e:
+        log(f"⚠️ janitor 삭제 실패: {path} | {e}", level="warning")
+        return False
+
+def _usage(path) -> float:
+    usage = shutil.disk_usage(path)
+    return usage.used / usage.total if usage.total else 0.0
+
+def run_janitor(now=None) -> dict:
+    """나이 기준 + 고수위 정리 한 번 실행 → 이번 실행 지표"""
+    if not _lock.acquire(blocking=False):
+        return {"skipped": True}
+    try:
+        return _run(now or time.time())
+    finally:
+        _lock.release()
+
+def _run(now) -> dict:
+    started = time.monotonic()
+    run = {"files_removed": 0, "bytes_reclaimed": 0, "by_age": 0, "by_pressure": 0}
+    remaining = []
+
+    for mtime, path, size, is_dir in _candidates():
+        if now - mtime > JANITOR_MAX_AGE_SECONDS:
+            if _remove(path, is_dir):
+                run["files_removed"] += 1
+                run["bytes_reclaimed"] += size
+                run["by_age"] += 1
+        else:
+            remaining.append((mtime, path, size, is_dir))
+
+    # 고수위: 파일시스템별 사용률 확인 (tmpfs와 디스크가 다를 수 있음)
+    # 한 번 고수위를 넘은 파일시스템은 저수위까지 내려갈 때까지 계속 정리
+    usage_before = {}
+    pressured = set()
+    for mtime, path, size, is_dir in remaining:
+        if now - mtime < JANITOR_MIN_AGE_SECONDS:
+            break  # 오래된 순 정렬 → 이후는 모두 더 최근
+        folder = os.path.dirname(path)
+        usage = _usage(folder)
+        usage_before.setdefault(folder, round(usage, 3))
+        if usage < (JANITOR_LOW_WATER if folder in pressured else JANITOR_HIGH_WATER):
+            continue
+        pressured.add(folder)
+        if _remove(path, is_dir):
+            run["files_removed"] += 1
+            run["bytes_reclaimed"] += size
+            run["by_pressure"] += 1
+
+    run["disk_usage_before"] = usage_before
+    run["duration"] = round(time.monotonic() - started, 3)
+
+    _metrics["runs"] += 1
+    _metrics["files_removed_total"] += run["files_removed"]
+    _metrics["bytes_reclaimed_total"] += run["bytes_reclaimed"]
+    _metrics["last_run"] = run
+    if run["files_removed"]:
+        log(f"🧽 janitor: {run['files_removed']}개, {run['bytes_reclaimed'] / 1024 / 1024:.1f}MB 회수 "
+            f"(나이 {run['by_age']} / 고수위 {run['by_pressure']})")
+    return run
+
+def get_janitor_metrics() -> dict:
+    return {
+        "runs": _metrics["runs"],
+        "files_removed_total": _metrics["files_removed_total"],
+        "bytes_reclaimed_total": _metrics["bytes_reclaimed_total"],
+        "last_run": dict(_metrics["last_run"]) if _metrics["last_run"] else None,
+        "scratch_root": scratch_root()
+    }
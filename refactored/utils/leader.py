@@ -0,0 +1,144 @@
+# 📁 utils/leader.py
+import fcntl
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+import requests
+from ..config import (
+    LEADER_LOCK_FILE, LEADER_LEASE_TABLE, LEADER_LEASE_NAME,
+    LEADER_LEASE_SECONDS
+)
+from .logger import log
+from .supabase_client import get_supabase_client
+
+# 백그라운드 작업(TTL 정리 등)은 전체에서 한 프로세스만 실행
+# 1단계 (같은 호스트): LEADER_LOCK_FILE에 flock → 워커 중 하나만 통과, 프로세스가 죽으면 OS가 락 해제
+# 2단계 (호스트 간): {LEADER_LEASE_TABLE} 행 임대 (name, holder, expires_at)
+#   - 만료됐거나 내가 가진 임대만 PATCH로 갱신 → 갱신된 행이 돌아오면 리더
+#   - 행이 없으면 INSERT (중복 무시) 로 최초 생성
+#   - 리더가 죽으면 heartbeat가 끊겨 expires_at이 지나고, 다음 후보가 가져감
+# 임대 테이블이 없으면 (404) 파일 락만으로 동작 (단일 호스트 배포)
+#
+# 필요한 테이블:
+#   create table scheduler_leases (name text primary key, holder text not null, expires_at timestamptz not null);
+
+HOLDER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_lock = threading.Lock()
+_lock_fd = None
+_is_leader = False
+_lease_available = bool(LEADER_LEASE_TABLE)
+
+def _acquire_file_lock() -> bool:
+    global _lock_fd
+    if _lock_fd is not None:
+        return True
+    fd = os.open(LEADER_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    os.ftruncate(fd, 0)
+    os.write(fd, HOLDER_ID.encode())
+    _lock_fd = fd
+    return True
+
+def _release_file_lock():
+    global _lock_fd
+    if _lock_fd is None:
+        return
+    try:
+        fcntl.flock(_lock_fd, fcntl.LOCK_UN)
+    finally:
+        os.close(_lock_fd)
+        _lock_fd = None
+
+def _renew_lease(now: datetime) -> bool:
+    """만료됐거나 내가 가진 임대를 갱신 (없으면 생성) → 임대 보유 여부"""
+    global _lease_available
+    client = get_supabase_client()
+    body = {
+        "name": LEADER_LEASE_NAME,
+        "holder": HOLDER_ID,
+        "expires_at": (now + timedelta(seconds=LEADER_LEASE_SECONDS)).isoformat()
+    }
+    res = client.rest(
+        "PATCH", LEADER_LEASE_TABLE, headers={"Prefer": "return=representation"}, json=body, retries=0,
+        params={
+            "name": f"eq.{LEADER_LEASE_NAME}",
+            "or": f'(holder.eq."{HOLDER_ID}",expires_at.lt."{now.isoformat()}")'
+        }
+    )
+    if res.status_code == 404:
+        _lease_available = False
+        log(f"⚠️ 임대 테이블 {LEADER_LEASE_TABLE} 없음 → 파일 락만으로 리더 선출", level="warning")
+        return True
+    if res.status_code != 200:
+        raise requests.HTTPError(f"lease patch {res.status_code}: {res.text[:200]}")
+    if res.json():
+        return True
+
+    # 행이 아예 없을 때만 생성 (다른 후보가 먼저 만들었으면 무시됨 → 빈 응답)
+    res = client.rest(
+        "POST", LEADER_LEASE_TABLE, headers={"Prefer": "resolution=ignore-duplicates,return=representation"},
+        params={"on_conflict": "name"}, json=body, retries=0
+    )
+    if res.status_code not in (200, 201):
+        raise requests.HTTPError(f"lease insert {res.status_code}: {res.text[:200]}")
+    return bool(res.json())
+
+def _release_lease():
+    get_supabase_client().rest(
+        "PATCH", LEADER_LEASE_TABLE, headers={"Prefer": "return=minimal"}, retries=0,
+        params={"name": f"eq.{LEADER_LEASE_NAME}", "holder": f"eq.{HOLDER_ID}"},
+        json={"expires_at": datetime.now(timezone.utc).isoformat()}
+    )
+
+def heartbeat() -> bool:
+    """
+    리더십 확보/유지 시도 (스케줄러가 LEADER_HEARTBEAT_SECONDS마다 호출) → 현재 리더 여부
+    DB 오류 시에는 안전하게 리더십 포기 (두 리더보다 잠깐 리더 없음이 낫다)
+    """
+    global _is_leader
+    with _lock:
+        was_leader = _is_leader
+        leader = _acquire_file_lock()
+        if leader and _lease_available:
+            try:
+                leader = _renew_lease(datetime.now(timezone.utc))
+            except requests.RequestException as e:
+                log(f"⚠️ 리더 임대 갱신 실패 → 리더십 보류: {e}", level="warning")
+                leader = False
+        _is_leader = leader
+
+    if leader != was_leader:
+        log(f"👑 리더 {'획득' if leader else '상실'}: {HOLDER_ID}")
+    return leader
+
+def is_leader() -> bool:
+    return _is_leader
+
+def resign():
+    """종료 시 호출 → 임대 즉시 만료 + 파일 락 해제 (다음 후보가 heartbeat 한 번 만에 인계)"""
+    global _is_leader
+    with _lock:
+        if _is_leader and _lease_available:
+            try:
+                _release_lease()
+            except requests.RequestException:
+                pass
+        _release_file_lock()
+        _is_leader = False
+
+def leader_only(fn):
+    """리더가 아닐 때는 조용히 건너뛰는 스케줄러 작업 데코레이터"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _is_leader:
+            return None
+        return fn(*args, **kwargs)
+    return wrapper
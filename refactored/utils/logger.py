@@ -1,25 +1,104 @@
 # utils/logger.py
 
+import atexit
+import contextvars
+import json
 import logging
+import queue
+import sys
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from ..config import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE
+
+# 로그 파이프라인
+# 요청/워커 스레드: 레코드에 job_id만 붙여서 큐에 넣음 (포맷/출력 없음 → 메시지 길이와 무관한 비용)
+# 리스너 스레드: JSON 한 줄로 포맷해서 stdout에 씀
+# 큐가 가득 차면 기다리지 않고 버린 뒤 개수만 셈 (get_log_stats)
 
-# 로그 포맷 설정
 FORMAT = "[%(asctime)s] %(levelname)s: %(message)s"
-logging.basicConfig(level=logging.INFO, format=FORMAT)
+
+# 현재 처리 중인 렌더 작업 ID (render_queue 워커 / 동기 렌더에서 bind_job_id로 설정)
+job_id_var = contextvars.ContextVar("job_id", default=None)
+
+_dropped = 0
+
+class JsonFormatter(logging.Formatter):
+    """{"ts", "level", "logger", "msg", "job_id", ...fields} 한 줄"""
+
+    def format(self, record):
+        data = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        job_id = getattr(record, "job_id", None)
+        if job_id:
+            data["job_id"] = job_id
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    기본 QueueHandler는 넣기 전에 메시지를 포맷함 → 포맷은 리스너 스레드로 미루고
+    contextvar(job_id)만 호출 스레드에서 잡아둠, 큐가 가득 차면 버림
+    """
+
+    def prepare(self, record):
+        if not hasattr(record, "job_id"):
+            record.job_id = job_id_var.get()
+        return record
+
+    def enqueue(self, record):
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped += 1
+
+def _setup():
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(FORMAT))
+
+    root = logging.getLogger()
+    root.handlers = [_ContextQueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+
+    listener = QueueListener(log_queue, output, respect_handler_level=False)
+    listener.start()
+    atexit.register(listener.stop)  # 종료 시 큐에 남은 레코드까지 출력
+    return listener
+
+_listener = _setup()
+
+@contextmanager
+def bind_job_id(job_id):
+    """이 블록 안(같은 스레드/컨텍스트)의 로그 레코드에 job_id 부착"""
+    token = job_id_var.set(job_id)
+    try:
+        yield
+    finally:
+        job_id_var.reset(token)
+
+def get_log_stats() -> dict:
+    return {"queued": _listener.queue.qsize(), "dropped": _dropped}
+
+_LEVELS = {
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "debug": logging.DEBUG,
+}
 
 # 공통 log() 함수 정의
-def log(msg, level="info"):
+def log(msg, level="info", **fields):
     """
     사용 예:
     log("시작됨")
     log("오류 발생", level="error")
+    log("렌더 완료", stage="ffmpeg", seconds=3.2)  → JSON 레코드의 필드로
     """
-    if level == "info":
-        logging.info(msg)
-    elif level == "warning":
-        logging.warning(msg)
-    elif level == "error":
-        logging.error(msg)
-    elif level == "debug":
-        logging.debug(msg)
-    else:
-        logging.info(msg)  # fallback
+    logging.log(_LEVELS.get(level, logging.INFO), msg, extra={"fields": fields} if fields else None)
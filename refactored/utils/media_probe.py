@@ -0,0 +1,217 @@
+# 📁 utils/media_probe.py
+import hashlib
+import json
+import os
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from ..config import FFPROBE_BIN
+
+# 샘플 디코딩 없이 컨테이너/프레임 헤더만 읽어서 길이·샘플레이트·채널·코덱 확인
+# 1순위: ffprobe 1회 호출, ffprobe가 없으면 MP3 프레임 헤더(Xing/Info/VBRI 또는 CBR) 직접 파싱
+
+class MediaProbeError(Exception):
+    pass
+
+@dataclass(frozen=True)
+class MediaInfo:
+    duration: float
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    codec: Optional[str] = None
+
+_CACHE_SIZE = 256
+_cache = OrderedDict()  # 콘텐츠 해시 → MediaInfo (LRU)
+_lock = threading.Lock()
+
+def probe_media(path: str) -> MediaInfo:
+    """
+    오디오 파일 메타데이터 조회 (콘텐츠 해시 기준 메모이즈)
+    :raises MediaProbeError: 읽을 수 있는 헤더가 없을 때
+    """
+    key = file_content_hash(path)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    try:
+        info = _probe_with_ffprobe(path)
+    except (OSError, ValueError, subprocess.TimeoutExpired, MediaProbeError):
+        # ffprobe 없음 / 시간 초과 / 이상한 출력(JSON, duration) → 헤더 직접 파싱
+        info = _probe_mp3_headers(path)
+
+    with _lock:
+        _cache[key] = info
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
+
+def file_content_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _probe_with_ffprobe(path: str) -> MediaInfo:
+    command = [
+        FFPROBE_BIN, "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "format=duration:stream=codec_name,sample_rate,channels,duration",
+        "-of", "json", path
+    ]
+    result = subprocess.run(command, capture_output=True, timeout=30)
+    if result.returncode != 0:
+        raise MediaProbeError(result.stderr.decode(errors="replace").strip())
+
+    data = json.loads(result.stdout or b"{}")
+    stream = (data.get("streams") or [{}])[0]
+    duration = data.get("format", {}).get("duration") or stream.get("duration")
+    if duration in (None, "N/A"):
+        raise MediaProbeError("ffprobe returned no duration")
+
+    return MediaInfo(
+        duration=float(duration),
+        sample_rate=int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        channels=stream.get("channels"),
+        codec=stream.get("codec_name"),
+    )
+
+# ───────────── MP3 헤더 파싱 (ffprobe 없는 환경용) ─────────────
+
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 25: [11025, 12000, 8000]}
+_VERSIONS = {3: 1, 2: 2, 0: 25}  # 헤더 비트 → MPEG 1 / 2 / 2.5
+_LAYERS = {3: 1, 2: 2, 1: 3}
+
+def _parse_frame_header(header: bytes):
+    b1, b2, b3 = header[1], header[2], header[3]
+    if header[0] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = _VERSIONS.get((b1 >> 3) & 0x03)
+    layer = _LAYERS.get((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if not version or not layer or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _BITRATES[(min(version, 2), layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 2 or version == 1:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channels": 1 if (b3 >> 6) == 3 else 2,
+        "samples_per_frame": samples_per_frame,
+    }
+
+def _probe_mp3_headers(path: str) -> MediaInfo:
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(10)
+        audio_start = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+
+        f.seek(audio_start)
+        buf = f.read(64 * 1024)
+
+        f.seek(max(0, file_size - 128))
+        audio_end = file_size - 128 if f.read(3) == b"TAG" else file_size
+
+    # 첫 번째 유효 프레임 헤더 탐색
+    for offset in range(len(buf) - 4):
+        frame = _parse_frame_header(buf[offset:offset + 4])
+        if frame:
+            break
+    else:
+        raise MediaProbeError(f"No MPEG audio frame header found in {path}")
+
+    frames = _vbr_frame_count(buf[offset:], frame)
+    if frames:
+        duration = frames * frame["samples_per_frame"] / frame["sample_rate"]
+    else:
+        # CBR: 오디오 바이트 수 / 비트레이트
+        duration = (audio_end - audio_start - offset) * 8 / frame["bitrate"]
+
+    return MediaInfo(
+        duration=duration,
+        sample_rate=frame["sample_rate"],
+        channels=frame["channels"],
+        codec="mp3" if frame["layer"] == 3 else f"mp{frame['layer']}",
+    )
+
+def _u32(data: bytes, offset: int) -> int:
+    if len(data) < offset + 4:
+        raise MediaProbeError("Truncated VBR header")
+    return struct.unpack_from(">I", data, offset)[0]
+
+def _vbr_frame_count(data: bytes, frame: dict):
+    """
+    Xing/Info 또는 VBRI 헤더의 전체 프레임 수 (없으면 None)
+    :raises MediaProbeError: 태그는 있는데 필드가 잘려 있을 때
+    """
+    if frame["version"] == 1:
+        side_info = 17 if frame["channels"] == 1 else 32
+    else:
+        side_info = 9 if frame["channels"] == 1 else 17
+
+    xing = 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        if _u32(data, xing + 4) & 0x01:
+            return _u32(data, xing + 8)
+
+    if data[36:40] == b"VBRI":
+        return _u32(data, 50)
+    return None
+
+# ───────────── 이미지 크기 (JPEG SOF / PNG IHDR 헤더) ─────────────
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def probe_image_size(path: str):
+    """JPEG/PNG 헤더에서 (width, height) 반환, 알 수 없는 형식이거나 잘린 파일이면 None"""
+    with open(path, "rb") as f:
+        head = f.read(24)
+        if head[:8] == b"\x89PNG\r\n\x1a\n":
+            return struct.unpack(">II", head[16:24]) if len(head) == 24 else None
+
+        if head[:2] != b"\xff\xd8":
+            return None
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                continue  # 길이 없는 마커
+            field = f.read(2)
+            if len(field) < 2:
+                return None
+            length = struct.unpack(">H", field)[0]
+            if marker[1] in _JPEG_SOF_MARKERS:
+                sof = f.read(5)
+                if len(sof) < 5:
+                    return None
+                height, width = struct.unpack(">xHH", sof)
+                return width, height
+            f.seek(length - 2, os.SEEK_CUR)
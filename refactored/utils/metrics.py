@@ -0,0 +1,122 @@
+# 📁 utils/metrics.py
+import contextvars
+import time
+from contextlib import contextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from ..content_type_rules import get_required_fields_by_type
+
+# Prometheus 지표 (/metrics)
+# - shorts_stage_seconds: 렌더/처리 파이프라인 단계별 소요 시간 (p95가 어디서 생기는지)
+# - shorts_external_api_seconds: 외부 API 호출 (Open-Meteo, 네이버, OpenAI, Supabase)
+# - shorts_requests_total: 요청 결과 카운터
+# template_id / content_type은 요청 단위로 metric_labels()에 한 번 묶어두면 하위 단계가 같이 씀
+# gunicorn --workers=1 이라 기본 레지스트리(프로세스 메모리) 그대로 사용
+
+_STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "shorts_stage_seconds", "Pipeline stage latency",
+    ["stage", "template_id", "content_type", "outcome"], buckets=_STAGE_BUCKETS
+)
+EXTERNAL_API_SECONDS = Histogram(
+    "shorts_external_api_seconds", "External API call latency",
+    ["api", "outcome"], buckets=_STAGE_BUCKETS
+)
+REQUESTS_TOTAL = Counter(
+    "shorts_requests_total", "Requests by endpoint and outcome",
+    ["endpoint", "template_id", "content_type", "outcome"]
+)
+
+_labels = contextvars.ContextVar("metric_labels", default={})
+
+class Span:
+    """stage()/api_call() 안에서 결과를 바꿀 때: span.fail() 또는 span.outcome = "..." """
+
+    def __init__(self):
+        self.outcome = "ok"
+
+    def fail(self, outcome: str = "error"):
+        self.outcome = outcome
+
+def _content_type_label(content_type) -> str:
+    # GPT가 만든 값이라 그대로 쓰면 라벨 종류가 끝없이 늘어남 → 규칙에 있는 유형만
+    if not content_type:
+        return "none"
+    return content_type if get_required_fields_by_type(content_type) else "other"
+
+def _template_label(template_id) -> str:
+    # 요청에서 온 값 그대로 쓰면 누구나 시리즈를 무한히 만들 수 있음 → 레지스트리에 있는 템플릿만
+    # (template_registry → supabase_client → metrics 순환 import라 여기서 import)
+    from ..services.template_registry import is_known_template
+    if not template_id:
+        return "none"
+    return str(template_id) if is_known_template(template_id) else "unknown"
+
+def _resolve(labels: dict) -> dict:
+    merged = {**_labels.get(), **{k: v for k, v in labels.items() if v is not None}}
+    return {
+        "template_id": _template_label(merged.get("template_id")),
+        "content_type": _content_type_label(merged.get("content_type")),
+    }
+
+def outcome_for_status(status_code: int) -> str:
+    if status_code < 400:
+        return "ok"
+    if status_code == 503:
+        return "rejected"
+    return "client_error" if status_code < 500 else "error"
+
+@contextmanager
+def metric_labels(**labels):
+    """현재 요청/작업의 template_id, content_type (같은 스레드의 하위 stage()가 상속)"""
+    token = _labels.set({**_labels.get(), **{k: v for k, v in labels.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+def observe_stage(stage_name: str, seconds: float, outcome: str = "ok", **labels):
+    STAGE_SECONDS.labels(stage=stage_name, outcome=outcome, **_resolve(labels)).observe(seconds)
+
+@contextmanager
+def stage(stage_name: str, **labels):
+    """
+    사용 예:
+    with stage("audio_probe") as span:
+        ...
+        if 실패:
+            span.fail()
+    예외가 나가면 outcome=error
+    """
+    span = Span()
+    started = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span.outcome = "error"
+        raise
+    finally:
+        observe_stage(stage_name, time.perf_counter() - started, span.outcome, **labels)
+
+def observe_api(api: str, seconds: float, outcome: str = "ok"):
+    EXTERNAL_API_SECONDS.labels(api=api, outcome=outcome).observe(seconds)
+
+@contextmanager
+def api_call(api: str):
+    """외부 API 1회 호출 시간 (async 함수 안에서도 with로 그대로 사용)"""
+    span = Span()
+    started = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span.outcome = "error"
+        raise
+    finally:
+        observe_api(api, time.perf_counter() - started, span.outcome)
+
+def count_request(endpoint: str, status_code: int, **labels):
+    REQUESTS_TOTAL.labels(endpoint=endpoint, outcome=outcome_for_status(status_code), **_resolve(labels)).inc()
+
+def metrics_response():
+    """→ (본문, Content-Type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,17 +1,16 @@
 import requests
 import os
 from dotenv import load_dotenv
+from .async_io import get_async_client
+from .logger import log
 load_dotenv()
 
 NAVER_CLIENT_ID = os.getenv("NAVER_API_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_API_CLIENT_SECRET")
 
-def reverse_geocode_naver(lat: float, lon: float, client_id: str = NAVER_CLIENT_ID, client_secret: str = NAVER_CLIENT_SECRET) -> dict:
-    """
-    네이버 지도 API로 좌표를 주소로 변환
-    :return: {'address': '서울특별시 중구 세종대로 110'} 같은 형태
-    """
-    url = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
+NAVER_REVERSE_GEOCODE_URL = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
+
+def _geocode_request(lat, lon, client_id, client_secret):
     params = {
         "coords": f"{lon},{lat}",
         "orders": "roadaddr,admaddr",
@@ -21,34 +20,56 @@ def reverse_geocode_naver(lat: float, lon: float, client_id: str = NAVER_CLIENT_
         "X-NCP-APIGW-API-KEY-ID": client_id,
         "X-NCP-APIGW-API-KEY": client_secret
     }
+    return params, headers
+
+def _extract_address(data: dict) -> dict:
+    # ✅ 주소 텍스트 추출
+    results = data.get("results", [])
+    if not results:
+        return {"address": "주소 없음"}
+
+    for item in results:
+        if item["name"] == "roadaddr" and "roadAddress" in item:
+            return {"address": item["roadAddress"]["address"]}
+
+    for item in results:
+        if item["name"] == "admaddr" and "region" in item:
+            region = item["region"]
+            address = " ".join([
+                region["area1"]["name"],
+                region["area2"]["name"],
+                region["area3"]["name"]
+            ])
+            return {"address": address}
+
+    return {"address": "주소 추출 실패"}
+
+def reverse_geocode_naver(lat: float, lon: float, client_id: str = NAVER_CLIENT_ID, client_secret: str = NAVER_CLIENT_SECRET) -> dict:
+    """
+    네이버 지도 API로 좌표를 주소로 변환
+    :return: {'address': '서울특별시 중구 세종대로 110'} 같은 형태
+    """
+    params, headers = _geocode_request(lat, lon, client_id, client_secret)
 
     try:
-        res = requests.get(url, headers=headers, params=params)
+        res = requests.get(NAVER_REVERSE_GEOCODE_URL, headers=headers, params=params)
         res.raise_for_status()
-        data = res.json()
+        return _extract_address(res.json())
 
-        # ✅ 주소 텍스트 추출
-        results = data.get("results", [])
-        if not results:
-            return {"address": "주소 없음"}
-
-        for item in results:
-            if item["name"] == "roadaddr" and "roadAddress" in item:
-                return {"address": item["roadAddress"]["address"]}
+    except Exception as e:
+        log(f"❌ 네이버 역지오코드 실패: {e}", level="error")
+        return {"address": "오류 발생"}
 
-        for item in results:
-            if item["name"] == "admaddr" and "region" in item:
-                region = item["region"]
-                address = " ".join([
-                    region["area1"]["name"],
-                    region["area2"]["name"],
-                    region["area3"]["name"]
-                ])
-                return {"address": address}
+async def reverse_geocode_naver_async(lat: float, lon: float, client_id: str = NAVER_CLIENT_ID,
+                                      client_secret: str = NAVER_CLIENT_SECRET) -> dict:
+    """reverse_geocode_naver의 비동기 버전 (공용 AsyncClient)"""
+    params, headers = _geocode_request(lat, lon, client_id, client_secret)
 
-        return {"address": "주소 추출 실패"}
+    try:
+        res = await get_async_client().get(NAVER_REVERSE_GEOCODE_URL, headers=headers, params=params)
+        res.raise_for_status()
+        return _extract_address(res.json())
 
     except Exception as e:
-        print(f"❌ 네이버 역지오코드 실패: {e}")
+        log(f"❌ 네이버 역지오코드 실패: {e}", level="error")
         return {"address": "오류 발생"}
-}
@@ -1,10 +1,38 @@
 import requests
 import os
+from .async_io import get_async_client
+from .logger import log
 
 # 🌱 .env에서 환경변수 불러오기 (Render에서 자동 적용됨)
 NAVER_CLIENT_ID = os.getenv("NAVER_API_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_API_CLIENT_SECRET")
 
+NAVER_DRIVING_URL = "https://naveropenapi.apigw.ntruss.com/map-direction/v1/driving"
+
+def _driving_request(start_lat, start_lon, end_lat, end_lon, client_id, client_secret):
+    params = {
+        "start": f"{start_lon},{start_lat}",  # ⚠️ 경도, 위도 순서
+        "goal": f"{end_lon},{end_lat}",
+        "option": "trafast"
+    }
+    headers = {
+        "X-NCP-APIGW-API-KEY-ID": client_id,
+        "X-NCP-APIGW-API-KEY": client_secret
+    }
+    return params, headers
+
+def _driving_summary(data: dict) -> dict:
+    route = data["route"].get("trafast")
+    if not route:
+        return {"error": "경로 없음"}
+
+    summary = route[0]["summary"]
+    return {
+        "distance_km": round(summary["distance"] / 1000, 2),
+        "duration_min": round(summary["duration"] / 60000),
+        "status": "ok"
+    }
+
 def get_naver_driving_info(
     start_lat: float,
     start_lon: float,
@@ -17,34 +45,33 @@ def get_naver_driving_info(
     네이버 길찾기 API 호출 → 거리/시간 추정
     환경변수 기반 client_id, client_secret 자동 연결됨
     """
-    url = "https://naveropenapi.apigw.ntruss.com/map-direction/v1/driving"
-    params = {
-        "start": f"{start_lon},{start_lat}",  # ⚠️ 경도, 위도 순서
-        "goal": f"{end_lon},{end_lat}",
-        "option": "trafast"
-    }
-    headers = {
-        "X-NCP-APIGW-API-KEY-ID": client_id,
-        "X-NCP-APIGW-API-KEY": client_secret
-    }
+    params, headers = _driving_request(start_lat, start_lon, end_lat, end_lon, client_id, client_secret)
 
     try:
-        res = requests.get(url, headers=headers, params=params)
+        res = requests.get(NAVER_DRIVING_URL, headers=headers, params=params)
         res.raise_for_status()
-        data = res.json()
+        return _driving_summary(res.json())
 
-        route = data["route"].get("trafast")
-        if not route:
-            return {"error": "경로 없음"}
+    except Exception as e:
+        log(f"❌ 네이버 길찾기 API 오류: {e}", level="error")
+        return {"error": str(e), "status": "fail"}
+
+async def get_naver_driving_info_async(
+    start_lat: float,
+    start_lon: float,
+    end_lat: float,
+    end_lon: float,
+    client_id: str = NAVER_CLIENT_ID,
+    client_secret: str = NAVER_CLIENT_SECRET
+) -> dict:
+    """get_naver_driving_info의 비동기 버전 (공용 AsyncClient)"""
+    params, headers = _driving_request(start_lat, start_lon, end_lat, end_lon, client_id, client_secret)
 
-        summary = route[0]["summary"]
-        return {
-            "distance_km": round(summary["distance"] / 1000, 2),
-            "duration_min": round(summary["duration"] / 60000),
-            "status": "ok"
-        }
+    try:
+        res = await get_async_client().get(NAVER_DRIVING_URL, headers=headers, params=params)
+        res.raise_for_status()
+        return _driving_summary(res.json())
 
     except Exception as e:
-        print(f"❌ 네이버 길찾기 API 오류: {e}")
+        log(f"❌ 네이버 길찾기 API 오류: {e}", level="error")
         return {"error": str(e), "status": "fail"}
-
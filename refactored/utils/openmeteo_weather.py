@@ -2,6 +2,39 @@
 
 import requests
 from dateutil import parser
+from .async_io import get_async_client
+from .logger import log
+
+def _forecast_url(lat: float, lon: float, timezone: str) -> str:
+    return (
+        f"https://api.open-meteo.com/v1/forecast?"
+        f"latitude={lat}&longitude={lon}"
+        f"&hourly=temperature_2m,humidity_2m,windspeed_10m"
+        f"&timezone={timezone}"
+    )
+
+def _closest_forecast(data: dict, target_iso: str) -> dict:
+    hourly = data.get("hourly", {})
+    times = hourly.get("time", [])
+    temps = hourly.get("temperature_2m", [])
+    humids = hourly.get("humidity_2m", [])
+    winds = hourly.get("windspeed_10m", [])
+
+    if not times or not temps or not humids or not winds:
+        return {"error": "날씨 데이터 누락"}
+
+    target_dt = parser.isoparse(target_iso)
+    closest_index = min(
+        range(len(times)),
+        key=lambda i: abs(parser.isoparse(times[i]) - target_dt)
+    )
+
+    return {
+        "temperature": temps[closest_index],
+        "humidity": humids[closest_index],
+        "windspeed": winds[closest_index],
+        "time": times[closest_index]
+    }
 
 def get_openmeteo_forecast(lat: float, lon: float, target_iso: str, timezone: str = "Asia/Seoul") -> dict:
     """
@@ -15,39 +48,23 @@ def get_openmeteo_forecast(lat: float, lon: float, target_iso: str, timezone: st
         "time": "2025-04-17T16:00"
     }
     """
-    url = (
-        f"https://api.open-meteo.com/v1/forecast?"
-        f"latitude={lat}&longitude={lon}"
-        f"&hourly=temperature_2m,humidity_2m,windspeed_10m"
-        f"&timezone={timezone}"
-    )
+    try:
+        res = requests.get(_forecast_url(lat, lon, timezone))
+        res.raise_for_status()
+        return _closest_forecast(res.json(), target_iso)
+
+    except Exception as e:
+        log(f"❌ Open-Meteo forecast API 실패: {e}", level="error")
+        return {"error": str(e)}
 
+async def get_openmeteo_forecast_async(lat: float, lon: float, target_iso: str,
+                                       timezone: str = "Asia/Seoul") -> dict:
+    """get_openmeteo_forecast의 비동기 버전 (공용 AsyncClient)"""
     try:
-        res = requests.get(url)
+        res = await get_async_client().get(_forecast_url(lat, lon, timezone))
         res.raise_for_status()
-        data = res.json()
-        hourly = data.get("hourly", {})
-        times = hourly.get("time", [])
-        temps = hourly.get("temperature_2m", [])
-        humids = hourly.get("humidity_2m", [])
-        winds = hourly.get("windspeed_10m", [])
-
-        if not times or not temps or not humids or not winds:
-            return {"error": "날씨 데이터 누락"}
-
-        target_dt = parser.isoparse(target_iso)
-        closest_index = min(
-            range(len(times)),
-            key=lambda i: abs(parser.isoparse(times[i]) - target_dt)
-        )
-
-        return {
-            "temperature": temps[closest_index],
-            "humidity": humids[closest_index],
-            "windspeed": winds[closest_index],
-            "time": times[closest_index]
-        }
+        return _closest_forecast(res.json(), target_iso)
 
     except Exception as e:
-        print(f"❌ Open-Meteo forecast API 실패: {e}")
+        log(f"❌ Open-Meteo forecast API 실패: {e}", level="error")
         return {"error": str(e)}
@@ -1,8 +1,11 @@
 import os
 import json
 import requests
+from .metrics import api_call
 
-def parse_user_prompt(user_input: str) -> dict:
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+def _prompt_request(user_input: str):
     prompt = f"""
     다음 문장에서 핵심 키워드를 JSON으로 추출해주세요.
     반드시 JSON만 반환하고, 들여쓰기 없이 한 줄로 출력하세요.
@@ -31,17 +34,23 @@ def parse_user_prompt(user_input: str) -> dict:
         "temperature": 0.3,
         "max_tokens": 500
     }
+    return headers, payload
 
+def _parse_completion(data: dict) -> dict:
+    content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
     try:
-        res = requests.post("https://api.openai.com/v1/chat/completions",
-                            headers=headers, json=payload)
-        res.raise_for_status()
-        content = res.json().get("choices", [{}])[0].get("message", {}).get("content", "")
-
         return json.loads(content)
-
     except json.JSONDecodeError:
         return {"error": "❌ JSON 파싱 실패", "raw": content}
+
+def parse_user_prompt(user_input: str) -> dict:
+    headers, payload = _prompt_request(user_input)
+
+    try:
+        with api_call("openai_chat"):
+            res = requests.post(OPENAI_CHAT_URL, headers=headers, json=payload)
+            res.raise_for_status()
+        return _parse_completion(res.json())
+
     except Exception as e:
         return {"error": str(e)}
-
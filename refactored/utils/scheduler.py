@@ -1,19 +1,59 @@
 import atexit
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime
-from .supabase_utils import delete_expired_signed_urls
+from ..config import LEADER_HEARTBEAT_SECONDS, JANITOR_INTERVAL_SECONDS, SCRATCH_TOUCH_SECONDS
+from ..services.ttl import run_ttl_cleanup
+from .leader import heartbeat, leader_only, resign
+from .janitor import run_janitor
+from .scratch import touch_active_dirs
+from .logger import log
 
+# 모든 워커가 스케줄러를 띄우지만 전역 작업(@leader_only)은 리더 한 곳에서만 실행
+# heartbeat가 리더십을 확보/유지 → 리더가 죽으면 다른 워커/인스턴스가 임대 만료 후 인계
+
+@leader_only
 def scheduled_cleanup():
-    print(f"🧹 TTL cleanup 시작 at {datetime.utcnow().isoformat()}")
+    log("🧹 TTL cleanup 시작", started_at=datetime.utcnow().isoformat())
+    try:
+        run = run_ttl_cleanup()
+        if run.get("skipped"):
+            log("⏭️ 이전 TTL cleanup이 아직 실행 중 → 건너뜀")
+        elif run["completed"]:
+            log("✅ TTL cleanup 완료", rows_cleared=run["rows_cleared"], duration=run["duration"])
+        else:
+            log("⏸️ TTL cleanup 일부 진행 (다음 실행에서 이어서)", level="warning",
+                rows_cleared=run["rows_cleared"], duration=run["duration"])
+    except Exception as e:
+        log(f"❌ TTL cleanup 실패: {e}", level="error")
+
+def leader_heartbeat():
+    try:
+        heartbeat()
+    except Exception as e:
+        log(f"❌ 리더 heartbeat 실패: {e}", level="error")
+
+def scheduled_janitor():
+    # 로컬 디스크 정리 → 호스트마다 실행 (리더 전용 아님)
+    try:
+        run_janitor()
+    except Exception as e:
+        log(f"❌ janitor 실패: {e}", level="error")
+
+def scratch_heartbeat():
+    # 이 워커의 진행 중 작업 디렉터리를 다른 워커의 janitor가 지우지 않게 mtime 갱신
     try:
-        delete_expired_signed_urls()
-        print("✅ TTL cleanup 완료\n")
+        touch_active_dirs()
     except Exception as e:
-        print(f"❌ TTL cleanup 실패: {e}\n")
+        log(f"❌ 작업 디렉터리 mtime 갱신 실패: {e}", level="error")
 
 def start_scheduler():
     scheduler = BackgroundScheduler()
-    scheduler.add_job(scheduled_cleanup, 'interval', hours=1)
+    scheduler.add_job(leader_heartbeat, 'interval', seconds=LEADER_HEARTBEAT_SECONDS,
+                      next_run_time=datetime.now(), max_instances=1, coalesce=True)
+    scheduler.add_job(scheduled_cleanup, 'interval', hours=1, max_instances=1, coalesce=True)
+    scheduler.add_job(scheduled_janitor, 'interval', seconds=JANITOR_INTERVAL_SECONDS,
+                      next_run_time=datetime.now(), max_instances=1, coalesce=True)
+    scheduler.add_job(scratch_heartbeat, 'interval', seconds=SCRATCH_TOUCH_SECONDS, max_instances=1, coalesce=True)
     scheduler.start()
-    atexit.register(lambda: scheduler.shutdown())
-    print("📅 TTL 스케줄러가 시작되었습니다.")
+    atexit.register(lambda: (scheduler.shutdown(), resign()))
+    log("📅 TTL 스케줄러가 시작되었습니다.")
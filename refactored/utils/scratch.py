@@ -0,0 +1,76 @@
+# 📁 utils/scratch.py
+import os
+import shutil
+import threading
+from ..config import OUTPUT_FOLDER, SCRATCH_DIR, SCRATCH_TMPFS_MIN_FREE_MB
+from .logger import log
+
+# 렌더 작업마다 {scratch_root}/job-{uid}/ 하나 → 작업이 끝나면(성공/실패 무관) 통째로 삭제
+# scratch_root: SCRATCH_DIR > /dev/shm (tmpfs, 여유 공간 충분할 때) > OUTPUT_FOLDER/.scratch
+# 진행 중인 작업 디렉터리는 touch_active_dirs()로 mtime을 주기적으로 갱신
+# → 다른 워커의 janitor에게는 "최근 항목"으로 보여서 (슬롯 대기가 길어도) 지워지지 않음
+
+JOB_PREFIX = "job-"
+_TMPFS = "/dev/shm"
+
+_lock = threading.Lock()
+_root = None
+_active = set()  # 이 프로세스에서 진행 중인 작업 디렉터리 (janitor가 건너뜀)
+
+def scratch_root() -> str:
+    global _root
+    if _root is None:
+        _root = _pick_root()
+        os.makedirs(_root, exist_ok=True)
+        log(f"🧽 작업 임시 디렉터리: {_root}")
+    return _root
+
+def _pick_root() -> str:
+    if SCRATCH_DIR:
+        return SCRATCH_DIR
+    if os.path.isdir(_TMPFS) and os.access(_TMPFS, os.W_OK):
+        if shutil.disk_usage(_TMPFS).free >= SCRATCH_TMPFS_MIN_FREE_MB * 1024 * 1024:
+            return os.path.join(_TMPFS, "shorts-generator")
+    return os.path.join(OUTPUT_FOLDER, ".scratch")
+
+def create_scratch_dir(uid: str) -> str:
+    path = os.path.join(scratch_root(), f"{JOB_PREFIX}{uid}")
+    os.makedirs(path, exist_ok=True)
+    with _lock:
+        _active.add(path)
+    return path
+
+def remove_scratch_dir(path: str) -> int:
+    """작업 디렉터리 삭제 → 회수한 바이트"""
+    reclaimed = dir_size(path)
+    shutil.rmtree(path, ignore_errors=True)
+    with _lock:
+        _active.discard(path)
+    return reclaimed
+
+def touch_active_dirs() -> int:
+    """이 프로세스의 진행 중 작업 디렉터리 mtime을 지금으로 → 갱신한 개수"""
+    with _lock:
+        paths = list(_active)
+    touched = 0
+    for path in paths:
+        try:
+            os.utime(path)
+            touched += 1
+        except OSError:
+            pass  # 그 사이 작업이 끝나 삭제됨
+    return touched
+
+def is_active(path: str) -> bool:
+    with _lock:
+        return path in _active
+
+def dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,181 @@
+# 📁 utils/supabase_client.py
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from ..config import (
+    SUPABASE_REST, SUPABASE_STORAGE, SUPABASE_SERVICE_KEY, UPLOAD_TIMEOUT,
+    SUPABASE_POOL_SIZE, SUPABASE_CONNECT_TIMEOUT, SUPABASE_REST_TIMEOUT, SUPABASE_STORAGE_TIMEOUT,
+    SUPABASE_MAX_RETRIES, SUPABASE_RETRY_BASE, SUPABASE_RETRY_CAP
+)
+from .async_io import get_async_client
+from .logger import log
+from .metrics import observe_api
+
+# PostgREST/Storage 호출은 모두 이 클라이언트 하나를 거침
+# - keep-alive 커넥션 풀 (TLS 핸드셰이크는 커넥션당 한 번)
+# - 인증 헤더는 세션 기본 헤더로 한 번만 구성
+# - 작업 종류(op)별 타임아웃: rest / storage / upload
+# - 5xx·429·연결 오류는 full-jitter 지수 backoff로 재시도 (429의 Retry-After 존중)
+#   본문이 이터레이터/파일처럼 다시 보낼 수 없으면 재시도하지 않음
+# - 엔드포인트별 지연 통계 (호출 수, 오류, 재시도, 평균/최대 초)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class SupabaseClient:
+    def __init__(self, rest_url=SUPABASE_REST, storage_url=SUPABASE_STORAGE, service_key=SUPABASE_SERVICE_KEY,
+                 session=None, max_retries=SUPABASE_MAX_RETRIES):
+        self.rest_url = rest_url
+        self.storage_url = storage_url
+        self.max_retries = max_retries
+        self.timeouts = {
+            "rest": (SUPABASE_CONNECT_TIMEOUT, SUPABASE_REST_TIMEOUT),
+            "storage": (SUPABASE_CONNECT_TIMEOUT, SUPABASE_STORAGE_TIMEOUT),
+            "upload": (SUPABASE_CONNECT_TIMEOUT, UPLOAD_TIMEOUT),
+        }
+        self.auth_headers = {"apikey": service_key, "Authorization": f"Bearer {service_key}"}
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=SUPABASE_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(self.auth_headers)
+        self.session = session
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def rest(self, method, table, **kwargs) -> requests.Response:
+        """PostgREST 호출: table은 "videos" 또는 "videos?uuid=eq.x" 형태"""
+        kwargs.setdefault("endpoint", f"{method} rest/{table.split('?')[0]}")
+        return self.request(method, f"{self.rest_url}/{table}", op="rest", **kwargs)
+
+    def storage(self, method, path, op="storage", **kwargs) -> requests.Response:
+        """Storage 호출: path는 "/object/sign/uploads/x.mp4" 형태"""
+        kwargs.setdefault("endpoint", f"{method} storage/{'/'.join(path.strip('/').split('/')[:2])}")
+        return self.request(method, f"{self.storage_url}{path}", op=op, **kwargs)
+
+    def request(self, method, url, op="rest", endpoint=None, headers=None, timeout=None,
+                retries=None, **kwargs) -> requests.Response:
+        """
+        재시도가 끝난 뒤의 마지막 응답 반환 (상태코드 판단은 호출자)
+        :raises requests.RequestException: 재시도 후에도 연결/타임아웃 오류
+        """
+        endpoint = endpoint or f"{method} {urlsplit(url).path}"
+        timeout = timeout or self.timeouts[op]
+        retries = self.max_retries if retries is None else retries
+        if not _replayable(kwargs.get("data")):
+            retries = 0
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                res = self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(endpoint, time.monotonic() - started, error=True, retry=attempt > 0, op=op)
+                if attempt >= retries:
+                    raise
+                log(f"🔁 Supabase 재시도 {endpoint} ({attempt + 1}/{retries}): {e}", level="warning")
+                self._sleep(attempt, None)
+                attempt += 1
+                continue
+
+            failed = res.status_code >= 500 or res.status_code == 429
+            self._record(endpoint, time.monotonic() - started, error=failed, retry=attempt > 0, op=op)
+            if res.status_code not in RETRY_STATUSES or attempt >= retries:
+                return res
+            log(f"🔁 Supabase 재시도 {endpoint} ({attempt + 1}/{retries}): HTTP {res.status_code}", level="warning")
+            self._sleep(attempt, res.headers.get("Retry-After"))
+            attempt += 1
+
+    # ── 비동기 (utils.async_io 공용 루프/httpx 풀, 같은 타임아웃·재시도·통계) ──
+    async def arest(self, method, table, **kwargs):
+        kwargs.setdefault("endpoint", f"{method} rest/{table.split('?')[0]}")
+        return await self.arequest(method, f"{self.rest_url}/{table}", op="rest", **kwargs)
+
+    async def astorage(self, method, path, op="storage", **kwargs):
+        kwargs.setdefault("endpoint", f"{method} storage/{'/'.join(path.strip('/').split('/')[:2])}")
+        return await self.arequest(method, f"{self.storage_url}{path}", op=op, **kwargs)
+
+    async def arequest(self, method, url, op="rest", endpoint=None, headers=None, retries=None, **kwargs):
+        """request()의 비동기 버전 → httpx.Response"""
+        endpoint = endpoint or f"{method} {urlsplit(url).path}"
+        connect, read = self.timeouts[op]
+        retries = self.max_retries if retries is None else retries
+        if not _replayable(kwargs.get("content", kwargs.get("data"))):
+            retries = 0
+        headers = dict(self.auth_headers, **(headers or {}))
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                res = await get_async_client().request(
+                    method, url, headers=headers, timeout=httpx.Timeout(read, connect=connect), **kwargs
+                )
+            except httpx.TransportError as e:
+                self._record(endpoint, time.monotonic() - started, error=True, retry=attempt > 0, op=op)
+                if attempt >= retries:
+                    raise
+                log(f"🔁 Supabase 재시도 {endpoint} ({attempt + 1}/{retries}): {e}", level="warning")
+                await asyncio.sleep(self._delay(attempt, None))
+                attempt += 1
+                continue
+
+            failed = res.status_code >= 500 or res.status_code == 429
+            self._record(endpoint, time.monotonic() - started, error=failed, retry=attempt > 0, op=op)
+            if res.status_code not in RETRY_STATUSES or attempt >= retries:
+                return res
+            log(f"🔁 Supabase 재시도 {endpoint} ({attempt + 1}/{retries}): HTTP {res.status_code}", level="warning")
+            await asyncio.sleep(self._delay(attempt, res.headers.get("Retry-After")))
+            attempt += 1
+
+    def _sleep(self, attempt, retry_after):
+        time.sleep(self._delay(attempt, retry_after))
+
+    def _delay(self, attempt, retry_after) -> float:
+        delay = random.uniform(0, min(SUPABASE_RETRY_CAP, SUPABASE_RETRY_BASE * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), SUPABASE_RETRY_CAP))
+        return delay
+
+    def _record(self, endpoint, seconds, error, retry, op="rest"):
+        observe_api(f"supabase_{op}", seconds, "error" if error else "ok")
+        with self._lock:
+            stat = self._stats.setdefault(
+                endpoint, {"calls": 0, "errors": 0, "retries": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stat["calls"] += 1
+            stat["errors"] += int(error)
+            stat["retries"] += int(retry)
+            stat["total_seconds"] += seconds
+            stat["max_seconds"] = max(stat["max_seconds"], seconds)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: dict(
+                    calls=s["calls"], errors=s["errors"], retries=s["retries"],
+                    avg_seconds=round(s["total_seconds"] / s["calls"], 4),
+                    max_seconds=round(s["max_seconds"], 4)
+                )
+                for endpoint, s in self._stats.items()
+            }
+
+def _replayable(data) -> bool:
+    return data is None or isinstance(data, (bytes, bytearray, str, dict, list, tuple))
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_supabase_client() -> SupabaseClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SupabaseClient()
+    return _client
@@ -1,77 +1,202 @@
 # 📁 utils/supabase_utils.py
-import os
-import requests
-from ..config import SUPABASE_UPLOAD, SUPABASE_SERVICE_KEY, SUPABASE_STORAGE, SUPABASE_BUCKET, SUPABASE_REST, TTL_SECONDS
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ..config import SUPABASE_STORAGE, SUPABASE_BUCKET, TTL_SECONDS, SIGN_READY_RETRIES, SIGN_READY_DELAY
+from .supabase_client import get_supabase_client
+from .logger import log
+from .upload_manager import UploadError
+
+# 마이그레이션 전 DB에 없다고 확인된 videos 컬럼 (프로세스 단위, 한 번 확인되면 다시 보내지 않음)
+_missing_columns = set()
+_UNKNOWN_COLUMN_CODES = ("PGRST204", "42703")
 
 def fix_url(url):
     return url if url and url.startswith("http") else f"https:{url}" if url else None
 
 def upload_to_supabase(file_content, file_name, file_type):
-    headers = {
-        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-        "Content-Type": file_type
-    }
-    upload_url = f"{SUPABASE_UPLOAD}/{file_name}"
-    res = requests.post(upload_url, headers=headers, data=file_content)
+    res = get_supabase_client().storage(
+        "POST", f"/object/{SUPABASE_BUCKET}/{file_name}", op="upload",
+        headers={"Content-Type": file_type}, data=file_content
+    )
     return res.status_code in [200, 201]
 
+def upload_stream_to_supabase(chunks, file_name, file_type):
+    """
+    청크 이터러블을 그대로 업로드 (Transfer-Encoding: chunked, Content-Length 없음)
+    청크 생성 중 예외가 나면 그대로 전파됨 (다시 보낼 수 없는 본문이라 재시도 없음)
+    :raises UploadError: 스토리지가 2xx가 아닌 응답 (본문을 끝까지 읽기 전일 수 있음)
+    """
+    res = get_supabase_client().storage(
+        "POST", f"/object/{SUPABASE_BUCKET}/{file_name}", op="upload",
+        headers={"Content-Type": file_type}, data=iter(chunks)
+    )
+    if res.status_code not in [200, 201]:
+        raise UploadError(f"Streaming upload failed for {file_name}: HTTP {res.status_code}")
+
+def delete_from_supabase(file_name):
+    res = get_supabase_client().storage("DELETE", f"/object/{SUPABASE_BUCKET}/{file_name}")
+    return res.status_code in [200, 204]
+
 def get_signed_url(file_name):
     if file_name.startswith("uploads/"):
         file_name = file_name.replace("uploads/", "", 1)
 
-    url = f"{SUPABASE_STORAGE}/object/sign/{SUPABASE_BUCKET}/{file_name}"
-    headers = {
-        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-        "Content-Type": "application/json"
-    }
-    res = requests.post(url, headers=headers, json={"expiresIn": TTL_SECONDS})
+    res = get_supabase_client().storage(
+        "POST", f"/object/sign/{SUPABASE_BUCKET}/{file_name}", json={"expiresIn": TTL_SECONDS}
+    )
     if res.status_code == 200:
         signed_path = res.json().get("signedURL")
         return f"{SUPABASE_STORAGE}{signed_path}"
     return None
 
-def delete_expired_signed_urls():
-    cutoff = datetime.utcnow() - timedelta(hours=1)
-    cutoff_iso = cutoff.isoformat()
+def _object_name(path):
+    return path.replace("uploads/", "", 1) if path.startswith("uploads/") else path
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
+def get_signed_urls(paths):
+    """
+    여러 객체를 한 번의 요청으로 서명 (POST /object/sign/{bucket}, paths 배열)
+    :return: 입력 경로 → signed URL (실패한 경로는 None)
+    """
+    names = {path: _object_name(path) for path in paths}
+    res = get_supabase_client().storage(
+        "POST", f"/object/sign/{SUPABASE_BUCKET}",
+        json={"expiresIn": TTL_SECONDS, "paths": list(set(names.values()))}
+    )
 
-    payload = {
-        "video_signed_url": None,
-        "audio_signed_url": None,
-        "image_signed_url": None,
-        "signed_created_at": None
+    if res.status_code in (400, 404, 405) and not isinstance(_safe_json(res), list):
+        # 일괄 서명 엔드포인트가 없는 스토리지 → 개별 서명을 동시에
+        with ThreadPoolExecutor(max_workers=min(8, len(paths)) or 1) as pool:
+            return dict(zip(paths, pool.map(get_signed_url, paths)))
+    if res.status_code != 200:
+        return {path: None for path in paths}
+
+    signed = {
+        item.get("path"): f"{SUPABASE_STORAGE}{item['signedURL']}"
+        for item in res.json()
+        if not item.get("error") and item.get("signedURL")
     }
+    return {path: signed.get(name) for path, name in names.items()}
 
-    url = f"{SUPABASE_REST}/videos?signed_created_at=lt.{cutoff_iso}"
-    res = requests.patch(url, headers=headers, json=payload)
+def sign_when_ready(paths, retries=SIGN_READY_RETRIES, delay=SIGN_READY_DELAY):
+    """
+    업로드 직후 서명: 아직 보이지 않는 객체만 짧은 backoff로 다시 시도
+    (고정 sleep 대신, 대부분 첫 요청에서 끝남)
+    """
+    results = {}
+    pending = list(paths)
+    for attempt in range(retries + 1):
+        signed = get_signed_urls(pending)
+        results.update({path: url for path, url in signed.items() if url})
+        pending = [path for path in pending if not signed.get(path)]
+        if not pending or attempt == retries:
+            break
+        time.sleep(delay * 2 ** attempt)
+    results.update({path: None for path in pending})
+    return results
 
-    if res.status_code in [200, 204]:
-        print("✅ TTL cleanup 완료")
-    else:
-        print("❌ TTL cleanup 실패:", res.text)
+def _safe_json(res):
+    try:
+        return res.json()
+    except ValueError:
+        return None
 
-def supabase_get_video_by_uuid(uuid):
-    res = requests.get(
-        f"{SUPABASE_REST}/videos?uuid=eq.{uuid}",
-        headers={"apikey": SUPABASE_SERVICE_KEY, "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}"}
+def supabase_insert_video(row: dict, optional_columns=()):
+    """videos 행 생성 → 생성된 행 (실패 시 None)"""
+    rows = supabase_insert_videos([row], optional_columns)
+    return rows[0] if rows else None
+
+def is_column_missing(column: str) -> bool:
+    return column in _missing_columns
+
+def _unknown_columns(res, candidates):
+    """400 응답이 '알 수 없는 컬럼' 오류면 그 컬럼들 (메시지에 이름이 없으면 후보 전부)"""
+    body = _safe_json(res)
+    if res.status_code != 400 or not isinstance(body, dict) or body.get("code") not in _UNKNOWN_COLUMN_CODES:
+        return set()
+    message = str(body.get("message") or "")
+    return {c for c in candidates if c in message} or set(candidates)
+
+def _without(rows, columns):
+    return [{k: v for k, v in row.items() if k not in columns} for row in rows] if columns else rows
+
+def _with_optional_columns(send, optional_columns):
+    """
+    send(보낼 선택 컬럼 목록) → 응답
+    알 수 없는 컬럼 오류(PGRST204/42703)일 때만 그 컬럼을 기록하고 빼서 다시 보냄 → 이후 요청에서는 처음부터 뺌
+    """
+    columns = [c for c in optional_columns if c not in _missing_columns]
+    while True:
+        res = send(columns)
+        missing = _unknown_columns(res, columns) if columns else set()
+        if not missing:
+            return res
+        _missing_columns.update(missing)
+        log("videos 테이블에 없는 컬럼 → 빼고 다시 시도", level="warning", columns=sorted(missing))
+        columns = [c for c in columns if c not in missing]
+
+def supabase_insert_videos(rows: list, optional_columns=()):
+    """
+    videos 행 여러 개를 한 번의 POST로 생성 → 생성된 행 목록 (실패 시 None, 모든 행의 키 동일)
+    optional_columns: 마이그레이션 전 DB에 없을 수 있는 컬럼 (없으면 빼고 저장)
+    """
+    present = [c for c in optional_columns if rows and c in rows[0]]
+    res = _with_optional_columns(
+        lambda columns: get_supabase_client().rest(
+            "POST", "videos", headers={"Prefer": "return=representation"},
+            json=_without(rows, set(present) - set(columns))
+        ),
+        present
     )
+    return _safe_json(res) if res.status_code in [200, 201] else None
+
+def supabase_find_video_by_fingerprint(fingerprint: str):
+    """render_fingerprint가 같은 기존 영상의 uuid (없거나 컬럼이 없으면 None)"""
+    if is_column_missing("render_fingerprint"):
+        return None  # 마이그레이션 전: 매번 실패할 조회는 보내지 않음
+    res = get_supabase_client().rest(
+        "GET", "videos",
+        params={"select": "uuid", "render_fingerprint": f"eq.{fingerprint}", "limit": "1"}
+    )
+    rows = _safe_json(res) if res.status_code == 200 else None
+    return rows[0].get("uuid") if rows else None
+
+def supabase_get_video_by_uuid(uuid):
+    res = get_supabase_client().rest("GET", "videos", params={"uuid": f"eq.{uuid}"})
     return res.json()[0] if res.status_code == 200 and res.json() else None
 
 def supabase_update_signed_urls(uuid, data: dict):
-    res = requests.patch(
-        f"{SUPABASE_REST}/videos?uuid=eq.{uuid}",
-        headers={
-            "apikey": SUPABASE_SERVICE_KEY,
-            "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-            "Content-Type": "application/json"
-        },
-        json=data
-    )
+    res = get_supabase_client().rest("PATCH", "videos", params={"uuid": f"eq.{uuid}"}, json=data)
     return res.status_code in [200, 204]
+
+# 일괄 조회/갱신 (갤러리·피드) → 필요한 컬럼만 select, 한 번의 upsert로 기록
+SIGNED_URL_COLUMNS = (
+    "uuid,user_id,video_path,image_path,audio_path,"
+    "signed_created_at,video_signed_url,image_signed_url,audio_signed_url"
+)
+SIGNED_URL_OPTIONAL_COLUMNS = ("poster_path",)  # 다중 렌더 마이그레이션 전 DB에는 없음
+
+def supabase_get_videos_by_uuids(uuids, columns=SIGNED_URL_COLUMNS, optional_columns=SIGNED_URL_OPTIONAL_COLUMNS):
+    if not uuids:
+        return []
+    res = _with_optional_columns(
+        lambda extra: get_supabase_client().rest(
+            "GET", "videos", params={"select": ",".join([columns, *extra]), "uuid": f"in.({','.join(uuids)})"}
+        ),
+        optional_columns
+    )
+    return res.json() if res.status_code == 200 else None
+
+def supabase_upsert_signed_urls(rows):
+    """
+    rows: [{"uuid", "user_id", "*_path", "signed_created_at", "*_signed_url"}, ...] (모든 행의 키 동일)
+    uuid 충돌 시 전달한 컬럼만 병합 (NOT NULL 컬럼은 조회한 값 그대로 함께 전송)
+    """
+    if not rows:
+        return True
+    res = get_supabase_client().rest(
+        "POST", "videos",
+        headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+        params={"on_conflict": "uuid"},
+        json=rows
+    )
+    return res.status_code in [200, 201, 204]
@@ -0,0 +1,147 @@
+# 📁 utils/upload_manager.py
+import base64
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ..config import (
+    SUPABASE_BUCKET, SUPABASE_RESUMABLE, RESUMABLE_UPLOAD_THRESHOLD, RESUMABLE_CHUNK_SIZE, UPLOAD_MAX_RETRIES
+)
+from .supabase_client import get_supabase_client
+from .logger import log
+from .metrics import observe_stage
+
+class UploadError(Exception):
+    pass
+
+def upload_artifacts(artifacts: list) -> dict:
+    """
+    여러 파일을 동시에 업로드 (디스크에서 스트리밍, 본문을 메모리에 올리지 않음)
+    :param artifacts: [{"name", "path", "object_name", "content_type"}, ...]
+    :return: 이름 → {"ok", "bytes", "seconds", "mbps", "method", "error"}
+    """
+    with ThreadPoolExecutor(max_workers=len(artifacts) or 1, thread_name_prefix="upload") as pool:
+        # 업로드 스레드에서도 요청의 지표 라벨(template_id 등)이 보이도록 컨텍스트 복사
+        futures = {
+            a["name"]: pool.submit(contextvars.copy_context().run, _upload_one, a) for a in artifacts
+        }
+    results = {name: future.result() for name, future in futures.items()}
+
+    log("⏫ 업로드: " + ", ".join(
+        f"{name}={r['bytes']}B/{r['seconds']}s({r['mbps']}MB/s,{r['method']})"
+        for name, r in results.items()
+    ))
+    return results
+
+def _upload_one(artifact: dict) -> dict:
+    size = os.path.getsize(artifact["path"])
+    method = "resumable" if size >= RESUMABLE_UPLOAD_THRESHOLD else "single"
+    started = time.monotonic()
+    error = None
+    try:
+        if method == "resumable":
+            upload_resumable(artifact["path"], artifact["object_name"], artifact["content_type"])
+        else:
+            upload_file(artifact["path"], artifact["object_name"], artifact["content_type"])
+    except UploadError as e:
+        error = str(e)
+
+    seconds = time.monotonic() - started
+    # upload_video / upload_audio / upload_image
+    observe_stage(f"upload_{artifact['content_type'].split('/')[0]}", seconds, "ok" if error is None else "error")
+    return {
+        "ok": error is None,
+        "bytes": size,
+        "seconds": round(seconds, 3),
+        "mbps": round(size / 1024 / 1024 / seconds, 2) if seconds > 0 else None,
+        "method": method,
+        "error": error,
+    }
+
+def _backoff(attempt: int):
+    time.sleep(min(8, 0.5 * 2 ** attempt))
+
+def upload_file(path: str, object_name: str, content_type: str):
+    """
+    단일 POST 업로드 (파일 객체를 넘겨서 requests가 디스크에서 바로 스트리밍)
+    재시도는 x-upsert: true → 앞선 시도가 저장됐는데 응답만 잃어버린 경우에도 중복(400)으로 실패하지 않음
+    :raises UploadError: 재시도 후에도 실패
+    """
+    last_error = None
+    for attempt in range(UPLOAD_MAX_RETRIES):
+        headers = {"Content-Type": content_type, **({"x-upsert": "true"} if attempt else {})}
+        try:
+            with open(path, "rb") as f:
+                res = get_supabase_client().storage(
+                    "POST", f"/object/{SUPABASE_BUCKET}/{object_name}", op="upload", headers=headers, data=f
+                )
+            if res.status_code in (200, 201):
+                return
+            last_error = f"HTTP {res.status_code}: {res.text[:200]}"
+            if res.status_code < 500 and res.status_code != 429:
+                break  # 4xx는 재시도해도 같음
+        except Exception as e:
+            last_error = str(e)
+        _backoff(attempt)
+    raise UploadError(f"Upload failed for {object_name}: {last_error}")
+
+def _tus_metadata(object_name: str, content_type: str) -> str:
+    fields = {"bucketName": SUPABASE_BUCKET, "objectName": object_name, "contentType": content_type}
+    return ",".join(f"{k} {base64.b64encode(v.encode()).decode()}" for k, v in fields.items())
+
+def upload_resumable(path: str, object_name: str, content_type: str):
+    """
+    TUS 재개 가능 업로드: 6MB 청크 PATCH, 실패하면 HEAD로 서버 오프셋 확인 후 이어서 전송
+    :raises UploadError
+    """
+    client = get_supabase_client()
+    size = os.path.getsize(path)
+    tus_headers = {"Tus-Resumable": "1.0.0"}
+
+    res = client.request("POST", SUPABASE_RESUMABLE, op="upload", endpoint="POST storage/upload/resumable",
+                         headers=dict(tus_headers, **{
+        "Upload-Length": str(size),
+        "Upload-Metadata": _tus_metadata(object_name, content_type),
+        "x-upsert": "true",
+    }))
+    if res.status_code != 201 or not res.headers.get("Location"):
+        raise UploadError(f"Resumable upload create failed for {object_name}: HTTP {res.status_code}")
+    location = res.headers["Location"]
+
+    offset = 0
+    failures = 0
+    with open(path, "rb") as f:
+        while offset < size:
+            f.seek(offset)
+            chunk = f.read(RESUMABLE_CHUNK_SIZE)
+            try:
+                # 청크 재시도는 서버 오프셋 확인이 필요해서 여기서 직접 처리 (클라이언트 재시도 끔)
+                res = client.request("PATCH", location, op="upload", retries=0,
+                                     endpoint="PATCH storage/upload/resumable",
+                                     data=chunk, headers=dict(tus_headers, **{
+                    "Upload-Offset": str(offset),
+                    "Content-Type": "application/offset+octet-stream",
+                }))
+                if res.status_code == 204:
+                    offset = int(res.headers.get("Upload-Offset", offset + len(chunk)))
+                    failures = 0
+                    continue
+                error = f"HTTP {res.status_code}"
+            except Exception as e:
+                error = str(e)
+
+            failures += 1
+            if failures >= UPLOAD_MAX_RETRIES:
+                raise UploadError(f"Resumable upload failed for {object_name} at {offset}/{size}: {error}")
+            _backoff(failures)
+            offset = _server_offset(location, tus_headers, fallback=offset)
+            log(f"🔁 업로드 재개: {object_name} @ {offset}/{size} ({error})", level="warning")
+
+def _server_offset(location: str, headers: dict, fallback: int) -> int:
+    """서버가 실제로 받은 바이트 수 (확인 실패 시 마지막으로 알던 값)"""
+    try:
+        res = get_supabase_client().request("HEAD", location, op="storage", retries=0,
+                                            endpoint="HEAD storage/upload/resumable", headers=headers)
+        return int(res.headers["Upload-Offset"])
+    except Exception:
+        return fallback